@@ -27,6 +27,10 @@ def get_ship_types():
 # 图像设置
 THUMBNAIL_SIZE = (100, 100)  # 缩略图大小
 IMAGE_DISPLAY_SIZE = (800, 600)  # 显示图像的大小
+IMAGE_CACHE_SIZE = 32  # 图像查看器缓存的最近图像数量
+IMAGE_CACHE_MAX_MB = 512  # 图像缓存（解码图像及其QPixmap）占用内存上限，单位MB
+COMPOSITE_CACHE_MAX_MB = 128  # 绘制了标注框的合成图缓存占用内存上限，单位MB
+IMAGE_PREFETCH_COUNT = 3  # 切换图像后在后台预取的后续图像数量
 
 # 标签框显示设置
 BOX_COLORS = [
@@ -66,4 +70,6 @@ LABEL_FILE_EXT = '.txt'
 # YOLO模型相关配置
 YOLO_MODELS_DIR = "pt"  # YOLO模型文件目录
 DEFAULT_YOLO_MODEL = "Fuck5.pt"  # 默认YOLO模型文件名
-SETTINGS_FILE = "settings.json"  # 用户设置文件 
\ No newline at end of file
+SETTINGS_FILE = "settings.json"  # 用户设置文件
+YOLO_CONFIDENCE_THRESHOLD = 0.4  # 预测置信度阈值
+YOLO_NMS_IOU_THRESHOLD = 0.5  # 同类别预测框非极大值抑制的IoU阈值 
\ No newline at end of file
@@ -10,13 +10,14 @@ from utils import file_utils
 class YoloLabel:
     """YOLO标签类，处理标签的加载、解析、修改和保存"""
     
-    def __init__(self, image_path: str = None, label_path: str = None):
+    def __init__(self, image_path: str = None, label_path: str = None, load: bool = True):
         """
         初始化YOLO标签对象
         
         Args:
             image_path: 图像文件路径
             label_path: 标签文件路径
+            load: 是否立即加载标签，只需移动文件时可以不加载
         """
         self.image_path = image_path
         self.label_path = label_path
@@ -24,7 +25,7 @@ class YoloLabel:
         self.modified = False  # 标记是否已修改
         
         # 如果提供了标签文件路径，则加载标签
-        if label_path and image_path:
+        if load and label_path and image_path:
             self.load_labels()
     
     def load_labels(self) -> bool:
@@ -85,6 +86,25 @@ class YoloLabel:
             return True
         return False
     
+    def set_all_classes(self, new_class_id: int) -> bool:
+        """
+        把所有标签的类别ID更新为同一个类别
+        
+        Args:
+            new_class_id: 新的类别ID
+            
+        Returns:
+            是否有标签被更新
+        """
+        if not self.labels:
+            return False
+        
+        class_value = float(new_class_id)
+        for label in self.labels:
+            label[0] = class_value
+        self.modified = True
+        return True
+    
     def add_label(self, class_id: int, center_x: float, center_y: float, 
                  width: float, height: float) -> bool:
         """
@@ -32,6 +32,9 @@ class CustomGraphicsView(QGraphicsView):
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
         
+        # 缓存的缩放状态，变换改变后由update_zoom_state刷新，避免鼠标移动时反复查询变换矩阵
+        self.is_zoomed = False
+        
         # 事件处理函数
         self.on_mouse_press = None
         self.on_mouse_move = None
@@ -55,6 +58,11 @@ class CustomGraphicsView(QGraphicsView):
         if self.on_mouse_release:
             self.on_mouse_release(event)
 
+    def update_zoom_state(self):
+        """根据当前变换矩阵刷新缓存的缩放状态，在缩放或fitInView之后调用"""
+        transform = self.transform()
+        self.is_zoomed = transform.m11() > 1.01 or transform.m22() > 1.01
+    
     def wheelEvent(self, event):
         """处理鼠标滚轮事件以进行缩放"""
         zoom_in_factor = 1.15
@@ -66,5 +74,6 @@ class CustomGraphicsView(QGraphicsView):
         else:
             # 向下滚动，缩小
             self.scale(zoom_out_factor, zoom_out_factor)
+        self.update_zoom_state()
         
         event.accept()  # 接受事件，防止传递给父控件 
\ No newline at end of file
@@ -73,7 +73,7 @@ class ImageListWidget(QGroupBox):
         self.image_treeview.itemSelectionChanged.connect(self.on_selection_changed)
         self.image_treeview.customContextMenuRequested.connect(self.on_context_menu_requested)
     
-
+    
     def get_label_stats(self, image_path):
         """获取图像对应的详细标签统计信息
         
@@ -199,6 +199,8 @@ class ImageListWidget(QGroupBox):
                 self._update_header_for_batch_mode()
             else:
                 self.image_treeview.setHeaderLabel("图像列表")
+            # 先创建全部项目再一次性添加，视图只收到一次行插入通知
+            items = []
             for img_file in self.image_files:
                 item = QTreeWidgetItem()
                 
@@ -217,12 +219,14 @@ class ImageListWidget(QGroupBox):
                 
                 item.setText(0, display_text)
                 item.setData(0, Qt.ItemDataRole.UserRole, img_file)
-                self.image_treeview.addTopLevelItem(item)
+                items.append(item)
+            self.image_treeview.addTopLevelItems(items)
         else:
             # 分组模式：按ID分组显示
             self.image_treeview.setHeaderLabel("按ID分组的图像")
             
-            # 按ID排序显示
+            # 按ID排序显示，组节点同样一次性添加
+            group_items = []
             for group_id in sorted(self.image_groups_by_id.keys()):
                 group_files = self.image_groups_by_id[group_id]
                 
@@ -251,7 +255,8 @@ class ImageListWidget(QGroupBox):
                     child_item.setData(0, Qt.ItemDataRole.UserRole, img_file)
                     group_item.addChild(child_item)
                 
-                self.image_treeview.addTopLevelItem(group_item)
+                group_items.append(group_item)
+            self.image_treeview.addTopLevelItems(group_items)
     
     def on_tree_item_click(self, item, column):
         """处理树形控件项目点击事件"""
@@ -360,9 +365,8 @@ class ImageListWidget(QGroupBox):
                 self.load_images_simple()
     
     def set_review_mode(self, is_review_mode):
-        """设置审核模式"""
+        """设置审核模式（列表显示内容与模式无关，无需刷新）"""
         self.is_review_mode = is_review_mode
-        self._update_tree_view()
     
     def set_show_label_count(self, show_label_count):
         """设置是否显示标签数"""
@@ -631,14 +635,10 @@ class ImageListWidget(QGroupBox):
         if not current_img_path:
             return
         
-        # 在简单模式下，记录当前图像在列表中的索引
-        removed_img_idx = -1
-        if not self.group_by_id and current_img_path in self.image_files:
-            removed_img_idx = self.image_files.index(current_img_path)
-            
-        # 从图像文件列表中移除
-        if current_img_path in self.image_files:
-            self.image_files.remove(current_img_path)
+        # 查找一次索引并按索引移除，避免多次线性扫描图像列表
+        removed_img_idx = self.index_of(current_img_path, -1)
+        if removed_img_idx >= 0:
+            del self.image_files[removed_img_idx]
         
         # 在简单模式下，更新当前图像索引
         if not self.group_by_id and removed_img_idx >= 0:
@@ -695,10 +695,9 @@ class ImageListWidget(QGroupBox):
         if self.current_group_id in self.image_groups_by_id:
             group_files = self.image_groups_by_id[self.current_group_id]
             
-            # 从主图像列表中移除所有组内图像
-            for img_file in group_files:
-                if img_file in self.image_files:
-                    self.image_files.remove(img_file)
+            # 从主图像列表中移除所有组内图像，一次遍历完成（原地修改，保持外部对列表的引用有效）
+            group_file_set = set(group_files)
+            self.image_files[:] = [img_file for img_file in self.image_files if img_file not in group_file_set]
             
             # 删除组
             del self.image_groups_by_id[self.current_group_id]
@@ -815,6 +814,21 @@ class ImageListWidget(QGroupBox):
         """获取批量选择的项目"""
         return self.batch_selected_items.copy()
     
+    def index_of(self, img_path, default=0):
+        """获取图像在列表中的索引
+        
+        Args:
+            img_path: 图像文件路径
+            default: 图像不在列表中时返回的索引
+            
+        Returns:
+            图像索引
+        """
+        try:
+            return self.image_files.index(img_path)
+        except ValueError:
+            return default
+    
     def is_in_batch_mode(self):
         """检查是否处于批量选择模式"""
         return self.batch_selection_mode
@@ -824,10 +838,9 @@ class ImageListWidget(QGroupBox):
         if not self.batch_selection_mode or not self.batch_selected_items:
             return
         
-        # 从图像列表中移除选中的图像
-        for img_path in self.batch_selected_items:
-            if img_path in self.image_files:
-                self.image_files.remove(img_path)
+        # 从图像列表中移除选中的图像，一次遍历完成（原地修改，保持外部对列表的引用有效）
+        selected_set = set(self.batch_selected_items)
+        self.image_files[:] = [img_path for img_path in self.image_files if img_path not in selected_set]
         
         # 清空批量选择状态
         self.clear_batch_selection()
@@ -3,22 +3,237 @@
 负责图像显示、缩放、平移和标注框交互
 """
 import os
+import threading
+from collections import OrderedDict
 
-from PySide6.QtCore import Qt, QPointF, QRectF, QPoint, Signal, QTimer
-from PySide6.QtGui import QPainter, QColor, QPixmap, QPen, QCursor, QFont
+import numpy as np
+from PySide6.QtCore import Qt, QPointF, QRectF, QPoint, QRect, Signal, QTimer, QObject, QRunnable, QThreadPool
+from PySide6.QtGui import QPainter, QColor, QPixmap, QPen, QCursor, QFont, QFontMetricsF, QBrush
 from PySide6.QtWidgets import (
     QGroupBox, QVBoxLayout, QHBoxLayout, QGraphicsScene,
-    QGraphicsPixmapItem, QPushButton, QStyle, QMessageBox, QMenu, QLabel
+    QPushButton, QStyle, QMessageBox, QMenu, QLabel, QGraphicsRectItem
 )
-from ultralytics import YOLO
 
 import config
 from models.yolo_label import YoloLabel
 from utils import image_utils
+from utils.label_layout import place_all
 from utils.yolo_model_manager import YoloModelManager
 from .custom_graphics_view import CustomGraphicsView
 
 
+def _pil_image_bytes(image):
+    """估算PIL图像占用的内存字节数"""
+    return image.width * image.height * len(image.getbands())
+
+
+def _pixmap_bytes(pixmap):
+    """估算QPixmap占用的内存字节数"""
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+# 同一模型不支持并发推理，所有后台预测任务共用这把锁；界面线程从不等待它
+_INFERENCE_LOCK = threading.Lock()
+
+
+def _run_yolo_inference(model, image_path, confidence_threshold, nms_iou_threshold):
+    """执行YOLO推理并返回过滤后的预测结果，在工作线程中调用
+    
+    Args:
+        model: YOLO模型
+        image_path: 图像文件路径
+        confidence_threshold: 置信度阈值
+        nms_iou_threshold: NMS的IoU阈值
+        
+    Returns:
+        预测结果列表，每项为 [class_id, center_x, center_y, width, height, confidence]
+    """
+    with _INFERENCE_LOCK:
+        results = model(image_path, conf=confidence_threshold)
+    
+    # 解析预测结果，整理为 [class_id, center_x, center_y, width, height, confidence] 数组
+    prediction_arrays = []
+    for result in results or []:
+        boxes = getattr(result, 'boxes', None)
+        if boxes is not None and len(boxes) > 0:
+            prediction_arrays.append(np.column_stack((
+                boxes.cls.cpu().numpy(),
+                boxes.xywhn.cpu().numpy(),
+                boxes.conf.cpu().numpy()
+            )))
+    predictions = np.concatenate(prediction_arrays) if prediction_arrays else np.empty((0, 6))
+    
+    # 绘制前先过滤低置信度框并按类别去除重叠框，减少后续绘制和布局计算
+    predictions = image_utils.filter_predictions(
+        predictions, confidence_threshold, nms_iou_threshold
+    )
+    return [
+        [int(row[0]), row[1], row[2], row[3], row[4], row[5]]
+        for row in predictions.tolist()
+    ]
+
+
+class _PrefetchSignals(QObject):
+    """预取任务的信号对象，用于把后台结果送回界面线程"""
+    
+    finished = Signal(object)  # 预取完成信号 (结果字典)
+
+
+class _ImagePrefetchTask(QRunnable):
+    """后台预取任务：解码图像，需要时执行YOLO预测
+    
+    任务需要的模型和阈值都在界面线程创建任务时确定，工作线程不读取查看器的状态。
+    """
+    
+    def __init__(self, image_path, signals, generation, cancel_event, decode=True, inference=None):
+        """初始化预取任务
+        
+        Args:
+            image_path: 要预取的图像路径
+            signals: 用于返回结果的信号对象
+            generation: 发起时的预取代数，结果按代数判断是否过期
+            cancel_event: 取消事件，被设置后尚未开始的工作直接跳过
+            decode: 是否解码图像
+            inference: 需要预测时为 (模型, 预测缓存键, 置信度阈值, NMS的IoU阈值)，否则为None
+        """
+        super().__init__()
+        self.image_path = image_path
+        self.signals = signals
+        self.generation = generation
+        self.cancel_event = cancel_event
+        self.decode = decode
+        self.inference = inference
+    
+    def run(self):
+        """在工作线程中执行预取"""
+        if self.cancel_event.is_set():
+            return
+        
+        result = {
+            'generation': self.generation,
+            'cache_key': None,
+            'image': None,
+            'qimage': None,
+            'prediction_key': self.inference[1] if self.inference else None,
+            'predictions': None,
+            'error': None
+        }
+        try:
+            if self.decode:
+                cache_key = (self.image_path, os.path.getmtime(self.image_path))
+                image = image_utils.load_image(self.image_path)
+                if image:
+                    # QImage可以在工作线程中创建，QPixmap需回到界面线程再生成
+                    result['cache_key'] = cache_key
+                    result['image'] = image
+                    result['qimage'] = image_utils.pil_to_qimage(image)
+            
+            if self.inference and not self.cancel_event.is_set():
+                model, _, confidence_threshold, nms_iou_threshold = self.inference
+                result['predictions'] = _run_yolo_inference(
+                    model, self.image_path, confidence_threshold, nms_iou_threshold
+                )
+        except Exception as e:
+            print(f"预取图像失败: {self.image_path}, 错误: {str(e)}")
+            result['error'] = str(e)
+        
+        self.signals.finished.emit(result)
+
+
+class _SelectionHighlightItem(QGraphicsRectItem):
+    """选中标注框的高亮图元
+    
+    作为图像上方的独立图元绘制，切换选中项时只需更新该图元，无需重新合成整幅图像。
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._label = None
+        self._bbox_index = -1
+        self._image_size = (1, 1)
+        self._pixmap_size = (1, 1)
+    
+    def set_label(self, label, bbox_index, image_size, pixmap_size):
+        """设置要高亮的标签
+        
+        Args:
+            label: 标签数据 [class_id, center_x, center_y, width, height]
+            bbox_index: 边界框索引
+            image_size: 原始图像尺寸 (width, height)
+            pixmap_size: 显示图像尺寸 (width, height)
+        """
+        self._label = label
+        self._bbox_index = bbox_index
+        self._image_size = image_size
+        self._pixmap_size = pixmap_size
+        
+        _, center_x, center_y, width, height = label
+        scale_x = pixmap_size[0] / image_size[0]
+        scale_y = pixmap_size[1] / image_size[1]
+        self.setRect(QRectF(
+            (center_x - width / 2) * image_size[0] * scale_x,
+            (center_y - height / 2) * image_size[1] * scale_y,
+            width * image_size[0] * scale_x,
+            height * image_size[1] * scale_y
+        ))
+        self.update()
+    
+    def boundingRect(self):
+        # 包含控制点和画笔宽度
+        return self.rect().adjusted(-6, -6, 6, 6)
+    
+    def paint(self, painter, option, widget=None):
+        if self._label is None:
+            return
+        painter.save()
+        image_utils.highlight_selected_box_on(
+            painter, self._label, self._bbox_index, self._image_size, self._pixmap_size
+        )
+        painter.restore()
+
+
+class _RubberBandItem(QGraphicsRectItem):
+    """绘制新标注框时的橡皮筋矩形
+    
+    坐标取整并关闭抗锯齿绘制，走Qt整数矩形的快速路径；最终的标注框仍由带抗锯齿的合成图像绘制。
+    """
+    
+    def __init__(self):
+        super().__init__()
+        # 红色虚线边框和半透明填充
+        self._fill_pen = QPen(QColor("#FF0000"))
+        self._fill_pen.setWidth(2)
+        self._fill_pen.setStyle(Qt.PenStyle.DashLine)
+        self._fill_brush = QBrush(QColor(255, 0, 0, 40))
+        
+        # 白色外边框增强可见性
+        self._border_pen = QPen(QColor("#FFFFFF"))
+        self._border_pen.setWidth(1)
+        self._border_pen.setStyle(Qt.PenStyle.DashLine)
+    
+    def set_scene_rect(self, x1, y1, x2, y2):
+        """按场景坐标设置矩形，坐标取整到像素"""
+        left = int(round(x1))
+        top = int(round(y1))
+        self.setRect(QRectF(QRect(left, top, int(round(x2)) - left, int(round(y2)) - top)))
+    
+    def boundingRect(self):
+        # 包含外边框和画笔宽度
+        return self.rect().adjusted(-2, -2, 2, 2)
+    
+    def paint(self, painter, option, widget=None):
+        rect = self.rect().toRect()
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setPen(self._fill_pen)
+        painter.setBrush(self._fill_brush)
+        painter.drawRect(rect)
+        painter.setPen(self._border_pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(rect.adjusted(-1, -1, 1, 1))
+        painter.restore()
+
+
 class ImageViewerWidget(QGroupBox):
     """图像查看器组件"""
     
@@ -28,6 +243,40 @@ class ImageViewerWidget(QGroupBox):
     bbox_modified = Signal(int, float, float, float, float)  # 标注框被修改信号 (索引, 中心x, 中心y, 宽度, 高度)
     show_class_menu_requested = Signal(int, QPoint)  # 请求显示类别菜单信号 (标注框索引, 位置)
     
+    # 预测结果提示样式：识别到对象
+    _QSS_RESULT_OK = """
+        QLabel {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+                stop:0 rgba(34, 139, 34, 250), stop:1 rgba(50, 205, 50, 250));
+            color: white;
+            font-family: "Microsoft YaHei", "Segoe UI", Arial, sans-serif;
+            font-size: 18px;
+            font-weight: bold;
+            padding: 16px 28px;
+            border-radius: 25px;
+            border: 3px solid rgba(255, 255, 255, 220);
+            box-shadow: 0px 8px 16px rgba(0, 0, 0, 50);
+            text-shadow: 0px 2px 4px rgba(0, 0, 0, 100);
+        }
+    """
+    
+    # 预测结果提示样式：未识别到对象
+    _QSS_RESULT_EMPTY = """
+        QLabel {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+                stop:0 rgba(255, 165, 0, 250), stop:1 rgba(255, 140, 0, 250));
+            color: white;
+            font-family: "Microsoft YaHei", "Segoe UI", Arial, sans-serif;
+            font-size: 18px;
+            font-weight: bold;
+            padding: 16px 28px;
+            border-radius: 25px;
+            border: 3px solid rgba(255, 255, 255, 220);
+            box-shadow: 0px 8px 16px rgba(0, 0, 0, 50);
+            text-shadow: 0px 2px 4px rgba(0, 0, 0, 100);
+        }
+    """
+    
     def __init__(self, parent=None):
         """初始化图像查看器组件"""
         super().__init__("图像预览", parent)
@@ -40,13 +289,45 @@ class ImageViewerWidget(QGroupBox):
         self.selected_bbox_index = -1  # 当前选中的边界框索引
         self.ship_types = config.get_ship_types()
         
+        # 图像缓存：(图像路径, 修改时间) -> (PIL图像, QPixmap)，按最近使用顺序淘汰，
+        # 同时限制数量和总内存，大尺寸图像时以内存上限为准
+        self._pixmap_cache = OrderedDict()
+        self._pixmap_cache_bytes = 0
+        # 合成图缓存：图像缓存键 -> (绘制内容键, 绘制了标注框的QPixmap)，
+        # 每幅图像只保留最新的一份，编辑标注框后旧的合成图直接被替换
+        self._composite_cache = OrderedDict()
+        self._composite_cache_bytes = 0
+        self._current_cache_key = None
+        
+        # 坐标换算缓存：图像尺寸、显示图像尺寸及二者间的缩放比例，仅在显示图像变化时更新
+        self._img_wh = (0, 0)
+        self._pixmap_wh = (0, 0)
+        self._scale_xy = (1.0, 1.0)
+        self._inv_scale_xy = (1.0, 1.0)
+        
+        # 后台预取相关：预测结果缓存、本轮已提交预取的路径（其中同时预测的路径单独记录）、
+        # 最近一次请求预取的路径列表和预取代数（用于取消过期任务）
+        self._prediction_cache = OrderedDict()
+        self._prefetch_paths = set()
+        self._prefetch_predict_paths = set()
+        self._prefetch_candidates = []
+        self._prefetch_generation = 0
+        self._prefetch_cancel_event = threading.Event()
+        self._predictions_in_flight = set()  # 已提交、尚未返回的预测缓存键
+        self._awaited_prediction_key = None  # 用户点击预测后正在等待的预测缓存键
+        self._prefetch_signals = _PrefetchSignals(self)
+        self._prefetch_signals.finished.connect(self._on_prefetch_finished)
+        
         # YOLO预测相关状态变量
         self.yolo_model = None  # YOLO模型
         self.model_manager = YoloModelManager()  # 模型管理器
         self.current_model_name = None  # 当前模型名称
         self.yolo_predictions = []  # YOLO预测结果
         self.show_predictions = False  # 是否显示预测结果
-        self.confidence_threshold = 0.4  # 置信度阈值
+        self.confidence_threshold = config.YOLO_CONFIDENCE_THRESHOLD  # 置信度阈值
+        self.nms_iou_threshold = config.YOLO_NMS_IOU_THRESHOLD  # NMS的IoU阈值
+        self._prediction_cull_rect = None  # 上次绘制预测结果时使用的裁剪区域
+        self._font_metrics_cache = {}  # 预测标签字体的度量对象，按 (字体族, 字号, 字重) 复用
         
         # 边界框拖动相关
         self.is_dragging = False
@@ -55,6 +336,10 @@ class ImageViewerWidget(QGroupBox):
         self.original_cursor_pos = None
         self.is_edge_dragging = False
         self.dragging_edge_index = -1
+        self._bbox_hit_boxes = None  # 角点和边线命中检测用的 (边界框数组, 网格索引)，标签变化后重建
+        self._drag_start_label = None  # 拖动开始前的标签坐标，用于判断拖动是否改变了标注框
+        self._drag_pixmap = None  # 拖动期间局部重绘的合成图像
+        self._dirty_rect = QRectF()  # 拖动期间尚未重绘的区域
         
         # 绘制新标注框相关
         self.is_drawing_bbox = False
@@ -65,6 +350,9 @@ class ImageViewerWidget(QGroupBox):
         self.is_panning = False
         self.last_pan_position = None
         
+        # 悬浮按钮在_init_ui中全部创建后登记，此前的尺寸变化事件不做定位
+        self._floating_buttons = None
+        
         # 创建UI
         self._init_ui()
         
@@ -88,6 +376,21 @@ class ImageViewerWidget(QGroupBox):
         self.graphics_view.setScene(self.graphics_scene)
         self.graphics_view.setMinimumSize(800, 600)
         
+        # 场景中只保留一个图像项，刷新时替换其内容而不是重建
+        self._pixmap_item = self.graphics_scene.addPixmap(QPixmap())
+        
+        # 选中标注框的高亮图元，切换选中项时不重新合成图像
+        self._highlight_item = _SelectionHighlightItem()
+        self._highlight_item.setZValue(1)
+        self._highlight_item.setVisible(False)
+        self.graphics_scene.addItem(self._highlight_item)
+        
+        # 绘制新标注框时的橡皮筋矩形，作为图像上方的独立图元，鼠标移动时只更新其矩形
+        self._rubber_band_item = _RubberBandItem()
+        self._rubber_band_item.setZValue(2)
+        self._rubber_band_item.setVisible(False)
+        self.graphics_scene.addItem(self._rubber_band_item)
+        
         # 设置大小策略
         size_policy = self.graphics_view.sizePolicy()
         size_policy.setHorizontalPolicy(size_policy.Policy.Expanding)
@@ -214,27 +517,36 @@ class ImageViewerWidget(QGroupBox):
         # 创建YOLO预测结果提示标签
         self.prediction_result_label = QLabel(self.graphics_view)
         self.prediction_result_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.prediction_result_label.setStyleSheet("""
-            QLabel {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 rgba(0, 122, 204, 250), stop:1 rgba(0, 100, 180, 250));
-                color: white;
-                font-family: "Microsoft YaHei", "Segoe UI", Arial, sans-serif;
-                font-size: 18px;
-                font-weight: bold;
-                padding: 16px 28px;
-                border-radius: 25px;
-                border: 3px solid rgba(255, 255, 255, 220);
-                box-shadow: 0px 8px 16px rgba(0, 0, 0, 50);
-            }
-        """)
+        # 样式在首次显示结果时按结果类型设置，记录上次的结果类型和文本长度以免重复设置
+        self._last_result_state = None
+        self._last_result_text_length = -1
         self.prediction_result_label.setVisible(False)
         
+        # 视图平移缩放后延迟重绘预测结果，合并连续的滚动事件
+        self._view_refresh_timer = QTimer(self)
+        self._view_refresh_timer.setSingleShot(True)
+        self._view_refresh_timer.setInterval(50)
+        self._view_refresh_timer.timeout.connect(lambda: self.update_display_image(adjust_view=False))
+        
+        # 拖动标注框时合并连续的鼠标移动，每轮事件循环最多重绘一次
+        self._drag_redraw_timer = QTimer(self)
+        self._drag_redraw_timer.setSingleShot(True)
+        self._drag_redraw_timer.setInterval(0)
+        self._drag_redraw_timer.timeout.connect(self._repaint_dirty_region)
+        
         # 创建结果提示定时器
         self.result_timer = QTimer(self)
         self.result_timer.setSingleShot(True)
         self.result_timer.timeout.connect(self._hide_prediction_result)
         
+        # 悬浮按钮按定位顺序登记：重置缩放、YOLO预测、接受所有、删除所有
+        self._floating_buttons = (
+            self.reset_zoom_button,
+            self.yolo_predict_button,
+            self.accept_all_predictions_button,
+            self.reset_predictions_button
+        )
+        
         # 更新YOLO按钮提示文本
         self._update_yolo_button_tooltip()
         
@@ -248,6 +560,11 @@ class ImageViewerWidget(QGroupBox):
         self.graphics_view.on_mouse_move = self.on_graphics_view_move
         self.graphics_view.on_mouse_release = self.on_graphics_view_release
         
+        # 平移和缩放都会改变滚动条，据此判断是否需要重绘可见区域的预测结果
+        for scroll_bar in (self.graphics_view.horizontalScrollBar(), self.graphics_view.verticalScrollBar()):
+            scroll_bar.valueChanged.connect(self._on_view_changed)
+            scroll_bar.rangeChanged.connect(self._on_view_changed)
+        
         # 连接重置缩放按钮
         self.reset_zoom_button.clicked.connect(self.adjust_image_to_view)
         
@@ -280,8 +597,13 @@ class ImageViewerWidget(QGroupBox):
             
             model_path = self.model_manager.get_model_path(model_name)
             
-            # 加载YOLO模型
-            self.yolo_model = YOLO(model_path)
+            # 加载YOLO模型，模型设置对话框已在后台预热过时直接取用
+            model = self.model_manager.take_preloaded_model(model_name)
+            if model is None:
+                # ultralytics 会连带导入 torch，启动时导入耗时数秒，首次加载模型时再导入
+                from ultralytics import YOLO
+                model = YOLO(model_path)
+            self.yolo_model = model
             self.current_model_name = model_name
             return True
         except Exception as e:
@@ -289,7 +611,10 @@ class ImageViewerWidget(QGroupBox):
             return False
     
     def perform_yolo_prediction(self):
-        """执行YOLO预测"""
+        """执行YOLO预测
+        
+        推理在线程池中进行，界面线程不等待模型；当前图像已在预取中推理时直接等待其结果。
+        """
         if not self.current_image:
             QMessageBox.warning(self, "警告", "请先选择一个图像")
             return
@@ -299,53 +624,184 @@ class ImageViewerWidget(QGroupBox):
             if not self.load_yolo_model():
                 return
         
+        # 将PIL图像转换为路径，因为YOLO接受文件路径
+        if hasattr(self.current_yolo_label, 'image_path'):
+            image_path = self.current_yolo_label.image_path
+        else:
+            QMessageBox.warning(self, "警告", "无法获取图像路径")
+            return
+        
+        # 预取时已完成预测的图像直接使用缓存结果
+        prediction_key = self._get_prediction_cache_key(image_path)
+        cached = self._prediction_cache.get(prediction_key)
+        if cached is not None:
+            self._prediction_cache.move_to_end(prediction_key)
+            self._show_yolo_predictions(cached)
+            return
+        
+        # 禁用预测按钮，防止重复点击，结果返回后在 _on_prefetch_finished 中显示
+        self._awaited_prediction_key = prediction_key
+        self._set_prediction_busy(True)
+        if prediction_key not in self._predictions_in_flight:
+            self._submit_prefetch_task(image_path, decode=False, inference=self._make_inference_request(image_path))
+    
+    def _show_yolo_predictions(self, predictions):
+        """显示预测结果，并为接下来的图像预先执行预测
+        
+        Args:
+            predictions: 预测结果列表
+        """
+        self.yolo_predictions = [list(prediction) for prediction in predictions]
+        
+        # 显示预测结果
+        self.show_predictions = True
+        self.update_display_image(adjust_view=False)
+        
+        # 显示并启用预测操作按钮
+        self._update_prediction_buttons_visibility()
+        
+        # 显示预测结果提示
+        prediction_count = len(self.yolo_predictions)
+        self._show_prediction_result(prediction_count)
+        
+        # 用户开始使用预测后，为接下来的图像预先执行预测
+        self.prefetch_images(self._prefetch_candidates)
+    
+    def _set_prediction_busy(self, busy):
+        """切换预测按钮的等待状态
+        
+        Args:
+            busy: 是否正在等待预测结果
+        """
+        self.yolo_predict_button.setEnabled(not busy)
+        self.yolo_predict_button.setText("⏳" if busy else "🔍")
+    
+    def _make_inference_request(self, image_path):
+        """在界面线程中记录推理所需的模型和阈值，交给后台任务使用
+        
+        Args:
+            image_path: 图像文件路径
+        """
+        return (self.yolo_model, self._get_prediction_cache_key(image_path),
+                self.confidence_threshold, self.nms_iou_threshold)
+    
+    def _get_prediction_cache_key(self, image_path):
+        """生成预测结果缓存键，模型或阈值变化后旧结果自动失效
+        
+        Args:
+            image_path: 图像文件路径
+        """
         try:
-            # 禁用预测按钮，防止重复点击
-            self.yolo_predict_button.setEnabled(False)
-            self.yolo_predict_button.setText("⏳")
-            
-            # 将PIL图像转换为路径，因为YOLO接受文件路径
-            if hasattr(self.current_yolo_label, 'image_path'):
-                image_path = self.current_yolo_label.image_path
-            else:
-                QMessageBox.warning(self, "警告", "无法获取图像路径")
-                return
-            
-            # 执行预测
-            results = self.yolo_model(image_path, conf=self.confidence_threshold)
-            
-            # 解析预测结果
-            self.yolo_predictions = []
-            if results and len(results) > 0:
-                for result in results:
-                    if hasattr(result, 'boxes') and result.boxes is not None:
-                        boxes = result.boxes
-                        for i in range(len(boxes)):
-                            # 获取边界框坐标（归一化）
-                            box = boxes.xywhn[i].cpu().numpy()  # [center_x, center_y, width, height]
-                            conf = boxes.conf[i].cpu().numpy()  # 置信度
-                            cls = int(boxes.cls[i].cpu().numpy())  # 类别ID
-                            
-                            # 存储预测结果，格式为 [class_id, center_x, center_y, width, height, confidence]
-                            self.yolo_predictions.append([cls, box[0], box[1], box[2], box[3], conf])
-            
-            # 显示预测结果
-            self.show_predictions = True
-            self.update_display_image(adjust_view=False)
-            
-            # 显示并启用预测操作按钮
-            self._update_prediction_buttons_visibility()
-            
-            # 显示预测结果提示
-            prediction_count = len(self.yolo_predictions)
-            self._show_prediction_result(prediction_count)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"YOLO预测失败: {str(e)}")
-        finally:
-            # 恢复预测按钮状态
-            self.yolo_predict_button.setEnabled(True)
-            self.yolo_predict_button.setText("🔍")
+            mtime = os.path.getmtime(image_path)
+        except OSError:
+            mtime = None
+        return (image_path, mtime, self.current_model_name,
+                self.confidence_threshold, self.nms_iou_threshold)
+    
+    def _store_prediction_cache(self, prediction_key, predictions):
+        """保存预测结果到缓存，超出容量时淘汰最久未使用的结果"""
+        self._prediction_cache[prediction_key] = [tuple(prediction) for prediction in predictions]
+        self._prediction_cache.move_to_end(prediction_key)
+        while len(self._prediction_cache) > config.IMAGE_CACHE_SIZE:
+            self._prediction_cache.popitem(last=False)
+    
+    def prefetch_images(self, image_paths):
+        """在后台预取图像，使之后切换到这些图像时命中缓存
+        
+        只有当前正在显示预测结果时才预先执行预测，避免用户未使用预测时在后台占用模型。
+        同一轮预取中已提交的图像不会重复提交，跳转到未预取的图像时整轮取消。
+        
+        Args:
+            image_paths: 要预取的图像路径列表，按预计访问顺序排列
+        """
+        self._prefetch_candidates = list(image_paths)
+        predict = self.show_predictions and self.yolo_model is not None
+        submitted_paths = self._prefetch_predict_paths if predict else self._prefetch_paths
+        
+        for image_path in self._prefetch_candidates:
+            if not image_path or image_path in submitted_paths:
+                continue
+            
+            # 图像和需要的预测结果都已缓存或正在计算时无需预取
+            try:
+                cache_key = (image_path, os.path.getmtime(image_path))
+            except OSError:
+                continue
+            inference = None
+            if predict:
+                prediction_key = self._get_prediction_cache_key(image_path)
+                if (prediction_key not in self._prediction_cache
+                        and prediction_key not in self._predictions_in_flight):
+                    inference = self._make_inference_request(image_path)
+            decode = cache_key not in self._pixmap_cache and image_path not in self._prefetch_paths
+            if not decode and inference is None:
+                continue
+            
+            self._prefetch_paths.add(image_path)
+            if inference is not None:
+                self._prefetch_predict_paths.add(image_path)
+            self._submit_prefetch_task(image_path, decode=decode, inference=inference)
+    
+    def _submit_prefetch_task(self, image_path, decode, inference):
+        """提交一个后台预取任务
+        
+        Args:
+            image_path: 图像文件路径
+            decode: 是否解码图像
+            inference: 推理请求，见 _make_inference_request，不需要预测时为None
+        """
+        if inference is not None:
+            self._predictions_in_flight.add(inference[1])
+        task = _ImagePrefetchTask(image_path, self._prefetch_signals, self._prefetch_generation,
+                                  self._prefetch_cancel_event, decode=decode, inference=inference)
+        QThreadPool.globalInstance().start(task)
+    
+    def _cancel_prefetch(self):
+        """取消尚未完成的预取任务和正在等待的预测"""
+        self._prefetch_generation += 1
+        self._prefetch_cancel_event.set()
+        self._prefetch_cancel_event = threading.Event()
+        self._prefetch_paths.clear()
+        self._prefetch_predict_paths.clear()
+        self._predictions_in_flight.clear()
+        if self._awaited_prediction_key is not None:
+            self._awaited_prediction_key = None
+            self._set_prediction_busy(False)
+    
+    def _on_prefetch_finished(self, result):
+        """在界面线程中接收预取结果并写入缓存，用户正在等待的预测直接显示
+        
+        Args:
+            result: 预取任务返回的结果字典
+        """
+        # 已被取消的旧一轮预取结果直接丢弃
+        if result['generation'] != self._prefetch_generation:
+            return
+        
+        cache_key = result['cache_key']
+        if cache_key is not None and cache_key not in self._pixmap_cache:
+            self._store_pixmap_cache(cache_key, result['image'], QPixmap.fromImage(result['qimage']))
+        
+        prediction_key = result['prediction_key']
+        if prediction_key is None:
+            return
+        self._predictions_in_flight.discard(prediction_key)
+        if result['predictions'] is not None:
+            self._store_prediction_cache(prediction_key, result['predictions'])
+        
+        if prediction_key != self._awaited_prediction_key:
+            return
+        self._awaited_prediction_key = None
+        self._set_prediction_busy(False)
+        
+        # 等待期间切换了图像时只保留缓存，不显示到其他图像上
+        current_path = getattr(self.current_yolo_label, 'image_path', None)
+        if current_path != prediction_key[0]:
+            return
+        if result['predictions'] is None:
+            QMessageBox.critical(self, "错误", f"YOLO预测失败: {result['error']}")
+            return
+        self._show_yolo_predictions(result['predictions'])
     
     def get_prediction_at_position(self, scene_pos):
         """查找点击位置的预测框索引
@@ -360,7 +816,7 @@ class ImageViewerWidget(QGroupBox):
             return None
         
         # 获取图像尺寸
-        img_width, img_height = self.current_image.size
+        img_width, img_height = self._img_wh
         
         # 获取点击位置
         pos_x, pos_y = scene_pos.x(), scene_pos.y()
@@ -511,14 +967,33 @@ class ImageViewerWidget(QGroupBox):
             selected_model = self.model_manager.get_selected_model()
             tooltip = f"YOLO预测 (模型: {selected_model})"
         
+        tooltip += f"\n置信度阈值: {self.confidence_threshold:.2f}  NMS IoU阈值: {self.nms_iou_threshold:.2f}"
         self.yolo_predict_button.setToolTip(tooltip)
     
+    def set_prediction_thresholds(self, confidence_threshold=None, nms_iou_threshold=None):
+        """设置预测的置信度阈值和NMS的IoU阈值
+        
+        Args:
+            confidence_threshold: 置信度阈值（可选）
+            nms_iou_threshold: NMS的IoU阈值（可选）
+        """
+        if confidence_threshold is not None:
+            self.confidence_threshold = confidence_threshold
+        if nms_iou_threshold is not None:
+            self.nms_iou_threshold = nms_iou_threshold
+        
+        self._update_yolo_button_tooltip()
+    
     def reset_yolo_model(self):
         """重置YOLO模型（当模型设置更改时调用）"""
         # 重置当前模型
         self.yolo_model = None
         self.current_model_name = None
         
+        # 旧模型的预取和预测缓存不再有效
+        self._cancel_prefetch()
+        self._prediction_cache.clear()
+        
         # 重置预测结果
         self.reset_predictions()
         
@@ -543,42 +1018,24 @@ class ImageViewerWidget(QGroupBox):
             count: 识别到的对象数量
         """
         if count == 0:
-            self.prediction_result_label.setText("🔍  未识别到任何对象")
-            self.prediction_result_label.setStyleSheet("""
-                QLabel {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                        stop:0 rgba(255, 165, 0, 250), stop:1 rgba(255, 140, 0, 250));
-                    color: white;
-                    font-family: "Microsoft YaHei", "Segoe UI", Arial, sans-serif;
-                    font-size: 18px;
-                    font-weight: bold;
-                    padding: 16px 28px;
-                    border-radius: 25px;
-                    border: 3px solid rgba(255, 255, 255, 220);
-                    box-shadow: 0px 8px 16px rgba(0, 0, 0, 50);
-                    text-shadow: 0px 2px 4px rgba(0, 0, 0, 100);
-                }
-            """)
+            text = "🔍  未识别到任何对象"
         else:
-            self.prediction_result_label.setText(f"🎯 识别到 {count} 个对象")
-            self.prediction_result_label.setStyleSheet("""
-                QLabel {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                        stop:0 rgba(34, 139, 34, 250), stop:1 rgba(50, 205, 50, 250));
-                    color: white;
-                    font-family: "Microsoft YaHei", "Segoe UI", Arial, sans-serif;
-                    font-size: 18px;
-                    font-weight: bold;
-                    padding: 16px 28px;
-                    border-radius: 25px;
-                    border: 3px solid rgba(255, 255, 255, 220);
-                    box-shadow: 0px 8px 16px rgba(0, 0, 0, 50);
-                    text-shadow: 0px 2px 4px rgba(0, 0, 0, 100);
-                }
-            """)
-        
-        # 调整标签大小
-        self.prediction_result_label.adjustSize()
+            text = f"🎯 识别到 {count} 个对象"
+        self.prediction_result_label.setText(text)
+        
+        # 结果类型变化时才重新应用样式表，避免重复解析样式
+        result_state = count > 0
+        style_changed = result_state != self._last_result_state
+        if style_changed:
+            self.prediction_result_label.setStyleSheet(
+                self._QSS_RESULT_OK if result_state else self._QSS_RESULT_EMPTY
+            )
+            self._last_result_state = result_state
+        
+        # 样式和文本长度都未变化时无需重新计算标签大小
+        if style_changed or len(text) != self._last_result_text_length:
+            self.prediction_result_label.adjustSize()
+            self._last_result_text_length = len(text)
         
         # 定位到视图中心上方
         self._position_prediction_result_label()
@@ -620,13 +1077,13 @@ class ImageViewerWidget(QGroupBox):
             image_path: 图像文件路径
             label_path: 标签文件路径（可选）
         """
-        # 加载图像
-        self.current_image = image_utils.load_image(image_path)
-        if not self.current_image:
-            return False
+        # 跳转到非预取的图像时，取消尚未完成的预取
+        if image_path not in self._prefetch_paths:
+            self._cancel_prefetch()
         
-        # 转换为QPixmap对象
-        self.current_pixmap = image_utils.pil_to_pixmap(self.current_image)
+        # 加载图像（优先使用缓存，避免重复解码和转换）
+        if not self._load_image_cached(image_path):
+            return False
         
         # 加载标签数据
         if label_path and os.path.exists(label_path):
@@ -650,6 +1107,116 @@ class ImageViewerWidget(QGroupBox):
         
         return True
     
+    def _load_image_cached(self, image_path):
+        """从LRU缓存加载图像，未命中时解码并转换为QPixmap
+        
+        Args:
+            image_path: 图像文件路径
+            
+        Returns:
+            bool: 是否加载成功
+        """
+        try:
+            cache_key = (image_path, os.path.getmtime(image_path))
+        except OSError:
+            return False
+        
+        cached = self._pixmap_cache.get(cache_key)
+        if cached is not None:
+            # 命中缓存，移到队尾表示最近使用
+            self._pixmap_cache.move_to_end(cache_key)
+            self.current_image, self.current_pixmap = cached
+        else:
+            image = image_utils.load_image(image_path)
+            if not image:
+                return False
+            
+            self.current_image = image
+            self.current_pixmap = image_utils.pil_to_pixmap(image)
+            self._store_pixmap_cache(cache_key, self.current_image, self.current_pixmap)
+        
+        self._current_cache_key = cache_key
+        return True
+    
+    def _store_pixmap_cache(self, cache_key, image, pixmap):
+        """保存图像到缓存，超出数量或内存上限时淘汰最久未使用的图像（至少保留刚存入的一幅）"""
+        self._pixmap_cache[cache_key] = (image, pixmap)
+        self._pixmap_cache_bytes += _pil_image_bytes(image) + _pixmap_bytes(pixmap)
+        
+        max_bytes = config.IMAGE_CACHE_MAX_MB * 1024 * 1024
+        while len(self._pixmap_cache) > 1 and (
+                len(self._pixmap_cache) > config.IMAGE_CACHE_SIZE or self._pixmap_cache_bytes > max_bytes):
+            _, (old_image, old_pixmap) = self._pixmap_cache.popitem(last=False)
+            self._pixmap_cache_bytes -= _pil_image_bytes(old_image) + _pixmap_bytes(old_pixmap)
+    
+    def _store_composite_cache(self, image_key, content_key, pixmap):
+        """保存合成图，替换该图像原有的合成图，超出数量或内存上限时淘汰最久未使用的合成图"""
+        old = self._composite_cache.pop(image_key, None)
+        if old is not None:
+            self._composite_cache_bytes -= _pixmap_bytes(old[1])
+        self._composite_cache[image_key] = (content_key, pixmap)
+        self._composite_cache_bytes += _pixmap_bytes(pixmap)
+        
+        max_bytes = config.COMPOSITE_CACHE_MAX_MB * 1024 * 1024
+        while len(self._composite_cache) > 1 and (
+                len(self._composite_cache) > config.IMAGE_CACHE_SIZE or self._composite_cache_bytes > max_bytes):
+            _, (_, old_pixmap) = self._composite_cache.popitem(last=False)
+            self._composite_cache_bytes -= _pixmap_bytes(old_pixmap)
+    
+    def _get_composite_pixmap(self, labels, image_size):
+        """获取绘制了标注框和预测结果的图像，相同绘制内容直接复用缓存
+        
+        选中高亮由单独的图元绘制，不包含在合成图像中，切换选中项时可直接复用缓存。
+        
+        所有内容在同一个QPainter会话中绘制到一份图像副本上，避免逐层复制整幅图像。
+        
+        Args:
+            labels: 标签数据列表
+            image_size: 原始图像尺寸 (width, height)
+            
+        Returns:
+            QPixmap: 绘制完成的图像
+        """
+        predictions = self.yolo_predictions if self.show_predictions else []
+        
+        # 没有需要绘制的内容时直接使用原始图像（QPixmap为隐式共享，无需复制）
+        if not labels and not predictions:
+            return self.current_pixmap
+        
+        # 放大查看时只绘制视口附近的预测结果
+        visible_rect = self._get_prediction_cull_rect() if predictions else None
+        self._prediction_cull_rect = visible_rect
+        
+        content_key = (
+            tuple(tuple(label) for label in labels),
+            tuple(tuple(prediction) for prediction in predictions),
+            visible_rect.getRect() if visible_rect is not None else None
+        )
+        cached = self._composite_cache.get(self._current_cache_key)
+        if cached is not None and cached[0] == content_key:
+            self._composite_cache.move_to_end(self._current_cache_key)
+            return cached[1]
+        
+        # 只复制一次原始图像，并在同一个绘制会话中完成所有绘制
+        pixmap = QPixmap(self.current_pixmap)
+        pixmap_size = (pixmap.width(), pixmap.height())
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        if labels:
+            # 绘制所有边界框
+            image_utils.draw_boxes_qt_on(painter, labels, self.ship_types, image_size, pixmap_size)
+        
+        # 叠加绘制YOLO预测结果
+        if predictions:
+            self._draw_yolo_predictions_on(painter, image_size, pixmap_size, visible_rect)
+        
+        painter.end()
+        
+        self._store_composite_cache(self._current_cache_key, content_key, pixmap)
+        
+        return pixmap
+    
     def update_display_image(self, adjust_view=True):
         """更新显示图像（包括绘制标签框和预测结果）"""
         if not self.current_image or not self.current_pixmap:
@@ -658,46 +1225,18 @@ class ImageViewerWidget(QGroupBox):
         # 获取图像尺寸
         image_width, image_height = self.current_image.size
         
-        # 创建带有边界框的图像
-        if self.current_yolo_label and self.current_yolo_label.get_labels():
-            # 获取标签数据
-            labels = self.current_yolo_label.get_labels()
-            
-            # 绘制所有边界框
-            self.current_pixmap_with_boxes = image_utils.draw_boxes_qt(
-                self.current_pixmap, 
-                labels,
-                self.ship_types,
-                (image_width, image_height)
-            )
-            
-            # 如果有选中的边界框，使用特殊样式绘制
-            if self.selected_bbox_index >= 0 and self.selected_bbox_index < len(labels):
-                self.current_pixmap_with_boxes = image_utils.highlight_selected_box(
-                    self.current_pixmap_with_boxes,
-                    labels[self.selected_bbox_index],
-                    self.selected_bbox_index,
-                    (image_width, image_height)
-                )
-        else:
-            # 没有标签，直接使用原始图像
-            self.current_pixmap_with_boxes = QPixmap(self.current_pixmap)
-        
-        # 如果需要显示YOLO预测结果，叠加绘制
-        if self.show_predictions and self.yolo_predictions:
-            self.current_pixmap_with_boxes = self._draw_yolo_predictions(
-                self.current_pixmap_with_boxes, 
-                (image_width, image_height)
-            )
-        
-        # 清除场景
-        self.graphics_scene.clear()
-        
-        # 添加图像到场景
-        self.graphics_scene.addPixmap(self.current_pixmap_with_boxes)
+        # 在一次绘制中生成带有边界框和预测结果的图像
+        labels = self.current_yolo_label.get_labels() if self.current_yolo_label else []
+        self._bbox_hit_boxes = None
+        self.current_pixmap_with_boxes = self._get_composite_pixmap(
+            labels,
+            (image_width, image_height)
+        )
+        self._update_view_metrics()
         
-        # 设置场景矩形
-        self.graphics_scene.setSceneRect(self.graphics_scene.itemsBoundingRect())
+        # 替换场景中图像项的内容
+        self._set_scene_pixmap(self.current_pixmap_with_boxes)
+        self._update_selection_highlight()
         
         # 只有在需要时才调整视图缩放
         if adjust_view:
@@ -706,36 +1245,36 @@ class ImageViewerWidget(QGroupBox):
             # 如果不调整视图，至少确保按钮位置正确
             self._position_floating_buttons()
     
-    def _draw_yolo_predictions(self, pixmap, image_size):
-        """在图像上绘制YOLO预测结果
+    def _draw_yolo_predictions_on(self, painter, image_size, pixmap_size, visible_rect=None):
+        """使用已有的QPainter绘制YOLO预测结果
         
         Args:
-            pixmap: 要绘制的QPixmap
+            painter: 已在目标图像上激活的QPainter
             image_size: 原始图像尺寸 (width, height)
-            
-        Returns:
-            绘制了预测结果的QPixmap
+            pixmap_size: 目标图像尺寸 (width, height)
+            visible_rect: 需要绘制的场景区域，为None时绘制全部预测
         """
         if not self.yolo_predictions:
-            return pixmap
-        
-        # 创建副本
-        result = QPixmap(pixmap)
-        painter = QPainter(result)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            return
         
         img_width, img_height = image_size
-        pixmap_width = pixmap.width()
-        pixmap_height = pixmap.height()
+        pixmap_width, pixmap_height = pixmap_size
         
         # 计算比例因子
         scale_factor = min(pixmap_width / 800, pixmap_height / 600)
         if scale_factor < 0.5:
             scale_factor = 0.5
         
-        # 预处理标签信息和位置
+        # 预处理标签信息，标签位置在收集完全部预测后统一计算
         label_info_list = []
-        occupied_regions = []  # 记录已占用的标签区域，避免重叠
+        padding = max(4, int(4 * scale_factor))
+        
+        # 同一帧内所有标签使用相同字体，字体度量对象跨帧复用
+        font = QFont()
+        font.setPointSizeF(max(9, int(10 * scale_factor)))
+        font.setBold(True)
+        font_metrics = self._get_font_metrics(font)
+        text_height = font_metrics.height()
         
         for i, prediction in enumerate(self.yolo_predictions):
             class_id, center_x, center_y, width, height, confidence = prediction
@@ -754,8 +1293,8 @@ class ImageViewerWidget(QGroupBox):
             y2 = y_center + (box_height / 2)
             
             # 根据pixmap的当前大小进行适当缩放
-            scale_x = pixmap.width() / img_width
-            scale_y = pixmap.height() / img_height
+            scale_x = pixmap_width / img_width
+            scale_y = pixmap_height / img_height
             
             scaled_x1 = x1 * scale_x
             scaled_y1 = y1 * scale_y
@@ -766,37 +1305,18 @@ class ImageViewerWidget(QGroupBox):
             ship_type = self.ship_types.get(str(class_id_int), f"类别{class_id_int}")
             label_text = f"{ship_type} {confidence:.2f}"
             
-            # 设置字体
-            from PySide6.QtGui import QFont, QFontMetrics
-            font = QFont()
-            font.setPointSizeF(max(9, int(10 * scale_factor)))
-            font.setBold(True)
-            
             # 计算文本尺寸
-            font_metrics = QFontMetrics(font)
             text_width = font_metrics.horizontalAdvance(label_text)
-            text_height = font_metrics.height()
             
             # 添加边距
-            padding = max(4, int(4 * scale_factor))
             label_width = text_width + padding * 2
             label_height = text_height + padding
             
-            # 智能计算标签位置，避免重叠
-            label_x, label_y = self._calculate_smart_label_position(
-                scaled_x1, scaled_y1, scaled_x2, scaled_y2,
-                label_width, label_height, padding,
-                pixmap_width, pixmap_height, occupied_regions
-            )
-            
-            # 记录此标签占用的区域
-            label_rect = QRectF(label_x, label_y, label_width, label_height)
-            occupied_regions.append(label_rect)
-            
             # 存储标签信息
             label_info_list.append({
                 'bbox': (scaled_x1, scaled_y1, scaled_x2, scaled_y2),
-                'label_rect': label_rect,
+                'bbox_rect': QRectF(scaled_x1, scaled_y1, scaled_x2 - scaled_x1, scaled_y2 - scaled_y1),
+                'label_size': (label_width, label_height),
                 'label_text': label_text,
                 'font': font,
                 'padding': padding,
@@ -804,306 +1324,181 @@ class ImageViewerWidget(QGroupBox):
                 'scale_factor': scale_factor
             })
         
-        # 先绘制所有边界框
-        for label_info in label_info_list:
-            scaled_x1, scaled_y1, scaled_x2, scaled_y2 = label_info['bbox']
-            prediction_color = label_info['prediction_color']
-            scale_factor = label_info['scale_factor']
-            
-            # 绘制预测边界框（虚线）
-            pen = QPen(prediction_color)
-            pen.setWidth(max(1, int(2 * scale_factor)))
-            pen.setStyle(Qt.PenStyle.DashLine)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            
-            # 绘制边界框
-            painter.drawRect(QRectF(scaled_x1, scaled_y1, scaled_x2 - scaled_x1, scaled_y2 - scaled_y1))
+        # 一次性计算全部标签位置，避免重叠；网格索引只检查附近的标签
+        label_positions = place_all(
+            [label_info['bbox'] for label_info in label_info_list],
+            [label_info['label_size'] for label_info in label_info_list],
+            (pixmap_width, pixmap_height),
+            padding,
+            128 * scale_factor
+        )
+        for label_info, (label_x, label_y) in zip(label_info_list, label_positions):
+            label_width, label_height = label_info['label_size']
+            label_info['label_rect'] = QRectF(label_x, label_y, label_width, label_height)
+        
+        # 标签布局基于全部预测计算，保证平移缩放时标签位置稳定；绘制时只处理可见区域内的内容
+        if visible_rect is not None:
+            label_info_list = [
+                label_info for label_info in label_info_list
+                if visible_rect.intersects(label_info['bbox_rect'])
+                or visible_rect.intersects(label_info['label_rect'])
+            ]
+        if not label_info_list:
+            return
         
-        # 再绘制所有标签（确保标签在边界框之上）
-        for label_info in label_info_list:
-            self._draw_prediction_label(painter, label_info)
+        # 所有预测框使用相同的虚线画笔，合并为一次drawRects调用
+        pen = QPen(QColor("#FF6B00"))
+        pen.setWidth(max(1, int(2 * scale_factor)))
+        pen.setStyle(Qt.PenStyle.DashLine)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRects([label_info['bbox_rect'] for label_info in label_info_list])
         
-        painter.end()
-        return result
+        # 再绘制所有标签（确保标签在边界框之上）
+        self._draw_prediction_labels(painter, label_info_list)
     
-    def _calculate_smart_label_position(self, bbox_x1, bbox_y1, bbox_x2, bbox_y2, 
-                                       label_width, label_height, padding,
-                                       pixmap_width, pixmap_height, occupied_regions):
-        """智能计算标签位置，避免与其他标签重叠
+    def _get_font_metrics(self, font):
+        """获取字体的度量对象，相同字体只创建一次
         
         Args:
-            bbox_x1, bbox_y1, bbox_x2, bbox_y2: 边界框坐标
-            label_width, label_height: 标签尺寸
-            padding: 内边距
-            pixmap_width, pixmap_height: 图像尺寸
-            occupied_regions: 已占用的标签区域列表
+            font: QFont对象
             
         Returns:
-            tuple: (label_x, label_y) 标签位置
+            QFontMetricsF对象
         """
-        # 候选位置列表：按优先级排序
-        # 0: 上方中央, 1: 下方中央, 2: 左上, 3: 右上, 4: 左下, 5: 右下, 6: 左侧, 7: 右侧
-        candidate_positions = [
-            # 上方中央（默认位置）
-            (bbox_x1 + (bbox_x2 - bbox_x1 - label_width) / 2, bbox_y1 - label_height - padding),
-            # 下方中央
-            (bbox_x1 + (bbox_x2 - bbox_x1 - label_width) / 2, bbox_y2 + padding),
-            # 左上角
-            (bbox_x1, bbox_y1 - label_height - padding),
-            # 右上角
-            (bbox_x2 - label_width, bbox_y1 - label_height - padding),
-            # 左下角
-            (bbox_x1, bbox_y2 + padding),
-            # 右下角
-            (bbox_x2 - label_width, bbox_y2 + padding),
-            # 左侧中央
-            (bbox_x1 - label_width - padding, bbox_y1 + (bbox_y2 - bbox_y1 - label_height) / 2),
-            # 右侧中央
-            (bbox_x2 + padding, bbox_y1 + (bbox_y2 - bbox_y1 - label_height) / 2),
-        ]
-        
-        # 尝试每个候选位置
-        for label_x, label_y in candidate_positions:
-            # 边界检查和调整
-            label_x = max(0, min(pixmap_width - label_width, label_x))
-            label_y = max(0, min(pixmap_height - label_height, label_y))
-            
-            # 创建候选标签矩形
-            candidate_rect = QRectF(label_x, label_y, label_width, label_height)
-            
-            # 检查是否与已有标签重叠
-            overlapping = False
-            for occupied_rect in occupied_regions:
-                if candidate_rect.intersects(occupied_rect):
-                    # 计算重叠面积比例
-                    intersection = candidate_rect.intersected(occupied_rect)
-                    overlap_ratio = (intersection.width() * intersection.height()) / (label_width * label_height)
-                    
-                    # 如果重叠面积超过30%，认为是重叠
-                    if overlap_ratio > 0.3:
-                        overlapping = True
-                        break
-            
-            # 如果没有重叠，使用这个位置
-            if not overlapping:
-                return label_x, label_y
-        
-        # 如果所有候选位置都重叠，尝试偏移策略
-        return self._find_offset_position(
-            bbox_x1, bbox_y1, bbox_x2, bbox_y2,
-            label_width, label_height, padding,
-            pixmap_width, pixmap_height, occupied_regions
-        )
+        key = (font.family(), font.pointSizeF(), font.weight())
+        font_metrics = self._font_metrics_cache.get(key)
+        if font_metrics is None:
+            font_metrics = self._font_metrics_cache[key] = QFontMetricsF(font)
+        return font_metrics
     
-    def _find_offset_position(self, bbox_x1, bbox_y1, bbox_x2, bbox_y2,
-                             label_width, label_height, padding,
-                             pixmap_width, pixmap_height, occupied_regions):
-        """当标准位置都重叠时，寻找偏移位置
-        
-        Returns:
-            tuple: (label_x, label_y) 标签位置
-        """
-        # 使用默认位置（上方中央）作为起点
-        base_x = bbox_x1 + (bbox_x2 - bbox_x1 - label_width) / 2
-        base_y = bbox_y1 - label_height - padding
-        
-        # 如果上方越界，使用下方
-        if base_y < 0:
-            base_y = bbox_y2 + padding
-        
-        # 尝试垂直偏移
-        offset_step = label_height + padding
-        max_attempts = 5
-        
-        for attempt in range(max_attempts):
-            # 向上偏移
-            test_y = base_y - (attempt + 1) * offset_step
-            if test_y >= 0:
-                test_x = max(0, min(pixmap_width - label_width, base_x))
-                candidate_rect = QRectF(test_x, test_y, label_width, label_height)
-                
-                overlapping = False
-                for occupied_rect in occupied_regions:
-                    if candidate_rect.intersects(occupied_rect):
-                        intersection = candidate_rect.intersected(occupied_rect)
-                        overlap_ratio = (intersection.width() * intersection.height()) / (label_width * label_height)
-                        if overlap_ratio > 0.2:  # 降低重叠阈值
-                            overlapping = True
-                            break
-                
-                if not overlapping:
-                    return test_x, test_y
-            
-            # 向下偏移
-            test_y = base_y + (attempt + 1) * offset_step
-            if test_y + label_height <= pixmap_height:
-                test_x = max(0, min(pixmap_width - label_width, base_x))
-                candidate_rect = QRectF(test_x, test_y, label_width, label_height)
-                
-                overlapping = False
-                for occupied_rect in occupied_regions:
-                    if candidate_rect.intersects(occupied_rect):
-                        intersection = candidate_rect.intersected(occupied_rect)
-                        overlap_ratio = (intersection.width() * intersection.height()) / (label_width * label_height)
-                        if overlap_ratio > 0.2:
-                            overlapping = True
-                            break
-                
-                if not overlapping:
-                    return test_x, test_y
-        
-        # 如果垂直偏移也不行，尝试水平偏移
-        for attempt in range(max_attempts):
-            # 向左偏移
-            test_x = base_x - (attempt + 1) * (label_width + padding)
-            if test_x >= 0:
-                test_y = max(0, min(pixmap_height - label_height, base_y))
-                candidate_rect = QRectF(test_x, test_y, label_width, label_height)
-                
-                overlapping = False
-                for occupied_rect in occupied_regions:
-                    if candidate_rect.intersects(occupied_rect):
-                        intersection = candidate_rect.intersected(occupied_rect)
-                        overlap_ratio = (intersection.width() * intersection.height()) / (label_width * label_height)
-                        if overlap_ratio > 0.2:
-                            overlapping = True
-                            break
-                
-                if not overlapping:
-                    return test_x, test_y
-            
-            # 向右偏移
-            test_x = base_x + (attempt + 1) * (label_width + padding)
-            if test_x + label_width <= pixmap_width:
-                test_y = max(0, min(pixmap_height - label_height, base_y))
-                candidate_rect = QRectF(test_x, test_y, label_width, label_height)
-                
-                overlapping = False
-                for occupied_rect in occupied_regions:
-                    if candidate_rect.intersects(occupied_rect):
-                        intersection = candidate_rect.intersected(occupied_rect)
-                        overlap_ratio = (intersection.width() * intersection.height()) / (label_width * label_height)
-                        if overlap_ratio > 0.2:
-                            overlapping = True
-                            break
-                
-                if not overlapping:
-                    return test_x, test_y
+    def _draw_prediction_labels(self, painter, label_info_list):
+        """批量绘制预测标签
         
-        # 最终回退：使用边界限制的基础位置
-        final_x = max(0, min(pixmap_width - label_width, base_x))
-        final_y = max(0, min(pixmap_height - label_height, base_y))
-        return final_x, final_y
-    
-    def _draw_prediction_label(self, painter, label_info):
-        """绘制单个预测标签
+        按颜色分组后依次绘制全部背景、全部边框和全部文字，使画笔、画刷和字体的
+        切换次数只与颜色种类数有关，而不随标签数量增长。
         
         Args:
             painter: QPainter对象
-            label_info: 标签信息字典
+            label_info_list: 标签信息字典列表，同一批标签的缩放因子和字体相同
         """
-        label_rect = label_info['label_rect']
-        label_text = label_info['label_text']
-        font = label_info['font']
-        padding = label_info['padding']
-        prediction_color = label_info['prediction_color']
-        scale_factor = label_info['scale_factor']
-        
-        # 设置字体
-        painter.setFont(font)
+        first_info = label_info_list[0]
+        scale_factor = first_info['scale_factor']
+        corner_radius = max(3, int(4 * scale_factor))
         
-        # 创建半透明背景色
-        bg_color = QColor(prediction_color)
-        bg_color.setAlpha(200)
+        # 按预测颜色分组，同色标签共用一个半透明背景画刷
+        color_groups = {}
+        for label_info in label_info_list:
+            color_key = label_info['prediction_color'].rgba()
+            if color_key not in color_groups:
+                bg_color = QColor(label_info['prediction_color'])
+                bg_color.setAlpha(200)
+                color_groups[color_key] = (QBrush(bg_color), [])
+            color_groups[color_key][1].append(label_info['label_rect'])
         
         # 绘制标签背景
-        corner_radius = max(3, int(4 * scale_factor))
         painter.setPen(Qt.PenStyle.NoPen)
-        from PySide6.QtGui import QBrush
-        painter.setBrush(QBrush(bg_color))
-        painter.drawRoundedRect(label_rect, corner_radius, corner_radius)
+        for brush, label_rects in color_groups.values():
+            painter.setBrush(brush)
+            for label_rect in label_rects:
+                painter.drawRoundedRect(label_rect, corner_radius, corner_radius)
         
         # 添加白色边框增强可见性
         border_pen = QPen(QColor("white"))
         border_pen.setWidth(max(1, int(1 * scale_factor)))
         painter.setPen(border_pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawRoundedRect(label_rect, corner_radius, corner_radius)
+        for label_info in label_info_list:
+            painter.drawRoundedRect(label_info['label_rect'], corner_radius, corner_radius)
         
         # 绘制文字
+        painter.setFont(first_info['font'])
         painter.setPen(QColor("white"))
-        text_rect = QRectF(
-            label_rect.x() + padding,
-            label_rect.y(),
-            label_rect.width() - padding * 2,
-            label_rect.height()
-        )
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, label_text)
+        for label_info in label_info_list:
+            label_rect = label_info['label_rect']
+            padding = label_info['padding']
+            text_rect = QRectF(
+                label_rect.x() + padding,
+                label_rect.y(),
+                label_rect.width() - padding * 2,
+                label_rect.height()
+            )
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, label_info['label_text'])
+    
+    def _update_view_metrics(self):
+        """更新鼠标事件处理中使用的图像尺寸和缩放比例缓存"""
+        img_width, img_height = self.current_image.size
+        pixmap_width = self.current_pixmap_with_boxes.width()
+        pixmap_height = self.current_pixmap_with_boxes.height()
+        
+        self._img_wh = (img_width, img_height)
+        self._pixmap_wh = (pixmap_width, pixmap_height)
+        self._scale_xy = (pixmap_width / img_width, pixmap_height / img_height)
+        self._inv_scale_xy = (img_width / pixmap_width, img_height / pixmap_height)
+    
+    def _set_scene_pixmap(self, pixmap):
+        """替换场景中显示的图像，仅在图像尺寸变化时更新场景矩形
+        
+        Args:
+            pixmap: 要显示的QPixmap
+        """
+        self._pixmap_item.setPixmap(pixmap)
+        
+        pixmap_rect = QRectF(pixmap.rect())
+        if self.graphics_scene.sceneRect() != pixmap_rect:
+            self.graphics_scene.setSceneRect(pixmap_rect)
     
     def adjust_image_to_view(self):
         """根据当前视图大小调整图像显示"""
-        if not hasattr(self, 'graphics_scene') or not self.graphics_scene.items():
+        if self._pixmap_item.pixmap().isNull():
             return
-            
-        pixmap_item = self.graphics_scene.items()[0]
-        if isinstance(pixmap_item, QGraphicsPixmapItem):
-            # 调整视图以适应场景内容，保持纵横比
-            self.graphics_view.fitInView(
-                pixmap_item.boundingRect(), 
-                Qt.AspectRatioMode.KeepAspectRatio
-            )
-            
-            # 更新场景范围确保包含整个图像
-            self.graphics_scene.setSceneRect(pixmap_item.boundingRect())
-            
-            # 确保悬浮按钮依然位于正确位置
-            self._position_floating_buttons()
+        
+        # 调整视图以适应场景内容，保持纵横比
+        self.graphics_view.fitInView(
+            self._pixmap_item.boundingRect(), 
+            Qt.AspectRatioMode.KeepAspectRatio
+        )
+        self.graphics_view.update_zoom_state()
+        
+        # 更新场景范围确保包含整个图像
+        self.graphics_scene.setSceneRect(self._pixmap_item.boundingRect())
+        
+        # 确保悬浮按钮依然位于正确位置
+        self._position_floating_buttons()
     
     def _position_floating_buttons(self):
         """定位悬浮按钮的位置"""
-        if not hasattr(self, 'reset_zoom_button'):
+        if self._floating_buttons is None:
             return
+        reset_zoom_button, yolo_predict_button, accept_button, reset_button = self._floating_buttons
         
         # 获取图形视图的尺寸
         view_width = self.graphics_view.width()
-        view_height = self.graphics_view.height()
         
         # 定位重置缩放按钮（右上角）
-        self.reset_zoom_button.move(view_width - self.reset_zoom_button.width() - 10, 10)
+        reset_zoom_button.move(view_width - reset_zoom_button.width() - 10, 10)
         
         # 定位YOLO预测按钮（重置缩放按钮下方）
-        if hasattr(self, 'yolo_predict_button'):
-            yolo_y = 10 + self.reset_zoom_button.height() + 8
-            self.yolo_predict_button.move(
-                view_width - self.yolo_predict_button.width() - 8, 
-                yolo_y
-            )
-            
-
+        yolo_x = view_width - yolo_predict_button.width() - 8
+        yolo_y = 10 + reset_zoom_button.height() + 8
+        yolo_predict_button.move(yolo_x, yolo_y)
+        
+        # 当有预测结果时，在预测按钮左侧排列接受和删除按钮
+        if accept_button.isVisible():
+            # 接受所有按钮（最左）
+            accept_x = yolo_x - accept_button.width() - 4
+            accept_button.move(accept_x, yolo_y)
             
-            # 当有预测结果时，在预测按钮左侧排列接受和删除按钮
-            if hasattr(self, 'accept_all_predictions_button') and self.accept_all_predictions_button.isVisible():
-                # 接受所有按钮（最左）
-                accept_x = view_width - self.yolo_predict_button.width() - 8 - self.accept_all_predictions_button.width() - 4
-                self.accept_all_predictions_button.move(accept_x, yolo_y)
-                
-                # 删除所有按钮（中间）
-                if hasattr(self, 'reset_predictions_button') and self.reset_predictions_button.isVisible():
-                    reset_x = accept_x - self.reset_predictions_button.width() - 4
-                    self.reset_predictions_button.move(reset_x, yolo_y)
+            # 删除所有按钮（中间）
+            if reset_button.isVisible():
+                reset_button.move(accept_x - reset_button.width() - 4, yolo_y)
         
         # 确保按钮在最顶层
-        self.reset_zoom_button.raise_()
-        if hasattr(self, 'yolo_predict_button'):
-            self.yolo_predict_button.raise_()
-        if hasattr(self, 'accept_all_predictions_button'):
-            self.accept_all_predictions_button.raise_()
-        if hasattr(self, 'reset_predictions_button'):
-            self.reset_predictions_button.raise_()
+        for button in self._floating_buttons:
+            button.raise_()
         
         # 重新定位预测结果标签（如果可见）
-        if hasattr(self, 'prediction_result_label') and self.prediction_result_label.isVisible():
+        if self.prediction_result_label.isVisible():
             self._position_prediction_result_label()
     
     def resizeEvent(self, event):
@@ -1118,10 +1513,37 @@ class ImageViewerWidget(QGroupBox):
         # 窗口显示时定位悬浮按钮
         self._position_floating_buttons()
     
+    def _get_prediction_cull_rect(self):
+        """计算绘制预测结果时的裁剪区域
+        
+        Returns:
+            QRectF: 视图放大时返回向四周扩展半个视口的可见场景区域，否则返回None（绘制全部）
+        """
+        if not self.is_view_zoomed():
+            return None
+        
+        visible = self.graphics_view.mapToScene(self.graphics_view.viewport().rect()).boundingRect()
+        margin_x = visible.width() / 2
+        margin_y = visible.height() / 2
+        return visible.adjusted(-margin_x, -margin_y, margin_x, margin_y).toAlignedRect().toRectF()
+    
+    def _on_view_changed(self):
+        """视图平移或缩放后，若可见区域超出上次绘制预测的范围则重绘"""
+        if not self.show_predictions or not self.yolo_predictions:
+            return
+        
+        cull_rect = self._prediction_cull_rect
+        if cull_rect is None:
+            # 上次绘制了全部预测，放大后无需重绘
+            return
+        
+        visible = self.graphics_view.mapToScene(self.graphics_view.viewport().rect()).boundingRect()
+        if not self.is_view_zoomed() or not cull_rect.contains(visible):
+            self._view_refresh_timer.start()
+    
     def is_view_zoomed(self):
-        """检测当前视图是否已缩放"""
-        transform = self.graphics_view.transform()
-        return transform.m11() > 1.01 or transform.m22() > 1.01
+        """检测当前视图是否已缩放（使用视图缓存的缩放状态）"""
+        return self.graphics_view.is_zoomed
     
     def on_graphics_view_click(self, event):
         """图形视图点击事件处理"""
@@ -1133,19 +1555,12 @@ class ImageViewerWidget(QGroupBox):
         
         # 获取标签
         labels = self.current_yolo_label.get_labels()
-        img_width, img_height = self.current_image.size
+        img_width, img_height = self._img_wh
         
         # 调整坐标以匹配原始图像坐标
         if self.current_pixmap_with_boxes:
-            pixmap_width = self.current_pixmap_with_boxes.width()
-            pixmap_height = self.current_pixmap_with_boxes.height()
-            
-            scale_x = pixmap_width / img_width
-            scale_y = pixmap_height / img_height
-            
-            adjusted_x = scene_pos.x() / scale_x
-            adjusted_y = scene_pos.y() / scale_y
-            adjusted_pos = QPointF(adjusted_x, adjusted_y)
+            inv_scale_x, inv_scale_y = self._inv_scale_xy
+            adjusted_pos = QPointF(scene_pos.x() * inv_scale_x, scene_pos.y() * inv_scale_y)
             
             # 处理右键点击
             if event.button() == Qt.MouseButton.RightButton:
@@ -1175,8 +1590,8 @@ class ImageViewerWidget(QGroupBox):
             
             # 检查是否点击在边界框的角点上
             view_size = (self.graphics_view.width(), self.graphics_view.height())
-            bbox_idx, corner_idx = image_utils.get_bbox_corner_at_position(
-                adjusted_pos, labels, (img_width, img_height), view_size
+            bbox_idx, corner_idx = self._find_bbox_hit(
+                image_utils.find_bbox_corner_hit, adjusted_pos
             )
             
             if bbox_idx is not None and corner_idx is not None:
@@ -1197,8 +1612,8 @@ class ImageViewerWidget(QGroupBox):
                 return
             
             # 检查是否点击在边界框的边线上
-            bbox_idx, edge_idx = image_utils.get_bbox_edge_at_position(
-                adjusted_pos, labels, (img_width, img_height), view_size
+            bbox_idx, edge_idx = self._find_bbox_hit(
+                image_utils.find_bbox_edge_hit, adjusted_pos
             )
             
             if bbox_idx is not None and edge_idx is not None:
@@ -1291,12 +1706,7 @@ class ImageViewerWidget(QGroupBox):
             self._finish_bbox_dragging()
         
         # 重置拖动状态
-        self.is_dragging = False
-        self.dragging_point_index = -1
-        self.dragging_bbox_index = -1
-        self.is_edge_dragging = False
-        self.dragging_edge_index = -1
-        self.original_cursor_pos = None
+        self._reset_drag_state()
         
         # 根据缩放状态设置合适的光标
         if self.is_view_zoomed():
@@ -1312,20 +1722,14 @@ class ImageViewerWidget(QGroupBox):
         # 将鼠标位置转换为场景坐标
         scene_pos = self.graphics_view.mapToScene(event.pos())
         
-        # 获取图像尺寸
-        img_width, img_height = self.current_image.size
-        
-        # 获取图像在场景中的缩放比例
-        pixmap_width = self.current_pixmap_with_boxes.width()
-        pixmap_height = self.current_pixmap_with_boxes.height()
-        
-        # 计算缩放比例
-        scale_x = pixmap_width / img_width
-        scale_y = pixmap_height / img_height
+        # 获取图像尺寸和缩放比例
+        img_width, img_height = self._img_wh
+        scale_x, scale_y = self._scale_xy
+        inv_scale_x, inv_scale_y = self._inv_scale_xy
         
         # 调整坐标到图像空间
-        current_x = scene_pos.x() / scale_x
-        current_y = scene_pos.y() / scale_y
+        current_x = scene_pos.x() * inv_scale_x
+        current_y = scene_pos.y() * inv_scale_y
         
         # 确保坐标在图像范围内
         current_x = max(0, min(img_width, current_x))
@@ -1348,46 +1752,20 @@ class ImageViewerWidget(QGroupBox):
         x2 = max(start_x, current_x)
         y2 = max(start_y, current_y)
         
-        # 使用临时边界框重绘图像
-        temp_pixmap = QPixmap(self.current_pixmap)
-        painter = QPainter(temp_pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # 设置绘制样式（虚线）
-        pen = QPen(QColor("#FF0000"))  # 红色
-        pen.setWidth(2)
-        pen.setStyle(Qt.PenStyle.DashLine)
-        painter.setPen(pen)
-        
         # 转换为场景坐标
         scene_x1 = x1 * scale_x
         scene_y1 = y1 * scale_y
         scene_x2 = x2 * scale_x
         scene_y2 = y2 * scale_y
         
-        # 创建半透明填充
-        fill_color = QColor(255, 0, 0, 40)  # 红色半透明填充
-        painter.setBrush(fill_color)
-        
-        # 绘制临时边界框
-        painter.drawRect(QRectF(scene_x1, scene_y1, scene_x2 - scene_x1, scene_y2 - scene_y1))
-        
-        # 添加外边框以增强可见性
-        pen.setColor(QColor("#FFFFFF"))  # 白色外边框
-        pen.setWidth(1)
-        pen.setStyle(Qt.PenStyle.DashLine)
-        painter.setPen(pen)
-        painter.setBrush(Qt.BrushStyle.NoBrush)  # 无填充
-        painter.drawRect(QRectF(scene_x1-1, scene_y1-1, scene_x2 - scene_x1 + 2, scene_y2 - scene_y1 + 2))
-        
-        painter.end()
-        
-        # 清除场景并添加临时图像，但不重置视图
-        self.graphics_scene.clear()
-        self.graphics_scene.addPixmap(temp_pixmap)
+        # 绘制期间显示不带标注框的原图，只在开始时切换一次
+        if not self._rubber_band_item.isVisible():
+            self._set_scene_pixmap(self.current_pixmap)
+            self._rubber_band_item.setVisible(True)
+            self._highlight_item.setVisible(False)
         
-        # 确保场景矩形包含整个图像
-        self.graphics_scene.setSceneRect(temp_pixmap.rect())
+        # 只更新橡皮筋矩形，不再复制和重绘整张图像
+        self._rubber_band_item.set_scene_rect(scene_x1, scene_y1, scene_x2, scene_y2)
     
     def _handle_bbox_dragging(self, event):
         """处理标注框拖动"""
@@ -1407,20 +1785,13 @@ class ImageViewerWidget(QGroupBox):
         # 将鼠标位置转换为场景坐标
         scene_pos = self.graphics_view.mapToScene(event.pos())
         
-        # 获取图像尺寸
-        img_width, img_height = self.current_image.size
-        
-        # 获取图像在场景中的缩放比例
-        pixmap_width = self.current_pixmap_with_boxes.width()
-        pixmap_height = self.current_pixmap_with_boxes.height()
-        
-        # 计算缩放比例
-        scale_x = pixmap_width / img_width
-        scale_y = pixmap_height / img_height
+        # 获取图像尺寸和缩放比例
+        img_width, img_height = self._img_wh
+        inv_scale_x, inv_scale_y = self._inv_scale_xy
         
         # 调整坐标到图像空间
-        current_x = scene_pos.x() / scale_x
-        current_y = scene_pos.y() / scale_y
+        current_x = scene_pos.x() * inv_scale_x
+        current_y = scene_pos.y() * inv_scale_y
         
         # 确保坐标在图像范围内
         current_x = max(0, min(img_width, current_x))
@@ -1428,6 +1799,11 @@ class ImageViewerWidget(QGroupBox):
         
         adjusted_pos = QPointF(current_x, current_y)
         
+        # 记录拖动前的坐标和当前覆盖区域（标签会被原地修改）
+        if self._drag_start_label is None:
+            self._drag_start_label = list(label)
+        old_paint_rect = image_utils.box_paint_rect(label, self.ship_types, self._img_wh, self._pixmap_wh)
+        
         # 获取当前标签的归一化坐标和尺寸
         class_id, center_x, center_y, width, height = label
         
@@ -1501,9 +1877,72 @@ class ImageViewerWidget(QGroupBox):
         self.current_yolo_label.update_label_coords(
             self.dragging_bbox_index, new_center_x, new_center_y, new_width, new_height
         )
+        self._bbox_hit_boxes = None
         
-        # 更新显示，不调整视图以保持当前缩放状态
-        self.update_display_image(adjust_view=False)
+        # 记录需要重绘的区域：标注框移动前后覆盖范围的并集
+        new_paint_rect = image_utils.box_paint_rect(label, self.ship_types, self._img_wh, self._pixmap_wh)
+        self._dirty_rect = self._dirty_rect.united(old_paint_rect).united(new_paint_rect)
+        
+        # 延迟到事件循环空闲时再重绘，期间的鼠标移动只更新坐标
+        event.accept()
+        if not self._drag_redraw_timer.isActive():
+            self._drag_redraw_timer.start()
+    
+    def _get_bbox_hit_boxes(self):
+        """获取当前标签的像素坐标边界框数组和网格索引，标签变化后首次使用时重建"""
+        if self._bbox_hit_boxes is None:
+            boxes = image_utils.labels_to_xyxy(
+                self.current_yolo_label.get_labels(), self._img_wh
+            )
+            self._bbox_hit_boxes = (boxes, image_utils.build_bbox_hit_grid(boxes))
+        return self._bbox_hit_boxes
+    
+    def _find_bbox_hit(self, find_hit, pos):
+        """在鼠标所在网格单元格内查找命中的角点或边线
+        
+        Args:
+            find_hit: image_utils.find_bbox_corner_hit 或 image_utils.find_bbox_edge_hit
+            pos: 原始图像坐标中的位置
+            
+        Returns:
+            (边界框索引, 角点/边线索引)，如果未找到则返回(None, None)
+        """
+        boxes, grid = self._get_bbox_hit_boxes()
+        return image_utils.find_bbox_hit_in_grid(find_hit, boxes, grid, pos.x(), pos.y())
+    
+    def _repaint_dirty_region(self):
+        """拖动标注框时只重绘变化的区域，而不是重新合成整幅图像"""
+        if self._dirty_rect.isNull() or not self.current_pixmap or not self.current_pixmap_with_boxes:
+            return
+        
+        dirty = self._dirty_rect.adjusted(-2, -2, 2, 2).toAlignedRect().intersected(self.current_pixmap.rect())
+        self._dirty_rect = QRectF()
+        if dirty.isEmpty():
+            return
+        
+        # 拖动开始时复制一次合成图像（缓存中的图像保持不变），之后只在这份副本上局部重绘
+        if self._drag_pixmap is None:
+            self._drag_pixmap = QPixmap(self.current_pixmap_with_boxes)
+        
+        # 图像项也引用同一份图像数据，先释放引用，避免绘制时整幅复制
+        self._pixmap_item.setPixmap(QPixmap())
+        
+        painter = QPainter(self._drag_pixmap)
+        painter.setClipRect(dirty)
+        painter.drawPixmap(dirty, self.current_pixmap, dirty)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # 裁剪区域外的绘制会被直接丢弃，只有与变化区域相交的内容被实际光栅化
+        labels = self.current_yolo_label.get_labels() if self.current_yolo_label else []
+        if labels:
+            image_utils.draw_boxes_qt_on(painter, labels, self.ship_types, self._img_wh, self._pixmap_wh)
+        if self.show_predictions and self.yolo_predictions:
+            self._draw_yolo_predictions_on(painter, self._img_wh, self._pixmap_wh, QRectF(dirty))
+        painter.end()
+        
+        self.current_pixmap_with_boxes = self._drag_pixmap
+        self._pixmap_item.setPixmap(self._drag_pixmap)
+        self._update_selection_highlight()
     
     def _update_cursor_for_position(self, event):
         """根据鼠标位置更新光标"""
@@ -1517,27 +1956,14 @@ class ImageViewerWidget(QGroupBox):
         # 将鼠标位置转换为场景坐标
         scene_pos = self.graphics_view.mapToScene(event.pos())
         
-        # 获取标签
-        labels = self.current_yolo_label.get_labels()
-        img_width, img_height = self.current_image.size
-        
         # 调整坐标以匹配原始图像坐标
         if self.current_pixmap_with_boxes:
-            pixmap_width = self.current_pixmap_with_boxes.width()
-            pixmap_height = self.current_pixmap_with_boxes.height()
-            
-            scale_x = pixmap_width / img_width
-            scale_y = pixmap_height / img_height
-            
-            adjusted_x = scene_pos.x() / scale_x
-            adjusted_y = scene_pos.y() / scale_y
-            adjusted_pos = QPointF(adjusted_x, adjusted_y)
+            inv_scale_x, inv_scale_y = self._inv_scale_xy
+            adjusted_pos = QPointF(scene_pos.x() * inv_scale_x, scene_pos.y() * inv_scale_y)
             
-            view_size = (self.graphics_view.width(), self.graphics_view.height())
-            
-            # 首先检查鼠标是否在角点上
-            bbox_idx, corner_idx = image_utils.get_bbox_corner_at_position(
-                adjusted_pos, labels, (img_width, img_height), view_size
+            # 首先检查鼠标是否在角点上（使用缓存的边界框数组）
+            bbox_idx, corner_idx = self._find_bbox_hit(
+                image_utils.find_bbox_corner_hit, adjusted_pos
             )
             
             if bbox_idx is not None and corner_idx is not None:
@@ -1548,8 +1974,8 @@ class ImageViewerWidget(QGroupBox):
                     self.graphics_view.setCursor(Qt.CursorShape.SizeBDiagCursor)
             else:
                 # 检查鼠标是否在边线上
-                bbox_idx, edge_idx = image_utils.get_bbox_edge_at_position(
-                    adjusted_pos, labels, (img_width, img_height), view_size
+                bbox_idx, edge_idx = self._find_bbox_hit(
+                    image_utils.find_bbox_edge_hit, adjusted_pos
                 )
                 
                 if bbox_idx is not None and edge_idx is not None:
@@ -1568,10 +1994,20 @@ class ImageViewerWidget(QGroupBox):
                     # 其他情况恢复默认光标
                     self.graphics_view.setCursor(Qt.CursorShape.ArrowCursor)
     
+    def _hide_drawing_overlay(self):
+        """隐藏绘制新标注框时的橡皮筋矩形"""
+        self._rubber_band_item.setVisible(False)
+    
     def _finish_drawing_bbox(self):
         """完成标注框绘制"""
+        # 移除橡皮筋矩形并恢复带标注框的图像和选中高亮
+        self._hide_drawing_overlay()
+        if self.current_pixmap_with_boxes:
+            self._set_scene_pixmap(self.current_pixmap_with_boxes)
+            self._update_selection_highlight()
+        
         # 计算标注框坐标
-        img_width, img_height = self.current_image.size
+        img_width, img_height = self._img_wh
         
         start_x = self.drawing_start_pos.x()
         start_y = self.drawing_start_pos.y()
@@ -1613,18 +2049,40 @@ class ImageViewerWidget(QGroupBox):
                 self.show_class_menu_requested.emit(new_bbox_index, cursor_pos)
         
         # 重置绘制状态
+        self._reset_drawing_state()
+        self.graphics_view.setCursor(Qt.CursorShape.ArrowCursor)
+    
+    def _reset_drag_state(self):
+        """重置边界框拖动状态"""
+        self.is_dragging = False
+        self.dragging_point_index = -1
+        self.dragging_bbox_index = -1
+        self.is_edge_dragging = False
+        self.dragging_edge_index = -1
+        self.original_cursor_pos = None
+    
+    def _reset_drawing_state(self):
+        """重置新标注框的绘制状态"""
         self.is_drawing_bbox = False
         self.drawing_start_pos = None
         self.drawing_current_pos = None
-        self.graphics_view.setCursor(Qt.CursorShape.ArrowCursor)
     
     def _finish_bbox_dragging(self):
         """完成标注框拖动"""
-        # 发射修改信号
+        # 立即完成尚未执行的重绘，确保显示最终位置
+        if self._drag_redraw_timer.isActive():
+            self._drag_redraw_timer.stop()
+            self._repaint_dirty_region()
+        
+        drag_start_label = self._drag_start_label
+        self._drag_start_label = None
+        self._drag_pixmap = None
+        
+        # 发射修改信号，坐标没有变化（只点击未拖动或拖回原处）时不触发后续更新
         if self.current_yolo_label and 0 <= self.dragging_bbox_index < len(self.current_yolo_label.get_labels()):
             labels = self.current_yolo_label.get_labels()
             label = labels[self.dragging_bbox_index]
-            if len(label) == 5:
+            if len(label) == 5 and drag_start_label is not None and label != drag_start_label:
                 class_id, center_x, center_y, width, height = label
                 self.bbox_modified.emit(self.dragging_bbox_index, center_x, center_y, width, height)
     
@@ -1638,8 +2096,22 @@ class ImageViewerWidget(QGroupBox):
     def set_selected_bbox(self, bbox_index):
         """设置选中的标注框"""
         self.selected_bbox_index = bbox_index
-        # 更新显示以高亮选中的标注框
-        self.update_display_image(adjust_view=False)
+        # 只更新高亮图元，合成图像不随选中项变化
+        self._update_selection_highlight()
+    
+    def _update_selection_highlight(self):
+        """根据当前选中的标注框更新高亮图元，绘制新标注框期间隐藏"""
+        labels = self.current_yolo_label.get_labels() if self.current_yolo_label else []
+        if (self.current_pixmap_with_boxes is None or self._rubber_band_item.isVisible()
+                or not 0 <= self.selected_bbox_index < len(labels)
+                or len(labels[self.selected_bbox_index]) != 5):
+            self._highlight_item.setVisible(False)
+            return
+        
+        self._highlight_item.set_label(
+            labels[self.selected_bbox_index], self.selected_bbox_index, self._img_wh, self._pixmap_wh
+        )
+        self._highlight_item.setVisible(True)
     
     def get_current_labels(self):
         """获取当前标签列表"""
@@ -1649,24 +2121,28 @@ class ImageViewerWidget(QGroupBox):
     
     def clear_image(self):
         """清空当前图像显示"""
+        self._img_wh = (0, 0)
+        self._pixmap_wh = (0, 0)
+        self._scale_xy = (1.0, 1.0)
+        self._inv_scale_xy = (1.0, 1.0)
         self.current_image = None
         self.current_pixmap = None
         self.current_pixmap_with_boxes = None
         self.current_yolo_label = None
         self.selected_bbox_index = -1
+        self._current_cache_key = None
+        self._bbox_hit_boxes = None
         
         # 重置拖动状态
-        self.is_dragging = False
-        self.dragging_point_index = -1
-        self.dragging_bbox_index = -1
-        self.is_edge_dragging = False
-        self.dragging_edge_index = -1
-        self.original_cursor_pos = None
+        self._reset_drag_state()
+        self._drag_redraw_timer.stop()
+        self._drag_start_label = None
+        self._drag_pixmap = None
+        self._dirty_rect = QRectF()
         
         # 重置绘制状态
-        self.is_drawing_bbox = False
-        self.drawing_start_pos = None
-        self.drawing_current_pos = None
+        self._reset_drawing_state()
+        self._hide_drawing_overlay()
         
         # 重置平移状态
         self.is_panning = False
@@ -1681,8 +2157,9 @@ class ImageViewerWidget(QGroupBox):
         if hasattr(self, 'result_timer'):
             self.result_timer.stop()
         
-        # 清空场景
-        self.graphics_scene.clear()
+        # 清空场景中的图像（保留图像项以便复用）
+        self._pixmap_item.setPixmap(QPixmap())
+        self._highlight_item.setVisible(False)
         
         # 恢复默认光标
         self.graphics_view.setCursor(Qt.CursorShape.ArrowCursor) 
\ No newline at end of file
@@ -2,11 +2,12 @@
 快捷键管理组件 - 统一管理应用程序的所有快捷键
 """
 from enum import Enum
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Set, Tuple
 
-from PySide6.QtCore import QObject, Signal, Qt
-from PySide6.QtGui import QKeySequence, QShortcut
-from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QObject, Signal, Qt, QEvent
+from PySide6.QtGui import QKeyEvent
+from PySide6.QtWidgets import QApplication, QWidget
 
 
 class ShortcutAction(Enum):
@@ -22,6 +23,38 @@ class ShortcutAction(Enum):
     REJECT_PREDICTIONS = "reject_predictions" # [键：拒绝预测
 
 
+# 快捷键配置 (键, 动作, 描述)
+_SHORTCUT_CONFIGS = (
+    (Qt.Key.Key_Q, ShortcutAction.ADD_BBOX, "添加标注框"),
+    (Qt.Key.Key_W, ShortcutAction.NAVIGATE_UP, "向上导航"),
+    (Qt.Key.Key_S, ShortcutAction.NAVIGATE_DOWN, "向下导航"),
+    (Qt.Key.Key_T, ShortcutAction.CLEAR_LABELS, "清空标签"),
+    (Qt.Key.Key_U, ShortcutAction.BATCH_DISCARD, "批量丢弃"),
+    (Qt.Key.Key_P, ShortcutAction.YOLO_PREDICT, "YOLO预测"),
+    (Qt.Key.Key_BracketRight, ShortcutAction.ACCEPT_PREDICTIONS, "接受预测"),
+    (Qt.Key.Key_BracketLeft, ShortcutAction.REJECT_PREDICTIONS, "拒绝预测"),
+)
+
+# 选择标注框的数字键 1-9
+_DIGIT_KEYS = (
+    Qt.Key.Key_1, Qt.Key.Key_2, Qt.Key.Key_3, Qt.Key.Key_4, Qt.Key.Key_5,
+    Qt.Key.Key_6, Qt.Key.Key_7, Qt.Key.Key_8, Qt.Key.Key_9,
+)
+
+# 快捷键说明，只读映射，所有调用方共用同一份
+_SHORTCUT_INFO = MappingProxyType({
+    "Q": "添加标注框",
+    "W": "向上导航",
+    "S": "向下导航",
+    "T": "清空标签",
+    "U": "批量丢弃",
+    "1-9": "选择标注框",
+    "P": "YOLO预测",
+    "]": "接受预测",
+    "[": "拒绝预测"
+})
+
+
 class KeyboardShortcutManager(QObject):
     """键盘快捷键管理器"""
     
@@ -36,53 +69,84 @@ class KeyboardShortcutManager(QObject):
         """
         super().__init__()
         self.parent_widget = parent_widget
-        self.shortcuts: Dict[str, QShortcut] = {}
+        self._dispatch: Dict[int, Tuple[str, Optional[int]]] = {}  # 按键 -> (动作, 额外数据)
+        self._keys: Dict[Tuple[str, Optional[int]], int] = {}  # (动作, 额外数据) -> 按键
+        self._disabled: Set[int] = set()  # 已禁用的按键
         self._setup_shortcuts()
+        
+        # 用一个应用级事件过滤器代替逐个创建的QShortcut，按键通过字典直接分发
+        QApplication.instance().installEventFilter(self)
     
     def _setup_shortcuts(self):
         """设置所有快捷键"""
-        # 定义快捷键配置 (键, 动作, 描述)
-        shortcut_configs = [
-            (Qt.Key.Key_Q, ShortcutAction.ADD_BBOX, "添加标注框"),
-            (Qt.Key.Key_W, ShortcutAction.NAVIGATE_UP, "向上导航"),
-            (Qt.Key.Key_S, ShortcutAction.NAVIGATE_DOWN, "向下导航"),
-            (Qt.Key.Key_T, ShortcutAction.CLEAR_LABELS, "清空标签"),
-            (Qt.Key.Key_U, ShortcutAction.BATCH_DISCARD, "批量丢弃"),
-            (Qt.Key.Key_P, ShortcutAction.YOLO_PREDICT, "YOLO预测"),
-            (Qt.Key.Key_BracketRight,ShortcutAction.ACCEPT_PREDICTIONS, "接受预测"),
-            (Qt.Key.Key_BracketLeft, ShortcutAction.REJECT_PREDICTIONS, "拒绝预测"),
-        ]
-        
-        # 创建基本快捷键
-        for key, action, description in shortcut_configs:
-            self._create_shortcut(key, action.value, description)
+        # 注册基本快捷键
+        for key, action, description in _SHORTCUT_CONFIGS:
+            self._register_shortcut(key, action.value)
         
-        # 创建数字键快捷键 (1-9)
-        for i in range(1, 10):
-            key = getattr(Qt.Key, f"Key_{i}")
-            self._create_shortcut(key, ShortcutAction.SELECT_BBOX.value, f"选择标注框{i}", i-1)
+        # 注册数字键快捷键 (1-9)
+        for index, key in enumerate(_DIGIT_KEYS):
+            self._register_shortcut(key, ShortcutAction.SELECT_BBOX.value, index)
     
-    def _create_shortcut(self, key: Qt.Key, action: str, description: str, data: Optional[int] = None):
-        """创建单个快捷键
+    def _register_shortcut(self, key: Qt.Key, action: str, data: Optional[int] = None):
+        """登记单个快捷键
         
         Args:
             key: 按键
             action: 动作名称
-            description: 描述
             data: 额外数据
         """
-        shortcut = QShortcut(QKeySequence(key), self.parent_widget)
-        shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        key_code = int(key.value)
+        self._dispatch[key_code] = (action, data)
+        self._keys[(action, data)] = key_code
+    
+    def _shortcuts_blocked(self) -> bool:
+        """检查快捷键当前是否应被屏蔽：弹出菜单或模态对话框打开、主窗口未激活时不响应"""
+        if QApplication.activePopupWidget() is not None:
+            return True
+        modal_widget = QApplication.activeModalWidget()
+        if modal_widget is not None and modal_widget is not self.parent_widget:
+            return True
+        return QApplication.activeWindow() is not self.parent_widget.window()
+    
+    def _focus_widget_wants_key(self, event) -> bool:
+        """检查焦点控件是否要自己处理该按键（如输入框、可编辑下拉框中输入字符）
+        
+        与QShortcut相同，先向焦点控件发送ShortcutOverride事件，控件接受时不作为快捷键。
+        按键事件最先送达的是顶层窗口而不是焦点控件，因此不能只看被过滤的对象。
+        """
+        focus_widget = QApplication.focusWidget()
+        if focus_widget is None:
+            return False
+        override = QKeyEvent(QEvent.Type.ShortcutOverride, event.key(), event.modifiers(), event.text())
+        override.ignore()
+        QApplication.sendEvent(focus_widget, override)
+        return override.isAccepted()
+    
+    def eventFilter(self, watched, event) -> bool:
+        """拦截按键事件并分发快捷键
+        
+        Returns:
+            按键被作为快捷键处理时返回True
+        """
+        if event.type() != QEvent.Type.KeyPress:
+            return False
+        
+        key = event.key()
+        hit = self._dispatch.get(key)
+        if hit is None:
+            return False
         
-        # 使用lambda捕获data参数
-        if data is not None:
-            shortcut.activated.connect(lambda a=action, d=data: self.shortcut_triggered.emit(a, d))
-        else:
-            shortcut.activated.connect(lambda a=action: self.shortcut_triggered.emit(a, None))
+        # 与原QShortcut一致：只响应不带修饰键的按键，不抢占文本输入
+        if event.modifiers() not in (Qt.KeyboardModifier.NoModifier, Qt.KeyboardModifier.KeypadModifier):
+            return False
+        if key in self._disabled or self._shortcuts_blocked():
+            return False
+        if self._focus_widget_wants_key(event):
+            return False
         
-        # 存储快捷键引用
-        shortcut_id = f"{action}_{data}" if data is not None else action
-        self.shortcuts[shortcut_id] = shortcut
+        action, data = hit
+        self.shortcut_triggered.emit(action, data)
+        return True
     
     def enable_shortcut(self, action: str, data: Optional[int] = None):
         """启用指定快捷键
@@ -91,9 +155,9 @@ class KeyboardShortcutManager(QObject):
             action: 动作名称
             data: 额外数据
         """
-        shortcut_id = f"{action}_{data}" if data is not None else action
-        if shortcut_id in self.shortcuts:
-            self.shortcuts[shortcut_id].setEnabled(True)
+        key_code = self._keys.get((action, data))
+        if key_code is not None:
+            self._disabled.discard(key_code)
     
     def disable_shortcut(self, action: str, data: Optional[int] = None):
         """禁用指定快捷键
@@ -102,34 +166,22 @@ class KeyboardShortcutManager(QObject):
             action: 动作名称
             data: 额外数据
         """
-        shortcut_id = f"{action}_{data}" if data is not None else action
-        if shortcut_id in self.shortcuts:
-            self.shortcuts[shortcut_id].setEnabled(False)
+        key_code = self._keys.get((action, data))
+        if key_code is not None:
+            self._disabled.add(key_code)
     
     def enable_all_shortcuts(self):
         """启用所有快捷键"""
-        for shortcut in self.shortcuts.values():
-            shortcut.setEnabled(True)
+        self._disabled.clear()
     
     def disable_all_shortcuts(self):
         """禁用所有快捷键"""
-        for shortcut in self.shortcuts.values():
-            shortcut.setEnabled(False)
+        self._disabled.update(self._dispatch)
     
-    def get_shortcut_info(self) -> Dict[str, str]:
+    def get_shortcut_info(self) -> Mapping[str, str]:
         """获取快捷键信息
         
         Returns:
-            快捷键信息字典
+            快捷键信息的只读映射，需要修改时请先复制
         """
-        return {
-            "Q": "添加标注框",
-            "W": "向上导航",
-            "S": "向下导航", 
-            "T": "清空标签",
-            "U": "批量丢弃",
-            "1-9": "选择标注框",
-            "P": "YOLO预测",
-            "]": "接受预测",
-            "[": "拒绝预测"
-        } 
\ No newline at end of file
+        return _SHORTCUT_INFO
@@ -3,7 +3,7 @@ YOLO模型设置对话框
 允许用户选择要使用的YOLO模型
 """
 import os
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QObject, QRunnable, QThreadPool, QTimer
 from PySide6.QtGui import QIcon, QPixmap
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
@@ -13,6 +13,138 @@ from PySide6.QtWidgets import (
 import config
 from utils.yolo_model_manager import YoloModelManager
 
+# 下拉框选择停留多久后才开始预热模型，避免用方向键或滚轮浏览时逐个加载
+_MODEL_WARMUP_DELAY_MS = 600
+
+# 对话框样式表，通过对象名称区分各控件，整个对话框只需解析一次
+_DIALOG_QSS = """
+    QLabel#titleLabel {
+        font-size: 16px;
+        font-weight: bold;
+        color: #2c3e50;
+        padding: 5px 0;
+    }
+    QFrame#separator {
+        color: #bdc3c7;
+    }
+    QGroupBox#modelGroup {
+        font-weight: bold;
+        border: 2px solid #bdc3c7;
+        border-radius: 8px;
+        margin-top: 10px;
+        padding-top: 10px;
+    }
+    QGroupBox#modelGroup::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+        color: #34495e;
+    }
+    QLabel#modelLabel {
+        font-weight: normal;
+    }
+    QComboBox#modelCombo {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        padding: 5px 10px;
+        background-color: white;
+    }
+    QComboBox#modelCombo:hover {
+        border-color: #3498db;
+    }
+    QComboBox#modelCombo::drop-down {
+        border: none;
+        width: 20px;
+    }
+    QComboBox#modelCombo::down-arrow {
+        image: none;
+        border: 2px solid #7f8c8d;
+        width: 6px;
+        height: 6px;
+        border-top: none;
+        border-left: none;
+        margin-right: 5px;
+    }
+    QLabel#modelInfoLabel {
+        color: #7f8c8d;
+        font-size: 12px;
+        padding: 5px;
+        background-color: #ecf0f1;
+        border-radius: 4px;
+    }
+    QPushButton#cancelButton {
+        background-color: #95a5a6;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        font-weight: bold;
+        padding: 5px 15px;
+    }
+    QPushButton#cancelButton:hover {
+        background-color: #7f8c8d;
+    }
+    QPushButton#cancelButton:pressed {
+        background-color: #6c7b7d;
+    }
+    QPushButton#okButton {
+        background-color: #3498db;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        font-weight: bold;
+        padding: 5px 15px;
+    }
+    QPushButton#okButton:hover {
+        background-color: #2980b9;
+    }
+    QPushButton#okButton:pressed {
+        background-color: #21618c;
+    }
+"""
+
+
+class _WarmupSignals(QObject):
+    """模型预热任务的信号对象"""
+    
+    finished = Signal(str, bool)  # 预热完成信号 (模型名称, 是否成功)
+
+
+class _ModelWarmupTask(QRunnable):
+    """后台加载并预热YOLO模型，避免切换模型后首次预测时卡顿"""
+    
+    def __init__(self, model_manager, model_name):
+        super().__init__()
+        self.model_manager = model_manager
+        self.model_name = model_name
+        self.signals = _WarmupSignals()
+    
+    def run(self):
+        """在工作线程中执行预热"""
+        success = self.model_manager.preload_model(self.model_name)
+        self.signals.finished.emit(self.model_name, success)
+
+
+class _ModelScanSignals(QObject):
+    """模型目录扫描任务的信号对象"""
+    
+    finished = Signal(int, str, list)  # 扫描完成信号 (扫描代数, 当前选择的模型, 可用模型列表)
+
+
+class _ModelScanTask(QRunnable):
+    """后台扫描模型目录并读取当前设置，避免打开对话框时等待磁盘"""
+    
+    def __init__(self, model_manager, generation):
+        super().__init__()
+        self.model_manager = model_manager
+        self.generation = generation
+        self.signals = _ModelScanSignals()
+    
+    def run(self):
+        """在工作线程中执行扫描"""
+        current_model = self.model_manager.get_selected_model()
+        available_models = self.model_manager.get_available_models()
+        self.signals.finished.emit(self.generation, current_model, available_models)
+
 
 class ModelSettingsDialog(QDialog):
     """YOLO模型设置对话框"""
@@ -25,17 +157,28 @@ class ModelSettingsDialog(QDialog):
         super().__init__(parent)
         
         self.model_manager = YoloModelManager()
-        self.current_model = self.model_manager.get_selected_model()
-        self.available_models = self.model_manager.get_available_models()
+        # 模型列表和当前设置由后台扫描填充，扫描完成前对话框显示加载提示
+        self.current_model = None
+        self.available_models = []
+        self._scan_generation = 0  # 扫描代数，用于丢弃过期的扫描结果
+        self._warming_models = set()  # 正在后台预热的模型
+        self._pending_apply_model = None  # 等待预热完成后再应用的模型
+        
+        # 选择停留一段时间后才预热，同一时间只预热一个模型
+        self._warmup_timer = QTimer(self)
+        self._warmup_timer.setSingleShot(True)
+        self._warmup_timer.setInterval(_MODEL_WARMUP_DELAY_MS)
+        self._warmup_timer.timeout.connect(self._on_warmup_timer_timeout)
         
         self._init_ui()
-        self._load_current_settings()
+        self._start_model_scan()
     
     def _init_ui(self):
         """初始化UI"""
         self.setWindowTitle("YOLO模型设置")
         self.setModal(True)
         self.setFixedSize(400, 250)
+        self.setStyleSheet(_DIALOG_QSS)
         
         # 主布局
         main_layout = QVBoxLayout(self)
@@ -44,40 +187,19 @@ class ModelSettingsDialog(QDialog):
         
         # 标题
         title_label = QLabel("选择YOLO预测模型")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #2c3e50;
-                padding: 5px 0;
-            }
-        """)
+        title_label.setObjectName("titleLabel")
         main_layout.addWidget(title_label)
         
         # 分隔线
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.HLine)
         separator.setFrameShadow(QFrame.Shadow.Sunken)
-        separator.setStyleSheet("QFrame { color: #bdc3c7; }")
+        separator.setObjectName("separator")
         main_layout.addWidget(separator)
         
         # 模型选择组
         model_group = QGroupBox("可用模型")
-        model_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #34495e;
-            }
-        """)
+        model_group.setObjectName("modelGroup")
         model_layout = QVBoxLayout(model_group)
         model_layout.setSpacing(10)
         
@@ -86,42 +208,12 @@ class ModelSettingsDialog(QDialog):
         
         model_label = QLabel("选择模型:")
         model_label.setMinimumWidth(80)
-        model_label.setStyleSheet("QLabel { font-weight: normal; }")
+        model_label.setObjectName("modelLabel")
         
         self.model_combo = QComboBox()
         self.model_combo.setMinimumHeight(30)
         self.model_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        self.model_combo.setStyleSheet("""
-            QComboBox {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                padding: 5px 10px;
-                background-color: white;
-            }
-            QComboBox:hover {
-                border-color: #3498db;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border: 2px solid #7f8c8d;
-                width: 6px;
-                height: 6px;
-                border-top: none;
-                border-left: none;
-                margin-right: 5px;
-            }
-        """)
-        
-        # 填充可用模型
-        if self.available_models:
-            self.model_combo.addItems(self.available_models)
-        else:
-            self.model_combo.addItem("未找到模型文件")
-            self.model_combo.setEnabled(False)
+        self.model_combo.setObjectName("modelCombo")
         
         model_selection_layout.addWidget(model_label)
         model_selection_layout.addWidget(self.model_combo)
@@ -130,15 +222,7 @@ class ModelSettingsDialog(QDialog):
         
         # 模型信息显示
         self.model_info_label = QLabel()
-        self.model_info_label.setStyleSheet("""
-            QLabel {
-                color: #7f8c8d;
-                font-size: 12px;
-                padding: 5px;
-                background-color: #ecf0f1;
-                border-radius: 4px;
-            }
-        """)
+        self.model_info_label.setObjectName("modelInfoLabel")
         self.model_info_label.setWordWrap(True)
         model_layout.addWidget(self.model_info_label)
         
@@ -154,50 +238,16 @@ class ModelSettingsDialog(QDialog):
         # 取消按钮
         self.cancel_button = QPushButton("取消")
         self.cancel_button.setMinimumHeight(35)
-        self.cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: #95a5a6;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-weight: bold;
-                padding: 5px 15px;
-            }
-            QPushButton:hover {
-                background-color: #7f8c8d;
-            }
-            QPushButton:pressed {
-                background-color: #6c7b7d;
-            }
-        """)
+        self.cancel_button.setObjectName("cancelButton")
         self.cancel_button.clicked.connect(self.reject)
         
         # 确定按钮
         self.ok_button = QPushButton("确定")
         self.ok_button.setMinimumHeight(35)
-        self.ok_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-weight: bold;
-                padding: 5px 15px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
+        self.ok_button.setObjectName("okButton")
         self.ok_button.clicked.connect(self._apply_settings)
         self.ok_button.setDefault(True)
         
-        # 如果没有可用模型，禁用确定按钮
-        if not self.available_models:
-            self.ok_button.setEnabled(False)
-        
         button_layout.addStretch()
         button_layout.addWidget(self.cancel_button)
         button_layout.addWidget(self.ok_button)
@@ -206,6 +256,59 @@ class ModelSettingsDialog(QDialog):
         
         # 连接信号
         self.model_combo.currentTextChanged.connect(self._update_model_info)
+        self.model_combo.currentTextChanged.connect(self._on_model_selection_changed)
+    
+    def _populate_models(self):
+        """填充模型下拉框，没有可用模型时禁用选择和确定按钮"""
+        self.model_combo.blockSignals(True)
+        self.model_combo.clear()
+        if self.available_models:
+            self.model_combo.addItems(self.available_models)
+        else:
+            self.model_combo.addItem("未找到模型文件")
+        self.model_combo.blockSignals(False)
+        
+        self.model_combo.setEnabled(bool(self.available_models))
+        self.ok_button.setEnabled(bool(self.available_models))
+        self.ok_button.setText("确定")
+    
+    def reload(self):
+        """重新扫描模型目录并刷新当前设置，复用对话框再次显示前调用"""
+        self._pending_apply_model = None
+        self._start_model_scan()
+    
+    def _start_model_scan(self):
+        """显示加载提示，并在后台扫描模型目录"""
+        self._scan_generation += 1
+        
+        self.model_combo.blockSignals(True)
+        self.model_combo.clear()
+        self.model_combo.addItem("正在加载模型...")
+        self.model_combo.blockSignals(False)
+        self.model_combo.setEnabled(False)
+        self.ok_button.setEnabled(False)
+        self.ok_button.setText("确定")
+        self.model_info_label.setText("正在扫描模型目录...")
+        
+        task = _ModelScanTask(self.model_manager, self._scan_generation)
+        task.signals.finished.connect(self._on_model_scan_finished)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_model_scan_finished(self, generation, current_model, available_models):
+        """接收扫描结果，填充模型列表并选中当前模型
+        
+        Args:
+            generation: 发起扫描时的扫描代数
+            current_model: 当前选择的模型
+            available_models: 可用模型列表
+        """
+        if generation != self._scan_generation:
+            return
+        
+        self.current_model = current_model
+        self.available_models = available_models
+        self._populate_models()
+        self._load_current_settings()
     
     def _load_current_settings(self):
         """加载当前设置"""
@@ -233,6 +336,53 @@ class ModelSettingsDialog(QDialog):
             else:
                 self.model_info_label.setText(f"模型文件不存在: {selected_model}")
     
+    def _on_model_selection_changed(self, model_name):
+        """选择变化时重新开始计时，停留足够时间后才预热"""
+        self._warmup_timer.start()
+    
+    def _on_warmup_timer_timeout(self):
+        """选择停留足够时间后预热当前选择的模型"""
+        if self.isVisible():
+            self._start_model_warmup(self.model_combo.currentText())
+    
+    def _start_model_warmup(self, model_name):
+        """在后台预热新选择的模型，用户确认时模型已加载完成
+        
+        已有模型正在预热时不再提交新任务，待其完成后再预热最新的选择。
+        
+        Args:
+            model_name: 选择的模型文件名
+        """
+        if (not self.available_models or model_name == self.current_model
+                or self._warming_models
+                or self.model_manager.is_model_preloaded(model_name)):
+            return
+        
+        self._warming_models.add(model_name)
+        task = _ModelWarmupTask(self.model_manager, model_name)
+        task.signals.finished.connect(self._on_model_warmup_finished)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_model_warmup_finished(self, model_name, success):
+        """模型预热完成，若用户已确认该模型则继续应用设置"""
+        self._warming_models.discard(model_name)
+        if model_name == self._pending_apply_model:
+            self._pending_apply_model = None
+            self._finish_apply(model_name)
+            return
+        
+        if not self.isVisible():
+            # 对话框已关闭且未选用该模型，丢弃预热结果
+            if model_name != self.current_model:
+                self.model_manager.discard_preloaded_model(model_name)
+            return
+        
+        # 预热期间用户又选择了其他模型时，继续预热最新的选择
+        current_selection = self.model_combo.currentText()
+        if current_selection != model_name:
+            self.model_manager.discard_preloaded_model(model_name)
+            self._start_model_warmup(current_selection)
+    
     def _apply_settings(self):
         """应用设置"""
         if not self.available_models:
@@ -247,15 +397,39 @@ class ModelSettingsDialog(QDialog):
             QMessageBox.critical(self, "错误", f"模型文件不存在: {model_path}")
             return
         
-        # 保存设置
-        if self.model_manager.set_selected_model(selected_model):
-            # 如果模型发生变化，发射信号
-            if selected_model != self.current_model:
-                self.model_changed.emit(selected_model)
-            
-            self.accept()
-        else:
+        self._warmup_timer.stop()
+        
+        # 模型仍在预热时等待完成后再应用，避免首次预测时卡住界面
+        if selected_model in self._warming_models:
+            self._pending_apply_model = selected_model
+            self.ok_button.setEnabled(False)
+            self.ok_button.setText("加载中...")
+            return
+        
+        self._finish_apply(selected_model)
+    
+    def _finish_apply(self, selected_model):
+        """完成设置应用：保存设置，模型发生变化时发射信号并关闭对话框"""
+        if not self.model_manager.set_selected_model(selected_model):
             QMessageBox.critical(self, "错误", "保存模型设置失败")
+            self._populate_models()
+            self._load_current_settings()
+            return
+        
+        if selected_model != self.current_model:
+            self.model_changed.emit(selected_model)
+            self.current_model = selected_model
+        
+        self.accept()
+    
+    def reject(self):
+        """取消时放弃等待中的模型切换，并丢弃为未选用的模型预热的结果"""
+        self._pending_apply_model = None
+        self._warmup_timer.stop()
+        selected_model = self.model_combo.currentText()
+        if selected_model != self.current_model:
+            self.model_manager.discard_preloaded_model(selected_model)
+        super().reject()
     
     def get_selected_model(self):
         """获取选择的模型"""
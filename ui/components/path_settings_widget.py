@@ -3,15 +3,188 @@
 负责源目录和目标目录的选择、历史记录管理等功能
 """
 import os
+import time
 
-from PySide6.QtCore import Signal, QSettings
+from PySide6.QtCore import Signal, QSettings, QTimer, QObject, QRunnable, QThreadPool
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QGroupBox, QCheckBox, QComboBox, QFileDialog, QMessageBox
 )
 
 import config
 
+# 路径检查结果的有效期（秒），编辑下拉框时每次按键都会检查路径，短时间内复用结果
+_PATH_PROBE_TTL = 2.0
+_PATH_PROBE_MAX_ENTRIES = 128
+
+# 编辑源目录时，停止输入超过该时间（毫秒）后才检测子目录
+_SOURCE_DIR_DEBOUNCE_MS = 250
+
+# 源目录下的 (图像子目录, 标签子目录) 候选名称，按优先级排列
+_SUBDIR_CANDIDATES = (
+    ("images", "labels"),
+    ("original_snaps", "original_snaps_labels"),
+)
+
+# 历史记录修改后延迟写入磁盘的时间（毫秒），期间的多次修改合并为一次写入
+_HISTORY_SYNC_DELAY_MS = 1000
+
+# 选择目录对话框选项：只显示目录，不查询自定义目录图标、不解析符号链接，
+# 减少网络共享目录下逐项的文件状态和图标查询
+_BROWSE_DIALOG_OPTIONS = (
+    QFileDialog.ShowDirsOnly
+    | QFileDialog.DontUseCustomDirectoryIcons
+    | QFileDialog.DontResolveSymlinks
+)
+
+# 浏览目录时的默认起始目录
+_HOME_DIR = os.path.expanduser("~")
+
+# 审核模式按钮样式（删除源文件，红色）
+_REVIEW_MODE_BUTTON_QSS = """
+    QPushButton {
+        background-color: #dc3545;
+        color: white;
+        font-weight: bold;
+        border: 2px solid #dc3545;
+        border-radius: 5px;
+        padding: 5px 10px;
+    }
+    QPushButton:hover {
+        background-color: #c82333;
+        border-color: #c82333;
+    }
+    QPushButton:pressed {
+        background-color: #a71e2a;
+        border-color: #a71e2a;
+    }
+"""
+
+# 标注模式按钮样式（保留源文件，绿色）
+_ANNOTATION_MODE_BUTTON_QSS = """
+    QPushButton {
+        background-color: #28a745;
+        color: white;
+        font-weight: bold;
+        border: 2px solid #28a745;
+        border-radius: 5px;
+        padding: 5px 10px;
+    }
+    QPushButton:hover {
+        background-color: #218838;
+        border-color: #218838;
+    }
+    QPushButton:pressed {
+        background-color: #1e7e34;
+        border-color: #1e7e34;
+    }
+"""
+
+# (检查函数名, 路径) -> (检查时间, 结果)
+_path_probe_cache = {}
+
+
+def _probe_path(probe, path):
+    """执行带短期缓存的路径检查
+    
+    Args:
+        probe: 路径检查函数，如 os.path.exists
+        path: 要检查的路径
+        
+    Returns:
+        bool: 检查结果
+    """
+    key = (probe.__name__, path)
+    now = time.monotonic()
+    cached = _path_probe_cache.get(key)
+    if cached is not None and now - cached[0] < _PATH_PROBE_TTL:
+        return cached[1]
+    
+    if len(_path_probe_cache) >= _PATH_PROBE_MAX_ENTRIES:
+        _path_probe_cache.clear()
+    result = probe(path)
+    _path_probe_cache[key] = (now, result)
+    return result
+
+
+def _path_exists(path):
+    """带短期缓存的 os.path.exists"""
+    return _probe_path(os.path.exists, path)
+
+
+def _path_is_dir(path):
+    """带短期缓存的 os.path.isdir，一次 stat 同时确认存在且为目录"""
+    return _probe_path(os.path.isdir, path)
+
+
+def _clear_path_probe_cache():
+    """清空路径检查缓存，用户通过对话框重新选择目录时调用"""
+    _path_probe_cache.clear()
+
+
+def _get_images_and_labels_dirs(source_dir):
+    """获取图像和标签子目录
+    
+    只遍历一次源目录，用目录项自带的类型信息判断子文件夹，不再逐个检查候选路径
+    """
+    try:
+        with os.scandir(source_dir) as entries:
+            subdir_names = {entry.name for entry in entries if entry.is_dir()}
+    except OSError:
+        return None, None
+    
+    # 源目录加上结尾分隔符只拼接一次，各子目录直接在其后追加名称
+    prefix = os.path.join(source_dir, "")
+    
+    # 模式1: "images"和"labels"子文件夹，成功时直接返回
+    (images_name, labels_name), (snaps_name, snaps_labels_name) = _SUBDIR_CANDIDATES
+    if images_name in subdir_names and labels_name in subdir_names:
+        return prefix + images_name, prefix + labels_name
+    
+    images_dir = prefix + images_name if images_name in subdir_names else None
+    labels_dir = prefix + labels_name if labels_name in subdir_names else None
+    
+    # 模式2: "original_snaps"和"original_snaps_labels"模式
+    if snaps_name in subdir_names:
+        images_dir = prefix + snaps_name
+    if snaps_labels_name in subdir_names:
+        labels_dir = prefix + snaps_labels_name
+    
+    return images_dir, labels_dir
+
+
+def _probe_source_dir(source_dir):
+    """检查源目录是否存在并查找其中的图像和标签子目录
+    
+    Returns:
+        (图像子目录, 标签子目录)，未找到的为空字符串
+    """
+    if not source_dir or not _path_exists(source_dir):
+        return "", ""
+    images_dir, labels_dir = _get_images_and_labels_dirs(source_dir)
+    return images_dir or "", labels_dir or ""
+
+
+class _DirProbeSignals(QObject):
+    """目录检测任务的信号对象"""
+    
+    probed = Signal(int, str, str)  # 检测完成信号 (检测代数, 图像子目录, 标签子目录)
+
+
+class _DirProbeTask(QRunnable):
+    """在后台检测源目录的子目录结构，避免网络磁盘上的检查阻塞界面"""
+    
+    def __init__(self, generation, source_dir, signals):
+        super().__init__()
+        self.generation = generation
+        self.source_dir = source_dir
+        self.signals = signals
+    
+    def run(self):
+        """在工作线程中执行检测"""
+        images_dir, labels_dir = _probe_source_dir(self.source_dir)
+        self.signals.probed.emit(self.generation, images_dir, labels_dir)
+
 
 class PathSettingsWidget(QWidget):
     """路径设置组件"""
@@ -38,6 +211,26 @@ class PathSettingsWidget(QWidget):
         # 初始化历史记录设置
         self.settings = QSettings("YoloAnnotationTool", "DirectoryHistory")
         self.max_history_count = 5
+        self._saved_histories = {}  # 键 -> 内存中的历史记录（与设置中一致），读取时复用，内容未变化时跳过写入
+        
+        # 历史记录延迟写入磁盘，程序退出前确保写入
+        self._history_sync_timer = QTimer(self)
+        self._history_sync_timer.setSingleShot(True)
+        self._history_sync_timer.setInterval(_HISTORY_SYNC_DELAY_MS)
+        self._history_sync_timer.timeout.connect(self.settings.sync)
+        QApplication.instance().aboutToQuit.connect(self._flush_directory_history)
+        
+        # 源目录输入防抖：连续按键只在停顿后检测一次子目录
+        self._source_dir_timer = QTimer(self)
+        self._source_dir_timer.setSingleShot(True)
+        self._source_dir_timer.setInterval(_SOURCE_DIR_DEBOUNCE_MS)
+        self._source_dir_timer.timeout.connect(self._start_dir_probe)
+        
+        # 后台子目录检测：检测代数用于丢弃过期结果，检测选项为None表示没有待处理的检测
+        self._probe_generation = 0
+        self._probe_options = None
+        self._probe_signals = _DirProbeSignals(self)
+        self._probe_signals.probed.connect(self._on_dir_probed)
         
         # 创建UI
         self._init_ui()
@@ -45,8 +238,16 @@ class PathSettingsWidget(QWidget):
         # 连接信号
         self._connect_signals()
         
-        # 设置默认路径
-        self._set_default_paths()
+        # 目录历史记录和默认路径在组件首次显示时再加载
+        self._history_loaded = False
+    
+    def showEvent(self, event):
+        """首次显示时加载目录历史记录并设置默认路径"""
+        super().showEvent(event)
+        if not self._history_loaded:
+            self._history_loaded = True
+            self._load_combo_histories()
+            self._set_default_paths()
     
     def _init_ui(self):
         """初始化UI"""
@@ -87,7 +288,7 @@ class PathSettingsWidget(QWidget):
         
         # 下拉框
         self.source_dir_combo = QComboBox()
-        self._setup_combo_box_with_history(self.source_dir_combo, "source_directories")
+        self._setup_combo_box(self.source_dir_combo)
         
         # 清除历史按钮
         clear_btn = self._create_clear_button("清除源目录历史记录")
@@ -114,7 +315,7 @@ class PathSettingsWidget(QWidget):
         
         # 下拉框
         self.target_dir_combo = QComboBox()
-        self._setup_combo_box_with_history(self.target_dir_combo, "target_directories")
+        self._setup_combo_box(self.target_dir_combo)
         
         # 清除历史按钮
         clear_btn = self._create_clear_button("清除目标目录历史记录")
@@ -205,15 +406,56 @@ class PathSettingsWidget(QWidget):
         self.review_mode_btn.clicked.connect(self._on_review_mode_toggled)
     
     def _on_source_dir_changed(self, text):
-        """处理源目录改变"""
+        """处理源目录改变：记录输入内容，停止输入后再检测子目录"""
         self.source_dir = text.strip()
+        self._source_dir_timer.start()
+    
+    def _start_dir_probe(self, show_warning=False, assign_partial=False):
+        """在后台检测当前源目录的子目录
+        
+        Args:
+            show_warning: 未找到完整目录结构时是否提示用户
+            assign_partial: 是否分别保存找到的子目录（否则只有两个都找到时才更新）
+        """
+        self._source_dir_timer.stop()
+        self._probe_generation += 1
+        self._probe_options = (show_warning, assign_partial)
+        task = _DirProbeTask(self._probe_generation, self.source_dir, self._probe_signals)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_dir_probed(self, generation, images_dir, labels_dir):
+        """接收后台检测结果，源目录在检测期间再次改变时丢弃"""
+        if generation != self._probe_generation or self._probe_options is None:
+            return
+        self._apply_probe_result(images_dir, labels_dir)
+    
+    def _flush_source_dir_change(self):
+        """立即完成尚未执行或尚未返回的子目录检测"""
+        if self._source_dir_timer.isActive():
+            self._source_dir_timer.stop()
+            self._probe_options = (False, False)
+        if self._probe_options is None:
+            return
         
-        # 自动检测子目录
-        if self.source_dir and os.path.exists(self.source_dir):
-            images_dir, labels_dir = self._get_images_and_labels_dirs(self.source_dir)
-            if images_dir and labels_dir:
+        # 使后台检测结果失效，改为在当前线程直接检测
+        self._probe_generation += 1
+        self._apply_probe_result(*_probe_source_dir(self.source_dir))
+    
+    def _apply_probe_result(self, images_dir, labels_dir):
+        """保存检测到的子目录并通知源目录已改变"""
+        show_warning, assign_partial = self._probe_options
+        self._probe_options = None
+        
+        if assign_partial:
+            if images_dir:
                 self.images_subdir = images_dir
+            if labels_dir:
                 self.labels_subdir = labels_dir
+        elif images_dir and labels_dir:
+            self.images_subdir = images_dir
+            self.labels_subdir = labels_dir
+        elif show_warning:
+            self._show_directory_structure_warning()
         
         self.source_dir_changed.emit(self.source_dir)
     
@@ -225,13 +467,13 @@ class PathSettingsWidget(QWidget):
     def _on_source_dir_activated(self, index):
         """处理源目录用户选择"""
         selected_dir = self.source_dir_combo.itemText(index)
-        if selected_dir and os.path.exists(selected_dir):
+        if selected_dir and _path_exists(selected_dir):
             self._add_to_history(self.source_dir_combo, selected_dir, "source_directories")
     
     def _on_target_dir_activated(self, index):
         """处理目标目录用户选择"""
         selected_dir = self.target_dir_combo.itemText(index)
-        if selected_dir and os.path.exists(selected_dir):
+        if selected_dir and _path_exists(selected_dir):
             self._add_to_history(self.target_dir_combo, selected_dir, "target_directories")
     
     def _on_group_by_id_toggled(self, checked):
@@ -259,61 +501,29 @@ class PathSettingsWidget(QWidget):
     
     def _browse_source_dir(self):
         """浏览源目录"""
-        current_dir = self.source_dir_combo.currentText() or os.path.expanduser("~")
+        current_dir = self.source_dir_combo.currentText() or _HOME_DIR
         directory = QFileDialog.getExistingDirectory(
-            self, "选择源文件目录", current_dir
+            self, "选择源文件目录", current_dir, _BROWSE_DIALOG_OPTIONS
         )
         if directory:
+            _clear_path_probe_cache()
             self.source_dir = directory
             self._add_to_history(self.source_dir_combo, directory, "source_directories")
             
-            # 自动检测子目录
-            images_dir, labels_dir = self._get_images_and_labels_dirs(directory)
-            if images_dir and labels_dir:
-                self.images_subdir = images_dir
-                self.labels_subdir = labels_dir
-            else:
-                self._show_directory_structure_warning()
+            # 自动检测子目录，未找到有效结构时提示
+            self._start_dir_probe(show_warning=True)
     
     def _browse_target_dir(self):
         """浏览目标目录"""
-        current_dir = self.target_dir_combo.currentText() or os.path.expanduser("~")
+        current_dir = self.target_dir_combo.currentText() or _HOME_DIR
         directory = QFileDialog.getExistingDirectory(
-            self, "选择目标目录", current_dir
+            self, "选择目标目录", current_dir, _BROWSE_DIALOG_OPTIONS
         )
         if directory:
+            _clear_path_probe_cache()
             self.target_dir = directory
             self._add_to_history(self.target_dir_combo, directory, "target_directories")
     
-    def _get_images_and_labels_dirs(self, source_dir):
-        """获取图像和标签子目录"""
-        images_dir = None
-        labels_dir = None
-        
-        # 模式1: 检查"images"和"labels"子文件夹
-        potential_images_dir = os.path.join(source_dir, "images")
-        potential_labels_dir = os.path.join(source_dir, "labels")
-        
-        if os.path.isdir(potential_images_dir):
-            images_dir = potential_images_dir
-        if os.path.isdir(potential_labels_dir):
-            labels_dir = potential_labels_dir
-        
-        # 如果模式1成功，直接返回
-        if images_dir and labels_dir:
-            return images_dir, labels_dir
-        
-        # 模式2: 检查"original_snaps"和"original_snaps_labels"模式
-        potential_images_dir = os.path.join(source_dir, "original_snaps")
-        potential_labels_dir = os.path.join(source_dir, "original_snaps_labels")
-        
-        if os.path.isdir(potential_images_dir):
-            images_dir = potential_images_dir
-        if os.path.isdir(potential_labels_dir):
-            labels_dir = potential_labels_dir
-        
-        return images_dir, labels_dir
-    
     def _show_directory_structure_warning(self):
         """显示目录结构警告"""
         QMessageBox.warning(
@@ -330,74 +540,43 @@ class PathSettingsWidget(QWidget):
         """更新审核模式按钮样式"""
         if self.is_review_mode:
             self.review_mode_btn.setText("审核模式 (删除源文件)")
-            self.review_mode_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #dc3545;
-                    color: white;
-                    font-weight: bold;
-                    border: 2px solid #dc3545;
-                    border-radius: 5px;
-                    padding: 5px 10px;
-                }
-                QPushButton:hover {
-                    background-color: #c82333;
-                    border-color: #c82333;
-                }
-                QPushButton:pressed {
-                    background-color: #a71e2a;
-                    border-color: #a71e2a;
-                }
-            """)
+            self.review_mode_btn.setStyleSheet(_REVIEW_MODE_BUTTON_QSS)
         else:
             self.review_mode_btn.setText("标注模式 (保留源文件)")
-            self.review_mode_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #28a745;
-                    color: white;
-                    font-weight: bold;
-                    border: 2px solid #28a745;
-                    border-radius: 5px;
-                    padding: 5px 10px;
-                }
-                QPushButton:hover {
-                    background-color: #218838;
-                    border-color: #218838;
-                }
-                QPushButton:pressed {
-                    background-color: #1e7e34;
-                    border-color: #1e7e34;
-                }
-            """)
+            self.review_mode_btn.setStyleSheet(_ANNOTATION_MODE_BUTTON_QSS)
     
     def _set_default_paths(self):
         """设置默认路径"""
+        # 填充下拉框时屏蔽信号，填充完成后按最终路径统一处理一次
+        self.source_dir_combo.blockSignals(True)
+        self.target_dir_combo.blockSignals(True)
+        
         # 设置默认源目录
         if config.DEFAULT_SOURCE_DIR and self.source_dir_combo.count() == 0:
-            self.source_dir = config.DEFAULT_SOURCE_DIR
-            self.source_dir_combo.addItem(self.source_dir)
-            self.source_dir_combo.setCurrentText(self.source_dir)
-            self._add_to_history(self.source_dir_combo, self.source_dir, "source_directories")
+            self._add_to_history(self.source_dir_combo, config.DEFAULT_SOURCE_DIR, "source_directories")
+            if self.source_dir_combo.count() == 0:
+                self.source_dir_combo.addItem(config.DEFAULT_SOURCE_DIR)
         elif self.source_dir_combo.count() > 0:
-            self.source_dir = self.source_dir_combo.itemText(0)
-            self.source_dir_combo.setCurrentText(self.source_dir)
+            self.source_dir_combo.setCurrentIndex(0)
         
         # 设置默认目标目录
         if config.DEFAULT_TARGET_DIR and self.target_dir_combo.count() == 0:
-            self.target_dir = config.DEFAULT_TARGET_DIR
-            self.target_dir_combo.addItem(self.target_dir)
-            self.target_dir_combo.setCurrentText(self.target_dir)
-            self._add_to_history(self.target_dir_combo, self.target_dir, "target_directories")
+            self._add_to_history(self.target_dir_combo, config.DEFAULT_TARGET_DIR, "target_directories")
+            if self.target_dir_combo.count() == 0:
+                self.target_dir_combo.addItem(config.DEFAULT_TARGET_DIR)
         elif self.target_dir_combo.count() > 0:
-            self.target_dir = self.target_dir_combo.itemText(0)
-            self.target_dir_combo.setCurrentText(self.target_dir)
+            self.target_dir_combo.setCurrentIndex(0)
+        
+        self.source_dir_combo.blockSignals(False)
+        self.target_dir_combo.blockSignals(False)
+        
+        self.source_dir = self.source_dir_combo.currentText()
+        if self.target_dir_combo.count() > 0:
+            self._on_target_dir_changed(self.target_dir_combo.currentText())
         
         # 自动检测子目录
         if self.source_dir:
-            images_dir, labels_dir = self._get_images_and_labels_dirs(self.source_dir)
-            if images_dir:
-                self.images_subdir = images_dir
-            if labels_dir:
-                self.labels_subdir = labels_dir
+            self._start_dir_probe(assign_partial=True)
     
     # 公共接口方法
     def get_source_dir(self):
@@ -426,53 +605,74 @@ class PathSettingsWidget(QWidget):
     
     def validate_paths(self):
         """验证路径有效性"""
-        if not self.source_dir or not os.path.exists(self.source_dir):
+        # 源目录刚被编辑时先完成子目录检测
+        self._flush_source_dir_change()
+        
+        if not self.source_dir or not _path_is_dir(self.source_dir):
             return False, "请选择有效的源文件目录"
         
-        if not self.images_subdir or not os.path.exists(self.images_subdir):
+        if not self.images_subdir or not _path_is_dir(self.images_subdir):
             return False, "在源目录中未找到images子文件夹"
         
-        if not self.labels_subdir or not os.path.exists(self.labels_subdir):
+        if not self.labels_subdir or not _path_is_dir(self.labels_subdir):
             return False, "在源目录中未找到labels子文件夹"
         
         return True, ""
     
     # 历史记录管理私有方法
     def _load_directory_history(self, key):
-        """加载目录历史记录"""
+        """加载目录历史记录，读取过的键直接返回内存中的副本"""
+        if key in self._saved_histories:
+            return list(self._saved_histories[key])
+        
         history = self.settings.value(key, [])
         if isinstance(history, str):
             history = [history] if history else []
         elif not isinstance(history, list):
             history = []
+        self._saved_histories[key] = list(history)
         return history
     
     def _save_directory_history(self, key, history):
-        """保存目录历史记录"""
+        """保存目录历史记录，合并短时间内的多次修改后再写入磁盘"""
         if len(history) > self.max_history_count:
             history = history[:self.max_history_count]
+        if self._saved_histories.get(key) == history:
+            return
+        
+        self._saved_histories[key] = list(history)
         self.settings.setValue(key, history)
-        self.settings.sync()
+        self._history_sync_timer.start()
+    
+    def _flush_directory_history(self):
+        """立即把尚未写入的历史记录写入磁盘"""
+        if self._history_sync_timer.isActive():
+            self._history_sync_timer.stop()
+            self.settings.sync()
     
     def _add_to_history(self, combo_box, directory, key):
         """添加目录到历史记录"""
-        if not directory or not os.path.exists(directory):
+        if not directory or not _path_exists(directory):
             return
         
-        current_items = [combo_box.itemText(i) for i in range(combo_box.count())]
-        
-        if directory in current_items:
-            current_items.remove(directory)
+        # 已经是最近一条记录时只需选中，历史记录不变
+        if combo_box.count() > 0 and combo_box.itemText(0) == directory:
+            combo_box.setCurrentIndex(0)
+            return
         
-        current_items.insert(0, directory)
+        # 直接在下拉框中移动条目，不清空重建；先插入并选中新条目，
+        # 之后删除的都不是当前项，只有当前文本真正变化时才会触发目录改变处理
+        existing_index = combo_box.findText(directory)
+        combo_box.insertItem(0, directory)
+        combo_box.setCurrentIndex(0)
         
-        if len(current_items) > self.max_history_count:
-            current_items = current_items[:self.max_history_count]
+        if existing_index >= 0:
+            combo_box.removeItem(existing_index + 1)
         
-        combo_box.clear()
-        combo_box.addItems(current_items)
-        combo_box.setCurrentText(directory)
+        while combo_box.count() > self.max_history_count:
+            combo_box.removeItem(combo_box.count() - 1)
         
+        current_items = [combo_box.itemText(i) for i in range(combo_box.count())]
         self._save_directory_history(key, current_items)
     
     def _clear_history(self, combo_box, key, history_type_name):
@@ -485,24 +685,34 @@ class PathSettingsWidget(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
+            # 清空后恢复当前路径，下拉框文本最终不变，期间屏蔽信号以免重复检测目录
             current_text = combo_box.currentText()
+            combo_box.blockSignals(True)
             combo_box.clear()
             self._save_directory_history(key, [])
             
             if current_text:
                 combo_box.addItem(current_text)
                 combo_box.setCurrentText(current_text)
+            combo_box.blockSignals(False)
             
             return True
         return False
     
-    def _setup_combo_box_with_history(self, combo_box, key):
-        """设置下拉框并加载历史记录"""
+    def _setup_combo_box(self, combo_box):
+        """设置目录下拉框，历史记录在首次显示时加载"""
         combo_box.setEditable(True)
         combo_box.setSizePolicy(combo_box.sizePolicy().horizontalPolicy(), 
                                combo_box.sizePolicy().verticalPolicy())
         combo_box.setMinimumWidth(300)
-        
-        history = self._load_directory_history(key)
-        if history:
-            combo_box.addItems(history) 
\ No newline at end of file
+    
+    def _load_combo_histories(self):
+        """把源目录和目标目录的历史记录填入下拉框，填充时不触发目录改变处理"""
+        for combo_box, key in ((self.source_dir_combo, "source_directories"),
+                               (self.target_dir_combo, "target_directories")):
+            history = self._load_directory_history(key)
+            if history:
+                combo_box.blockSignals(True)
+                combo_box.addItems(history)
+                combo_box.blockSignals(False)
+ 
\ No newline at end of file
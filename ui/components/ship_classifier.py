@@ -73,8 +73,9 @@ class ShipClassifierWidget(QGroupBox):
         for i, (type_id, type_name) in enumerate(self.ship_types.items()):
             button = QPushButton(f"{type_id}: {type_name}")
             
-            # 设置按钮的数据（船舶类型ID）
-            button.setProperty("ship_type_id", type_id)
+            # 设置按钮的数据（船舶类型ID和名称），点击时直接读取，无需再转换和查表
+            button.setProperty("ship_type_id", int(type_id))
+            button.setProperty("ship_type_name", type_name)
             
             # 计算按钮位置（行和列）
             row = i // buttons_per_row
@@ -86,10 +87,8 @@ class ShipClassifierWidget(QGroupBox):
             # 保存按钮引用
             self.ship_type_buttons[type_id] = button
             
-            # 连接点击事件
-            button.clicked.connect(
-                lambda checked, btn=button: self.on_ship_type_button_clicked(btn)
-            )
+            # 所有类型按钮共用一个槽函数，由按钮属性区分类型
+            button.clicked.connect(self._on_ship_type_button_triggered)
         
         # 将网格布局添加到父布局
         parent_layout.addLayout(grid_layout)
@@ -138,11 +137,17 @@ class ShipClassifierWidget(QGroupBox):
         # 船舶类型按钮的信号已在创建时连接
         pass
     
+    def _on_ship_type_button_triggered(self):
+        """船舶类型按钮的共用槽函数，根据发送信号的按钮分发"""
+        button = self.sender()
+        if button is not None:
+            self.on_ship_type_button_clicked(button)
+    
     def on_ship_type_button_clicked(self, button):
         """处理船舶类型按钮点击事件"""
-        # 获取按钮对应的船舶类型ID
-        class_id = int(button.property("ship_type_id"))
-        current_class_name = self.ship_types.get(str(class_id), '未知')
+        # 获取按钮对应的船舶类型ID和名称
+        class_id = button.property("ship_type_id")
+        current_class_name = button.property("ship_type_name")
         
         # 发射信号，由主窗口处理具体的标注逻辑
         self.ship_type_selected.emit(class_id, current_class_name)
@@ -2,9 +2,12 @@
 新版主窗口UI模块 (PySide6版本)
 使用组件化架构实现标注工具的界面和交互逻辑
 """
+import errno
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
-from PySide6.QtCore import QPoint
+from PySide6.QtCore import QPoint, QObject, QRunnable, QThreadPool, QTimer, Signal
 from PySide6.QtGui import QCursor
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStatusBar, QMessageBox
@@ -13,12 +16,386 @@ from PySide6.QtWidgets import (
 import config
 from models.yolo_label import YoloLabel
 from utils import file_utils
-from utils.yolo_model_manager import YoloModelManager
 from .components import (
     ImageListWidget, BBoxEditorWidget, ShipClassifierWidget, ImageViewerWidget, ModelSettingsDialog,
     PathSettingsWidget, AnnotationSpeedWidget, KeyboardShortcutManager, ShortcutAction
 )
 
+# 状态栏模型设置按钮样式
+_MODEL_SETTINGS_BUTTON_QSS = """
+    QPushButton {
+        background-color: #34495e;
+        color: white;
+        font-size: 12px;
+        font-weight: bold;
+        border: 1px solid #2c3e50;
+        border-radius: 4px;
+        padding: 2px 8px;
+    }
+    QPushButton:hover {
+        background-color: #2c3e50;
+        border-color: #34495e;
+    }
+    QPushButton:pressed {
+        background-color: #1e2832;
+    }
+"""
+
+# 文件删除和标签查找等操作主要等待磁盘，多线程并发执行可以重叠各个文件的等待时间
+_IO_POOL = ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 4))
+
+
+def _move_file(src, dst):
+    """移动单个文件，同一文件系统内直接改名，跨文件系统时退回复制后删除源文件"""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy2(src, dst)
+        os.unlink(src)
+
+
+def _make_category_dirs(target_dir, category_name):
+    """创建类别目录（如"背景"、"混合"）下的图像和标签子目录
+    
+    Returns:
+        (图像目录, 标签目录)
+    """
+    category_dir = os.path.join(target_dir, category_name)
+    dirs = (os.path.join(category_dir, "images"), os.path.join(category_dir, "labels"))
+    os.makedirs(dirs[0], exist_ok=True)
+    os.makedirs(dirs[1], exist_ok=True)
+    return dirs
+
+
+def _move_to_category_dirs(image_path, label_path, category_dirs, move_source):
+    """把图像和标签文件移动或复制到已创建好的类别目录
+    
+    Args:
+        category_dirs: (图像目录, 标签目录)
+        move_source: 是否直接移走源文件（审核模式），否则复制并保留源文件
+        
+    Returns:
+        (bool, str): (是否成功, 错误信息)
+    """
+    target_img_dir, target_label_dir = category_dirs
+    
+    try:
+        # 获取文件基本信息
+        image_basename = os.path.basename(image_path)
+        base_name = os.path.splitext(image_basename)[0]
+        
+        # 确定目标文件路径
+        target_img_path = os.path.join(target_img_dir, image_basename)
+        target_label_path = os.path.join(target_label_dir, f"{base_name}{config.LABEL_FILE_EXT}")
+        
+        if move_source:
+            # 同一文件系统内只需改名，无需复制文件内容，源文件随之移走
+            _move_file(image_path, target_img_path)
+            try:
+                _move_file(label_path, target_label_path)
+            except Exception:
+                # 标签移动失败时把图像移回原处，避免源文件只剩一半
+                _move_file(target_img_path, image_path)
+                raise
+            finally:
+                file_utils.get_corresponding_label_file.cache_clear()
+            return True, ""
+        
+        # 复制文件
+        shutil.copy2(image_path, target_img_path)
+        # 标签文件无需保留时间戳等元数据，只复制内容
+        shutil.copyfile(label_path, target_label_path)
+        
+        # 验证文件是否已成功复制
+        if not os.path.exists(target_img_path) or not os.path.exists(target_label_path):
+            return False, "复制文件到目标目录失败"
+        
+        return True, ""
+    except Exception as e:
+        return False, str(e)
+
+
+def _relabel_and_move(img_file, labels_subdir, target_dir, class_id):
+    """把单个图像的所有标签改为指定类别并移动到目标目录
+    
+    Returns:
+        错误信息，成功时为空字符串
+    """
+    # 获取对应的标签文件
+    label_file = file_utils.get_corresponding_label_file(img_file, labels_subdir)
+    if not label_file:
+        return f"找不到图像 {os.path.basename(img_file)} 的标签文件"
+    
+    # 加载标签并更新所有标签的类别
+    yolo_label = YoloLabel(img_file, label_file)
+    labels = yolo_label.get_labels()
+    
+    if not labels:
+        return f"图像 {os.path.basename(img_file)} 没有标签数据"
+    
+    yolo_label.set_all_classes(class_id)
+    
+    # 移动文件到目标目录
+    success, error_msg = yolo_label.move_to_target(target_dir, class_id)
+    if not success:
+        return f"移动文件 {os.path.basename(img_file)} 失败: {error_msg}"
+    return ""
+
+
+def _delete_image_and_label(img_file, labels_subdir, label_file=None):
+    """删除图像及其对应的标签文件
+    
+    Args:
+        label_file: 已经查找过的标签文件路径，为 None 时重新查找
+        
+    Returns:
+        (图像是否被删除, 错误信息)
+    """
+    # 直接删除，文件不存在时忽略，省去每个文件删除前的存在性检查
+    deleted = False
+    try:
+        try:
+            os.unlink(img_file)
+            deleted = True
+        except FileNotFoundError:
+            pass
+        
+        if label_file is None:
+            label_file = file_utils.get_corresponding_label_file(img_file, labels_subdir)
+        if label_file:
+            try:
+                os.unlink(label_file)
+            except FileNotFoundError:
+                pass
+    except Exception as e:
+        return deleted, f"删除文件 {os.path.basename(img_file)} 失败: {e}"
+    return deleted, ""
+
+
+def _delete_images_and_labels(img_files, labels_subdir, label_files=None):
+    """并发删除多个图像及其标签文件
+    
+    Args:
+        label_files: 与 img_files 一一对应的已查找标签文件路径，不提供时逐个查找
+        
+    Returns:
+        按 img_files 顺序排列的 (图像是否被删除, 错误信息) 列表
+    """
+    if label_files is None:
+        label_files = [None] * len(img_files)
+    results = list(_IO_POOL.map(_delete_image_and_label, img_files, [labels_subdir] * len(img_files),
+                                label_files))
+    file_utils.get_corresponding_label_file.cache_clear()
+    return results
+
+
+def _find_label_files(img_files, labels_subdir):
+    """并发查找多个图像对应的标签文件
+    
+    Returns:
+        按 img_files 顺序排列的标签文件路径列表，找不到的为 None
+    """
+    return list(_IO_POOL.map(file_utils.get_corresponding_label_file, img_files,
+                             [labels_subdir] * len(img_files)))
+
+
+def _label_group_files(img_files, delete_files, labels_subdir, target_dir, class_id, progress):
+    """标注并移动一组图像，之后删除指定的源文件
+    
+    Args:
+        img_files: 需要标注并移动的图像
+        delete_files: 处理完成后需要删除的源图像（审核模式）
+        progress: 进度回调 (已处理数量, 总数量)
+        
+    Returns:
+        (成功移动的数量, 错误信息列表)
+    """
+    success_count = 0
+    error_msgs = []
+    count = len(img_files)
+    total = count + len(delete_files)
+    
+    # 各图像的标注和移动互不依赖，在线程池中并发执行，结果按原顺序返回
+    results = _IO_POOL.map(_relabel_and_move, img_files, [labels_subdir] * count,
+                           [target_dir] * count, [class_id] * count)
+    for done, error_msg in enumerate(results, 1):
+        if error_msg:
+            error_msgs.append(error_msg)
+        else:
+            success_count += 1
+        progress(done, total)
+    
+    delete_results = _delete_images_and_labels(delete_files, labels_subdir)
+    for done, (_, error_msg) in enumerate(delete_results, len(img_files) + 1):
+        if error_msg:
+            error_msgs.append(error_msg)
+        progress(done, total)
+    
+    return success_count, error_msgs
+
+
+def _classify_and_move(img_file, label_file, category, category_dirs, target_dir, move_source):
+    """按预先确定的去向移动单个图像，在线程池中执行
+    
+    Args:
+        label_file: 对应的标签文件路径，找不到时为 None
+        category: "背景"、"混合"或单一类别ID
+        category_dirs: {"背景"/"混合": (图像目录, 标签目录)}，目录创建失败时值为 None
+        move_source: 是否直接移走源文件（审核模式）
+        
+    Returns:
+        错误信息，成功时为空字符串
+    """
+    img_name = os.path.basename(img_file)
+    if not label_file:
+        return f"找不到图像 {img_name} 的标签文件"
+    
+    if isinstance(category, str):
+        dirs = category_dirs.get(category)
+        if dirs is None:
+            return f"移动图像 {img_name} 到{category}类别失败: 无法创建类别目录"
+        move_success, error_msg = _move_to_category_dirs(img_file, label_file, dirs, move_source)
+        if not move_success:
+            return f"移动图像 {img_name} 到{category}类别失败: {error_msg}"
+        return ""
+    
+    # 单一类别，移动到对应分类；移动时不需要标签内容，不加载标签
+    yolo_label = YoloLabel(img_file, label_file, load=False)
+    move_success, error_msg = yolo_label.move_to_target(target_dir, category)
+    if not move_success:
+        return f"移动图像 {img_name} 失败: {error_msg}"
+    return ""
+
+
+def _auto_classify_files(img_files, labels_subdir, target_dir, delete_sources, progress):
+    """按标签类别批量自动分类图像：单一类别移动到对应类别，多个类别移动到"混合"，
+    没有标签数据移动到"背景"
+    
+    Args:
+        delete_sources: 是否删除源文件（审核模式），此时移动到"背景"/"混合"的文件直接改名移走
+        progress: 进度回调 (已处理数量, 总数量)
+        
+    Returns:
+        (成功数量, 混合数量, 背景数量, 错误信息列表)
+    """
+    # 先并发查找标签文件并只读取类别ID，找到两个不同类别即可判定为混合
+    label_files = _find_label_files(img_files, labels_subdir)
+    class_id_sets = iter(_IO_POOL.map(file_utils.peek_label_classes,
+                                      [label_file for label_file in label_files if label_file]))
+    categories = []
+    for label_file in label_files:
+        if not label_file:
+            # 找不到标签文件，不移动
+            categories.append(None)
+            continue
+        
+        class_ids = next(class_id_sets)
+        if not class_ids:
+            categories.append("背景")
+        elif len(class_ids) > 1:
+            categories.append("混合")
+        else:
+            categories.append(next(iter(class_ids)))
+    
+    # 用到的"背景"/"混合"目录在并发移动前一次创建好，工作线程之间不共享可变状态
+    category_dirs = {}
+    for category_name in ("背景", "混合"):
+        if category_name in categories:
+            try:
+                category_dirs[category_name] = _make_category_dirs(target_dir, category_name)
+            except OSError:
+                category_dirs[category_name] = None
+    
+    success_count = 0
+    mixed_count = 0
+    background_count = 0
+    error_msgs = []
+    moved_paths = set()
+    count = len(img_files)
+    total = count * 2 if delete_sources else count
+    
+    results = _IO_POOL.map(_classify_and_move, img_files, label_files, categories,
+                           [category_dirs] * count, [target_dir] * count, [delete_sources] * count)
+    for done, (img_file, category, error_msg) in enumerate(zip(img_files, categories, results), 1):
+        if error_msg:
+            error_msgs.append(error_msg)
+        else:
+            success_count += 1
+            if category == "背景":
+                background_count += 1
+                moved_paths.add(img_file)
+            elif category == "混合":
+                mixed_count += 1
+                moved_paths.add(img_file)
+        progress(done, total)
+    
+    if delete_sources:
+        # 已直接移走的文件无需再删除，其余复用前面查找到的标签文件
+        delete_items = [(p, l) for p, l in zip(img_files, label_files) if p not in moved_paths]
+        delete_paths = [p for p, _ in delete_items]
+        delete_labels = [l for _, l in delete_items]
+        for _, error_msg in _delete_images_and_labels(delete_paths, labels_subdir, delete_labels):
+            if error_msg:
+                error_msgs.append(error_msg)
+        progress(total, total)
+    
+    return success_count, mixed_count, background_count, error_msgs
+
+
+def _delete_group_files(img_files, labels_subdir, progress):
+    """删除一组图像及其标签文件
+    
+    Returns:
+        (删除的图像数量, 错误信息列表)
+    """
+    deleted_count = 0
+    error_msgs = []
+    
+    delete_results = _delete_images_and_labels(img_files, labels_subdir)
+    for done, (deleted, error_msg) in enumerate(delete_results, 1):
+        if deleted:
+            deleted_count += 1
+        if error_msg:
+            error_msgs.append(error_msg)
+        progress(done, len(img_files))
+    
+    return deleted_count, error_msgs
+
+
+class _FileOperationSignals(QObject):
+    """后台文件操作任务的信号对象"""
+    
+    progress = Signal(object, int, int)  # 进度信号 (任务上下文, 已处理数量, 总数量)
+    finished = Signal(object, object)  # 完成信号 (任务上下文, 操作结果)
+
+
+class _FileOperationTask(QRunnable):
+    """在后台执行批量文件操作，避免大量文件的复制和删除阻塞界面"""
+    
+    def __init__(self, context, operation, *args):
+        """
+        Args:
+            context: 任务上下文字典，随信号原样返回，供主线程汇总结果
+            operation: 文件操作函数，最后一个参数为进度回调
+            *args: 传给文件操作函数的参数
+        """
+        super().__init__()
+        self.context = context
+        self.operation = operation
+        self.args = args
+        self.signals = _FileOperationSignals()
+    
+    def run(self):
+        """在工作线程中执行文件操作"""
+        result = self.operation(*self.args, self._report_progress)
+        self.signals.finished.emit(self.context, result)
+    
+    def _report_progress(self, done, total):
+        """转发进度到主线程"""
+        self.signals.progress.emit(self.context, done, total)
+
 
 class MainWindow(QMainWindow):
     """主窗口类，使用组件化架构实现标注工具的界面和交互逻辑"""
@@ -58,8 +435,14 @@ class MainWindow(QMainWindow):
         
         # 船舶类型
         self.ship_types = config.get_ship_types()
+        
+        # 模型设置对话框，首次打开时创建后复用
+        self._model_settings_dialog = None
+        
+        # 最近一次导航方向（1=向下，-1=向上），用于决定预取哪一侧的图像
+        self._navigation_step = 1
+    
     
-
     def _on_source_dir_changed(self, source_dir):
         """处理源目录改变"""
         self.source_dir = source_dir
@@ -128,30 +511,10 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         
-        # 创建模型管理器
-        self.model_manager = YoloModelManager()
-        
         # 创建模型设置按钮
         self.model_settings_button = QPushButton("⚙️ 模型设置")
         self.model_settings_button.setFixedHeight(28)
-        self.model_settings_button.setStyleSheet("""
-            QPushButton {
-                background-color: #34495e;
-                color: white;
-                font-size: 12px;
-                font-weight: bold;
-                border: 1px solid #2c3e50;
-                border-radius: 4px;
-                padding: 2px 8px;
-            }
-            QPushButton:hover {
-                background-color: #2c3e50;
-                border-color: #34495e;
-            }
-            QPushButton:pressed {
-                background-color: #1e2832;
-            }
-        """)
+        self.model_settings_button.setStyleSheet(_MODEL_SETTINGS_BUTTON_QSS)
         self.model_settings_button.clicked.connect(self.show_model_settings)
         self.status_bar.addPermanentWidget(self.model_settings_button)
         
@@ -159,8 +522,15 @@ class MainWindow(QMainWindow):
         self.status_bar.addPermanentWidget(self.annotation_speed_widget.get_display_widget())
         
         self.status_bar.showMessage("就绪")
+        
+        # 标注框变化后延迟到本轮事件处理完再刷新显示，连续多次修改只刷新一次
+        self._label_view_refresh_timer = QTimer(self)
+        self._label_view_refresh_timer.setSingleShot(True)
+        self._label_view_refresh_timer.setInterval(0)
+        self._label_view_refresh_timer.timeout.connect(self._refresh_label_view)
+        self._bbox_list_refresh_pending = False
+    
     
-
     
     def _connect_signals(self):
         """连接信号和槽"""
@@ -194,18 +564,8 @@ class MainWindow(QMainWindow):
         self.image_viewer_widget.bbox_modified.connect(self.on_bbox_modified)
         self.image_viewer_widget.show_class_menu_requested.connect(self.on_show_class_menu_requested)
         
-        # 连接快捷键信号
-        self.shortcut_manager.shortcut_triggered.connect(self._handle_shortcut_triggered)
-    
-    def _handle_shortcut_triggered(self, action: str, data: object):
-        """处理快捷键触发事件
-        
-        Args:
-            action: 动作名称
-            data: 额外数据
-        """
-        # 快捷键动作分发
-        action_handlers = {
+        # 快捷键动作分发表，只构建一次，每次按键直接查表
+        self._action_handlers = {
             ShortcutAction.ADD_BBOX.value: self.on_add_bbox_requested,
             ShortcutAction.NAVIGATE_UP.value: self._handle_navigate_up,
             ShortcutAction.NAVIGATE_DOWN.value: self._handle_navigate_down,
@@ -217,14 +577,25 @@ class MainWindow(QMainWindow):
             ShortcutAction.REJECT_PREDICTIONS.value: self._handle_reject_predictions,
         }
         
-        handler = action_handlers.get(action)
+        # 连接快捷键信号
+        self.shortcut_manager.shortcut_triggered.connect(self._handle_shortcut_triggered)
+    
+    def _handle_shortcut_triggered(self, action: str, data: object):
+        """处理快捷键触发事件
+        
+        Args:
+            action: 动作名称
+            data: 额外数据
+        """
+        # 快捷键动作分发
+        handler = self._action_handlers.get(action)
         if handler:
             if data is not None:
                 handler(data)
             else:
                 handler()
     
-
+    
     
     def load_images(self):
         """加载图像"""
@@ -242,6 +613,9 @@ class MainWindow(QMainWindow):
         self.is_review_mode = self.path_settings_widget.is_review_mode_enabled()
         self.group_by_id = self.path_settings_widget.is_group_by_id_enabled()
         
+        # 目录内容可能已在外部改变，丢弃之前缓存的标签文件查找结果
+        file_utils.get_corresponding_label_file.cache_clear()
+        
         # 使用图像列表组件加载图像，传递标签目录参数
         self.image_list_widget.load_images(self.images_subdir, self.labels_subdir)
         self.image_files = self.image_list_widget.image_files
@@ -275,13 +649,9 @@ class MainWindow(QMainWindow):
     
     def on_show_label_count_toggle(self, checked):
         """处理显示标签数勾选框状态变化事件"""
-        # 更新图像列表组件的显示标签数设置
+        # 更新图像列表组件的显示标签数设置（已加载图像时组件会自行刷新一次显示）
         self.image_list_widget.set_show_label_count(checked)
         
-        # 如果当前已经加载了图像，重新更新显示
-        if self.image_files:
-            self.image_list_widget._update_tree_view()
-        
         count_text = "显示标签数" if checked else "隐藏标签数"
         self.status_bar.showMessage(f"已切换到{count_text}模式")
     
@@ -307,6 +677,9 @@ class MainWindow(QMainWindow):
         # 保存之前图像的标签修改（如果有）
         self._save_current_labels()
         
+        # 新图像加载时会完整刷新显示，之前安排的刷新不再需要
+        self._cancel_label_view_refresh()
+        
         self.current_image_idx = image_idx
         
         # 获取对应的标签文件
@@ -319,6 +692,13 @@ class MainWindow(QMainWindow):
             labels = self.image_viewer_widget.get_current_labels()
             self.bbox_editor_widget.update_bbox_list(labels)
             
+            # 标注通常按顺序进行，沿最近的导航方向后台预取接下来的几张图像
+            step = self._navigation_step
+            prefetch_indices = range(image_idx + step, image_idx + step * (config.IMAGE_PREFETCH_COUNT + 1), step)
+            self.image_viewer_widget.prefetch_images(
+                [self.image_files[i] for i in prefetch_indices if 0 <= i < len(self.image_files)]
+            )
+            
             self.status_bar.showMessage(f"当前查看: {os.path.basename(image_path)}")
         else:
             self.status_bar.showMessage(f"无法加载图像: {os.path.basename(image_path)}")
@@ -343,8 +723,8 @@ class MainWindow(QMainWindow):
     
     def on_bbox_selected(self, bbox_index):
         """处理标注框选择事件"""
+        # 信号来自列表点击，编辑器自身已记录选中项并高亮，只需同步查看器
         self.image_viewer_widget.set_selected_bbox(bbox_index)
-        self.bbox_editor_widget.set_selected_bbox(bbox_index)
     
     def on_viewer_bbox_selected(self, bbox_index):
         """处理查看器中的标注框选择事件"""
@@ -360,9 +740,7 @@ class MainWindow(QMainWindow):
             self._save_current_labels()
             
             # 更新显示
-            self.image_viewer_widget.update_display_image(adjust_view=False)
-            labels = self.image_viewer_widget.get_current_labels()
-            self.bbox_editor_widget.update_bbox_list(labels)
+            self._schedule_label_view_refresh()
     
     def on_bbox_deleted(self, bbox_index):
         """处理标注框删除事件"""
@@ -374,9 +752,7 @@ class MainWindow(QMainWindow):
             self._save_current_labels()
             
             # 更新显示
-            self.image_viewer_widget.update_display_image(adjust_view=False)
-            labels = self.image_viewer_widget.get_current_labels()
-            self.bbox_editor_widget.update_bbox_list(labels)
+            self._schedule_label_view_refresh()
     
     def on_add_bbox_requested(self):
         """处理添加标注框请求"""
@@ -398,9 +774,7 @@ class MainWindow(QMainWindow):
             self._save_current_labels()
             
             # 更新显示
-            self.image_viewer_widget.update_display_image(adjust_view=False)
-            labels = self.image_viewer_widget.get_current_labels()
-            self.bbox_editor_widget.update_bbox_list(labels)
+            self._schedule_label_view_refresh()
     
     def on_bbox_modified(self, bbox_index, center_x, center_y, width, height):
         """处理标注框修改事件"""
@@ -414,10 +788,38 @@ class MainWindow(QMainWindow):
             self._save_current_labels()
             
             # 更新显示
-            self.image_viewer_widget.update_display_image(adjust_view=False)
+            self._schedule_label_view_refresh(update_bbox_list=False)
+    
+    def _schedule_label_view_refresh(self, update_bbox_list=True):
+        """安排刷新标注框显示，同一轮事件中的多次修改合并为一次刷新
+        
+        Args:
+            update_bbox_list: 是否同时刷新标注框列表
+        """
+        if update_bbox_list:
+            self._bbox_list_refresh_pending = True
+        self._label_view_refresh_timer.start()
+    
+    def _cancel_label_view_refresh(self):
+        """取消尚未执行的标注框显示刷新"""
+        self._label_view_refresh_timer.stop()
+        self._bbox_list_refresh_pending = False
+    
+    def _refresh_label_view(self):
+        """刷新图像上的标注框，需要时同时刷新标注框列表"""
+        self._label_view_refresh_timer.stop()
+        self.image_viewer_widget.update_display_image(adjust_view=False)
+        if self._bbox_list_refresh_pending:
+            self._bbox_list_refresh_pending = False
+            labels = self.image_viewer_widget.get_current_labels()
+            self.bbox_editor_widget.update_bbox_list(labels)
     
     def on_show_class_menu_requested(self, bbox_index, position):
         """处理显示类别菜单请求"""
+        # 菜单依赖最新的标注框列表，先完成尚未执行的刷新
+        if self._label_view_refresh_timer.isActive():
+            self._refresh_label_view()
+        
         global_pos = self.image_viewer_widget.graphics_view.viewport().mapToGlobal(position)
         self.bbox_editor_widget.show_class_menu_for_bbox(bbox_index, global_pos)
     
@@ -457,8 +859,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "警告", f"图像 {current_img_name} 没有标签数据")
                 return
             
-            for i in range(len(labels)):
-                self.image_viewer_widget.current_yolo_label.update_label_class(i, class_id)
+            self.image_viewer_widget.current_yolo_label.set_all_classes(class_id)
             
             # 移动文件到目标目录
             success, error_msg = self.image_viewer_widget.current_yolo_label.move_to_target(self.target_dir, class_id)
@@ -478,6 +879,8 @@ class MainWindow(QMainWindow):
                             os.remove(label_file)
                     except Exception as e:
                         QMessageBox.warning(self, "警告", f"删除源文件时发生错误: {e}")
+                    finally:
+                        file_utils.get_corresponding_label_file.cache_clear()
                 
                 # 清空当前显示（在移除之前）
                 self.clear_current_display()
@@ -499,12 +902,13 @@ class MainWindow(QMainWindow):
         
         # 处理整个组的图像
         if current_group_id in self.image_list_widget.image_groups_by_id:
-            img_files = self.image_list_widget.image_groups_by_id[current_group_id]
+            img_files = list(self.image_list_widget.image_groups_by_id[current_group_id])
             success_count = 0
             error_msgs = []
+            pending_files = []
             
             for img_file in img_files:
-                # 如果是当前图像，使用已加载的当前标签对象（可能包含修改）
+                # 如果是当前图像，使用已加载的当前标签对象（可能包含修改），在主线程直接处理
                 if (self.image_viewer_widget.current_image and 
                     self.image_viewer_widget.current_yolo_label and 
                     img_file == self.image_viewer_widget.current_yolo_label.image_path):
@@ -516,8 +920,7 @@ class MainWindow(QMainWindow):
                         yolo_label.save_labels()
                     
                     # 更新所有标签的类别
-                    for i in range(len(yolo_label.get_labels())):
-                        yolo_label.update_label_class(i, class_id)
+                    yolo_label.set_all_classes(class_id)
                     
                     # 移动文件到目标目录
                     success, error_msg = yolo_label.move_to_target(self.target_dir, class_id)
@@ -526,69 +929,76 @@ class MainWindow(QMainWindow):
                     else:
                         error_msgs.append(f"移动文件 {os.path.basename(img_file)} 失败: {error_msg}")
                 else:
-                    # 对于其他图像，按原有方式处理
-                    # 获取对应的标签文件
-                    label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-                    if not label_file:
-                        error_msgs.append(f"找不到图像 {os.path.basename(img_file)} 的标签文件")
-                        continue
-                    
-                    # 加载标签并更新所有标签的类别
-                    yolo_label = YoloLabel(img_file, label_file)
-                    labels = yolo_label.get_labels()
-                    
-                    if not labels:
-                        error_msgs.append(f"图像 {os.path.basename(img_file)} 没有标签数据")
-                        continue
-                    
-                    # 更新所有标签的类别
-                    for i in range(len(labels)):
-                        yolo_label.update_label_class(i, class_id)
-                    
-                    # 移动文件到目标目录
-                    success, error_msg = yolo_label.move_to_target(self.target_dir, class_id)
-                    if success:
-                        success_count += 1
-                    else:
-                        error_msgs.append(f"移动文件 {os.path.basename(img_file)} 失败: {error_msg}")
-            
-            # 记录标注操作（整个组）
-            if success_count > 0:
-                self.annotation_speed_widget.record_annotation(success_count)
-            
-            # 根据模式决定是否删除原始文件
-            if self.is_review_mode:
-                for img_file in img_files:
-                    try:
-                        # 删除图像和标签文件
-                        if os.path.exists(img_file):
-                            os.remove(img_file)
-                        
-                        label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-                        if label_file and os.path.exists(label_file):
-                            os.remove(label_file)
-                    except Exception as e:
-                        error_msgs.append(f"删除文件 {os.path.basename(img_file)} 失败: {e}")
-            
-            # 显示处理结果
-            if error_msgs:
-                error_text = "\n".join(error_msgs)
-                QMessageBox.warning(self, "部分文件处理失败", 
-                                  f"成功处理 {success_count} 个文件，失败的文件:\n{error_text}")
-            else:
-                action_text = "移动并删除源文件" if self.is_review_mode else "移动"
-                self.status_bar.showMessage(f"成功将组 {current_group_id} 的 {success_count} 个文件标注为 {class_name} 并{action_text}")
+                    # 其他图像交给后台任务处理
+                    pending_files.append(img_file)
             
             # 清空当前显示（在移除之前）
             self.clear_current_display()
             
-            # 从图像列表中移除整个组（会自动选择下一个组）
+            # 从图像列表中移除整个组（会自动选择下一个组），其余文件在后台处理
             self.image_list_widget.remove_current_group()
+            
+            # 根据模式决定是否删除原始文件
+            delete_files = img_files if self.is_review_mode else []
+            context = {
+                "description": f"组 {current_group_id} 的文件",
+                "source_text": f"组 {current_group_id} 的",
+                "class_name": class_name,
+                "is_review_mode": self.is_review_mode,
+                "success_count": success_count,
+                "error_msgs": error_msgs,
+                "on_finished": self._on_labeling_finished,
+            }
+            self._start_file_operation(
+                context, _label_group_files, pending_files, delete_files,
+                self.labels_subdir, self.target_dir, class_id
+            )
+    
+    def _start_file_operation(self, context, operation, *args):
+        """在后台线程池中执行批量文件操作
+        
+        Args:
+            context: 任务上下文字典，需包含进度显示用的 description 和完成回调 on_finished
+            operation: 文件操作函数
+            *args: 文件操作函数的参数（不含进度回调）
+        """
+        task = _FileOperationTask(context, operation, *args)
+        task.signals.progress.connect(self._on_file_operation_progress)
+        task.signals.finished.connect(self._on_file_operation_finished)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_file_operation_progress(self, context, done, total):
+        """在状态栏显示后台文件操作进度"""
+        self.status_bar.showMessage(f"正在处理{context['description']}: {done}/{total}")
+    
+    def _on_file_operation_finished(self, context, result):
+        """把后台文件操作的结果交给任务对应的完成回调"""
+        context["on_finished"](context, result)
+    
+    def _on_labeling_finished(self, context, result):
+        """整组或批量标注完成后记录标注速度并显示结果"""
+        moved_count, task_error_msgs = result
+        success_count = context["success_count"] + moved_count
+        error_msgs = context["error_msgs"] + task_error_msgs
+        
+        # 记录标注操作（整个组）
+        if success_count > 0:
+            self.annotation_speed_widget.record_annotation(success_count)
+        
+        # 显示处理结果
+        if error_msgs:
+            error_text = "\n".join(error_msgs)
+            QMessageBox.warning(self, "部分文件处理失败", 
+                              f"成功处理 {success_count} 个文件，失败的文件:\n{error_text}")
+        else:
+            action_text = "移动并删除源文件" if context["is_review_mode"] else "移动"
+            self.status_bar.showMessage(f"成功将{context['source_text']} {success_count} 个文件标注为 {context['class_name']} 并{action_text}")
+    
     
-
     
     def clear_current_display(self):
         """清空当前显示"""
+        self._cancel_label_view_refresh()
         self.image_viewer_widget.clear_image()
         self.bbox_editor_widget.clear_bbox_list()
     
@@ -631,6 +1041,8 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"删除文件时发生错误: {e}")
                 return
+            finally:
+                file_utils.get_corresponding_label_file.cache_clear()
         
         # 记录丢弃操作（单张图片）
         self.annotation_speed_widget.record_annotation(1)
@@ -674,38 +1086,36 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "警告", "没有可丢弃的图像组")
             return
         
-        img_files = self.image_list_widget.image_groups_by_id[current_group_id]
-        success_count = 0
-        error_msgs = []
+        img_files = list(self.image_list_widget.image_groups_by_id[current_group_id])
+        
+        # 清空当前显示（在移除之前）
+        self.clear_current_display()
+        
+        # 从图像列表中移除整个组（会自动选择下一个组）
+        self.image_list_widget.remove_current_group()
+        
+        context = {
+            "group_id": current_group_id,
+            "description": f"组 {current_group_id} 的文件",
+            "delete_files": delete_files,
+            "on_finished": self._on_group_discard_finished,
+        }
         
         if delete_files:
-            # 删除模式：删除原始文件
-            for img_file in img_files:
-                try:
-                    # 删除图像和标签文件
-                    if os.path.exists(img_file):
-                        os.remove(img_file)
-                        success_count += 1
-                    
-                    label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-                    if label_file and os.path.exists(label_file):
-                        os.remove(label_file)
-                except Exception as e:
-                    error_msgs.append(f"删除文件 {os.path.basename(img_file)} 失败: {e}")
+            # 删除模式：在后台删除原始文件，完成后再记录和显示结果
+            self._start_file_operation(context, _delete_group_files, img_files, self.labels_subdir)
         else:
             # 仅从列表中移除，不删除原文件
-            success_count = len(img_files)
+            self._on_group_discard_finished(context, (len(img_files), []))
+    
+    def _on_group_discard_finished(self, context, result):
+        """整组丢弃完成后记录丢弃操作并显示结果"""
+        success_count, error_msgs = result
         
         # 记录丢弃操作（整个组）
         if success_count > 0:
             self.annotation_speed_widget.record_annotation(success_count)
         
-        # 清空当前显示（在移除之前）
-        self.clear_current_display()
-        
-        # 从图像列表中移除整个组（会自动选择下一个组）
-        self.image_list_widget.remove_current_group()
-        
         # 显示处理结果
         if error_msgs:
             error_text = "\n".join(error_msgs)
@@ -713,8 +1123,8 @@ class MainWindow(QMainWindow):
                               f"成功处理 {success_count} 个文件，失败的文件:\n{error_text}")
         
         # 更新状态栏信息
-        action_text = "删除" if delete_files else "从列表移除"
-        self.status_bar.showMessage(f"已{action_text} ID '{current_group_id}' 的 {success_count} 个文件")
+        action_text = "删除" if context["delete_files"] else "从列表移除"
+        self.status_bar.showMessage(f"已{action_text} ID '{context['group_id']}' 的 {success_count} 个文件")
     
     def on_auto_classify_requested(self):
         """处理自动分类请求"""
@@ -738,106 +1148,47 @@ class MainWindow(QMainWindow):
         
         # 记录第一个选中项的索引，作为操作后的起始位置
         first_selected_path = selected_paths[0]
-        start_idx = self.image_list_widget.image_files.index(first_selected_path) if first_selected_path in self.image_list_widget.image_files else 0
+        start_idx = self.image_list_widget.index_of(first_selected_path)
         
-        success_count = 0
-        error_msgs = []
-        mixed_count = 0
-        background_count = 0
-        
-        for img_file in selected_paths:
-            # 获取对应的标签文件
-            label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-            if not label_file:
-                error_msgs.append(f"找不到图像 {os.path.basename(img_file)} 的标签文件")
-                continue
-            
-            # 加载标签并分析类别
-            yolo_label = YoloLabel(img_file, label_file)
-            labels = yolo_label.get_labels()
-            
-            if not labels:
-                # 没有标签数据，移动到背景分类
-                move_success, error_msg = self._move_file_to_category(yolo_label, "背景")
-                if move_success:
-                    background_count += 1
-                    success_count += 1
-                else:
-                    error_msgs.append(f"移动图像 {os.path.basename(img_file)} 到背景类别失败: {error_msg}")
-                continue
-            
-            # 获取所有不同的类别
-            unique_class_ids = set()
-            for label in labels:
-                if len(label) == 5:
-                    class_id = int(label[0])
-                    unique_class_ids.add(class_id)
-            
-            if not unique_class_ids:
-                # 存在标签但标签不合法，只警告不移动
-                error_msgs.append(f"图像 {os.path.basename(img_file)} 存在标签但格式不合法，已跳过")
-                continue
-            
-            # 根据类别数量决定移动方式
-            if len(unique_class_ids) > 1:
-                # 多个类别，移动到混合分类
-                move_success, error_msg = self._move_file_to_category(yolo_label, "混合")
-                if move_success:
-                    mixed_count += 1
-                    success_count += 1
-                else:
-                    error_msgs.append(f"移动图像 {os.path.basename(img_file)} 到混合类别失败: {error_msg}")
-            else:
-                # 单一类别，移动到对应分类
-                class_id = list(unique_class_ids)[0]
-                move_success, error_msg = yolo_label.move_to_target(self.target_dir, class_id)
-                if move_success:
-                    success_count += 1
-                else:
-                    error_msgs.append(f"移动图像 {os.path.basename(img_file)} 失败: {error_msg}")
+        # 先从列表中移除并退出批量模式，文件的分类和移动在后台进行，不阻塞界面
+        self.image_list_widget.remove_batch_selected_images()
+        self.ship_classifier_widget.set_batch_mode(False)
+        self._select_image_at_index(start_idx)
+        
+        context = {
+            "description": f"批量选择的 {len(selected_paths)} 个文件",
+            "is_review_mode": self.is_review_mode,
+            "on_finished": self._on_batch_auto_classify_finished,
+        }
+        self._start_file_operation(
+            context, _auto_classify_files, selected_paths,
+            self.labels_subdir, self.target_dir, self.is_review_mode
+        )
+    
+    def _on_batch_auto_classify_finished(self, context, result):
+        """批量自动分类完成后记录标注速度并显示结果"""
+        success_count, mixed_count, background_count, error_msgs = result
         
         # 记录自动分类操作
         if success_count > 0:
             self.annotation_speed_widget.record_annotation(success_count)
         
-        # 根据模式决定是否删除原始文件
-        if self.is_review_mode:
-            for img_file in selected_paths:
-                try:
-                    # 删除图像和标签文件
-                    if os.path.exists(img_file):
-                        os.remove(img_file)
-                    
-                    label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-                    if label_file and os.path.exists(label_file):
-                        os.remove(label_file)
-                except Exception as e:
-                    error_msgs.append(f"删除文件 {os.path.basename(img_file)} 失败: {e}")
-        
-        # 从图像列表中移除批量选择的图像
-        self.image_list_widget.remove_batch_selected_images()
-        
-        # 退出批量模式
-        self.ship_classifier_widget.set_batch_mode(False)
-        
-        # 选择指定索引的图像
-        self._select_image_at_index(start_idx)
-        
         # 显示处理结果
         if error_msgs:
             error_text = "\n".join(error_msgs)
             QMessageBox.warning(self, "部分文件处理失败", 
                               f"成功处理 {success_count} 个文件（其中 {mixed_count} 个移动到混合类别，{background_count} 个移动到背景类别），失败的文件:\n{error_text}")
         else:
-            action_text = "移动并删除源文件" if self.is_review_mode else "移动"
+            action_text = "移动并删除源文件" if context["is_review_mode"] else "移动"
             self.status_bar.showMessage(f"成功{action_text} {success_count} 个文件（其中 {mixed_count} 个移动到混合类别，{background_count} 个移动到背景类别）")
     
-    def _move_file_to_category(self, yolo_label, category_name):
+    def _move_file_to_category(self, yolo_label, category_name, move_source=False):
         """将图像文件移动到指定类别目录
         
         Args:
             yolo_label: YoloLabel对象
             category_name: 类别名称（如"背景"、"混合"）
+            move_source: 是否直接移走源文件（审核模式），否则复制并保留源文件
             
         Returns:
             (bool, str): (是否成功, 错误信息)
@@ -851,70 +1202,35 @@ class MainWindow(QMainWindow):
             yolo_label.save_labels()
         
         try:
-            import shutil
-            
-            # 创建类别目录
-            target_dir = os.path.join(self.target_dir, category_name)
-            target_img_dir = os.path.join(target_dir, "images")
-            target_label_dir = os.path.join(target_dir, "labels")
-            os.makedirs(target_img_dir, exist_ok=True)
-            os.makedirs(target_label_dir, exist_ok=True)
-            
-            # 获取文件基本信息
-            image_basename = os.path.basename(image_path)
-            base_name = os.path.splitext(image_basename)[0]
-            
-            # 确定目标文件路径
-            target_img_path = os.path.join(target_img_dir, image_basename)
-            target_label_path = os.path.join(target_label_dir, f"{base_name}{config.LABEL_FILE_EXT}")
-            
-            # 复制文件
-            shutil.copy2(image_path, target_img_path)
-            shutil.copy2(label_path, target_label_path)
-            
-            # 验证文件是否已成功复制
-            if not os.path.exists(target_img_path) or not os.path.exists(target_label_path):
-                return False, "复制文件到目标目录失败"
-            
-            return True, ""
-        except Exception as e:
+            category_dirs = _make_category_dirs(self.target_dir, category_name)
+        except OSError as e:
             return False, str(e)
+        return _move_to_category_dirs(image_path, label_path, category_dirs, move_source)
     
     def _auto_classify_single_image(self):
         """根据图像中标签类型自动分类当前图像"""
         # 检查是否有当前图像和标签
-        if not self.image_viewer_widget.current_image or not self.image_viewer_widget.current_yolo_label:
+        yolo_label = self.image_viewer_widget.current_yolo_label
+        if not self.image_viewer_widget.current_image or not yolo_label:
             QMessageBox.warning(self, "警告", "没有可分类的图像")
             return
         
         # 获取当前图像路径和文件名
-        current_img_path = self.image_viewer_widget.current_yolo_label.image_path
+        current_img_path = yolo_label.image_path
         current_img_name = os.path.basename(current_img_path)
         
         # 检查标签数据
-        labels = self.image_viewer_widget.current_yolo_label.get_labels()
+        labels = yolo_label.get_labels()
         if not labels:
             # 没有标签数据，移动到背景分类
-            move_success, error_msg = self._move_file_to_category(self.image_viewer_widget.current_yolo_label, "背景")
+            # 审核模式下直接移走源文件，无需再单独删除
+            move_success, error_msg = self._move_file_to_category(yolo_label, "背景", move_source=self.is_review_mode)
             
             # 处理移动结果
             if move_success:
                 # 记录自动分类操作（单张图片）
                 self.annotation_speed_widget.record_annotation(1)
                 
-                # 在审核模式下，删除源文件
-                if self.is_review_mode:
-                    try:
-                        # 删除图像和标签文件
-                        if os.path.exists(current_img_path):
-                            os.remove(current_img_path)
-                        
-                        label_path = file_utils.get_corresponding_label_file(current_img_path, self.labels_subdir)
-                        if label_path and os.path.exists(label_path):
-                            os.remove(label_path)
-                    except Exception as e:
-                        QMessageBox.warning(self, "警告", f"删除源文件时发生错误: {e}")
-                
                 # 清空当前显示（在移除之前）
                 self.clear_current_display()
                 
@@ -929,11 +1245,7 @@ class MainWindow(QMainWindow):
             return
         
         # 获取所有不同的类别
-        unique_class_ids = set()
-        for label in labels:
-            if len(label) == 5:
-                class_id = int(label[0])
-                unique_class_ids.add(class_id)
+        unique_class_ids = {int(label[0]) for label in labels if len(label) == 5}
         
         if not unique_class_ids:
             # 存在标签但标签不合法，只警告不移动
@@ -941,26 +1253,28 @@ class MainWindow(QMainWindow):
             return
         
         # 如果有多个不同的类别，则移动到"混合"分类
+        source_moved = False
         if len(unique_class_ids) > 1:
-            move_success, error_msg = self._move_file_to_category(self.image_viewer_widget.current_yolo_label, "混合")
+            move_success, error_msg = self._move_file_to_category(yolo_label, "混合", move_source=self.is_review_mode)
+            source_moved = self.is_review_mode
         else:
             # 使用唯一的类别ID移动
-            class_id = list(unique_class_ids)[0]
+            class_id = next(iter(unique_class_ids))
             
             # 保存当前修改的标签
-            if self.image_viewer_widget.current_yolo_label.is_modified():
-                self.image_viewer_widget.current_yolo_label.save_labels()
+            if yolo_label.is_modified():
+                yolo_label.save_labels()
             
             # 移动文件到目标目录
-            move_success, error_msg = self.image_viewer_widget.current_yolo_label.move_to_target(self.target_dir, class_id)
+            move_success, error_msg = yolo_label.move_to_target(self.target_dir, class_id)
         
         # 处理移动结果
         if move_success:
             # 记录自动分类操作（单张图片）
             self.annotation_speed_widget.record_annotation(1)
             
-            # 在审核模式下，删除源文件
-            if self.is_review_mode:
+            # 在审核模式下，删除源文件（已直接移走的除外）
+            if self.is_review_mode and not source_moved:
                 try:
                     # 删除图像和标签文件
                     if os.path.exists(current_img_path):
@@ -971,6 +1285,8 @@ class MainWindow(QMainWindow):
                         os.remove(label_path)
                 except Exception as e:
                     QMessageBox.warning(self, "警告", f"删除源文件时发生错误: {e}")
+                finally:
+                    file_utils.get_corresponding_label_file.cache_clear()
             
             # 清空当前显示（在移除之前）
             self.clear_current_display()
@@ -983,7 +1299,7 @@ class MainWindow(QMainWindow):
             if len(unique_class_ids) > 1:
                 self.status_bar.showMessage(f"已将图像 {current_img_name} {action_text}到混合类别")
             else:
-                class_name = self.ship_types.get(str(list(unique_class_ids)[0]), f"未知类型({list(unique_class_ids)[0]})")
+                class_name = self.ship_types.get(str(class_id), f"未知类型({class_id})")
                 self.status_bar.showMessage(f"已将图像 {current_img_name} {action_text}到 {class_name} 类别")
         else:
             QMessageBox.critical(self, "错误", f"移动文件时发生错误: {error_msg}")
@@ -991,10 +1307,12 @@ class MainWindow(QMainWindow):
     # 简化的快捷键处理方法
     def _handle_navigate_up(self):
         """处理向上导航"""
+        self._navigation_step = -1
         self.image_list_widget.navigate_up()
     
     def _handle_navigate_down(self):
         """处理向下导航"""
+        self._navigation_step = 1
         self.image_list_widget.navigate_down()
     
     def _handle_batch_discard(self):
@@ -1022,12 +1340,12 @@ class MainWindow(QMainWindow):
         self.image_viewer_widget.set_selected_bbox(bbox_index)
         self.bbox_editor_widget.set_selected_bbox(bbox_index)
             
-        cursor_pos = self.image_viewer_widget.graphics_view.mapFromGlobal(QCursor.pos())
-        if not self.image_viewer_widget.graphics_view.rect().contains(cursor_pos):
-            cursor_pos = QPoint(self.image_viewer_widget.graphics_view.width() // 2, 
-                               self.image_viewer_widget.graphics_view.height() // 2)
+        graphics_view = self.image_viewer_widget.graphics_view
+        cursor_pos = graphics_view.mapFromGlobal(QCursor.pos())
+        if not graphics_view.rect().contains(cursor_pos):
+            cursor_pos = QPoint(graphics_view.width() // 2, graphics_view.height() // 2)
         
-        global_pos = self.image_viewer_widget.graphics_view.viewport().mapToGlobal(cursor_pos)
+        global_pos = graphics_view.viewport().mapToGlobal(cursor_pos)
         self.bbox_editor_widget.show_class_menu_for_bbox(bbox_index, global_pos)
     
     def _handle_yolo_predict(self):
@@ -1092,19 +1410,18 @@ class MainWindow(QMainWindow):
             是否成功保存
         """
         # 检查是否有当前标签对象且已修改
-        if (self.image_viewer_widget.current_yolo_label and 
-            self.image_viewer_widget.current_yolo_label.is_modified()):
-            
-            success = self.image_viewer_widget.current_yolo_label.save_labels()
+        yolo_label = self.image_viewer_widget.current_yolo_label
+        if yolo_label and yolo_label.is_modified():
+            success = yolo_label.save_labels()
             if success:
-                print(f"已保存标签到 {self.image_viewer_widget.current_yolo_label.label_path}")
+                print(f"已保存标签到 {yolo_label.label_path}")
                 
                 # 立即更新左侧列表的标签数显示
                 self._update_image_list_display()
                 
                 return True
             else:
-                print(f"保存标签失败: {self.image_viewer_widget.current_yolo_label.label_path}")
+                print(f"保存标签失败: {yolo_label.label_path}")
                 return False
         return False
     
@@ -1135,72 +1452,28 @@ class MainWindow(QMainWindow):
         
         # 记录第一个选中项的索引，作为操作后的起始位置
         first_selected_path = selected_paths[0]
-        start_idx = self.image_list_widget.image_files.index(first_selected_path) if first_selected_path in self.image_list_widget.image_files else 0
-        
-        success_count = 0
-        error_msgs = []
-        
-        for img_file in selected_paths:
-            # 获取对应的标签文件
-            label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-            if not label_file:
-                error_msgs.append(f"找不到图像 {os.path.basename(img_file)} 的标签文件")
-                continue
-            
-            # 加载标签并更新所有标签的类别
-            yolo_label = YoloLabel(img_file, label_file)
-            labels = yolo_label.get_labels()
-            
-            if not labels:
-                error_msgs.append(f"图像 {os.path.basename(img_file)} 没有标签数据")
-                continue
-            
-            # 更新所有标签的类别
-            for i in range(len(labels)):
-                yolo_label.update_label_class(i, class_id)
-            
-            # 移动文件到目标目录
-            success, error_msg = yolo_label.move_to_target(self.target_dir, class_id)
-            if success:
-                success_count += 1
-            else:
-                error_msgs.append(f"移动文件 {os.path.basename(img_file)} 失败: {error_msg}")
-        
-        # 记录批量标注操作
-        if success_count > 0:
-            self.annotation_speed_widget.record_annotation(success_count)
-        
-        # 根据模式决定是否删除原始文件
-        if self.is_review_mode:
-            for img_file in selected_paths:
-                try:
-                    # 删除图像和标签文件
-                    if os.path.exists(img_file):
-                        os.remove(img_file)
-                    
-                    label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-                    if label_file and os.path.exists(label_file):
-                        os.remove(label_file)
-                except Exception as e:
-                    error_msgs.append(f"删除文件 {os.path.basename(img_file)} 失败: {e}")
-        
-        # 显示处理结果
-        if error_msgs:
-            error_text = "\n".join(error_msgs)
-            QMessageBox.warning(self, "部分文件处理失败", 
-                              f"成功处理 {success_count} 个文件，失败的文件:\n{error_text}")
-        else:
-            action_text = "移动并删除源文件" if self.is_review_mode else "移动"
-            self.status_bar.showMessage(f"成功将 {success_count} 个文件标注为 {class_name} 并{action_text}")
+        start_idx = self.image_list_widget.index_of(first_selected_path)
         
-        # 从图像列表中移除批量选择的图像
+        # 先从列表中移除并退出批量模式，文件的标注和移动在后台进行，不阻塞界面
         self.image_list_widget.remove_batch_selected_images()
-        
-        # 退出批量模式
         self.ship_classifier_widget.set_batch_mode(False)
-        
-        # 选择指定索引的图像
         self._select_image_at_index(start_idx)
+        
+        # 根据模式决定是否删除原始文件
+        delete_files = selected_paths if self.is_review_mode else []
+        context = {
+            "description": f"批量选择的 {len(selected_paths)} 个文件",
+            "source_text": "",
+            "class_name": class_name,
+            "is_review_mode": self.is_review_mode,
+            "success_count": 0,
+            "error_msgs": [],
+            "on_finished": self._on_labeling_finished,
+        }
+        self._start_file_operation(
+            context, _label_group_files, selected_paths, delete_files,
+            self.labels_subdir, self.target_dir, class_id
+        )
     
     def _discard_batch_images(self):
         """丢弃批量选择的图像"""
@@ -1211,25 +1484,18 @@ class MainWindow(QMainWindow):
         
         # 记录第一个选中项的索引，作为操作后的起始位置
         first_selected_path = selected_paths[0]
-        start_idx = self.image_list_widget.image_files.index(first_selected_path) if first_selected_path in self.image_list_widget.image_files else 0
+        start_idx = self.image_list_widget.index_of(first_selected_path)
         
         success_count = 0
         error_msgs = []
         
         # 根据模式处理文件
         if self.is_review_mode:
-            for img_file in selected_paths:
-                try:
-                    # 删除图像和标签文件
-                    if os.path.exists(img_file):
-                        os.remove(img_file)
-                        success_count += 1
-                    
-                    label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-                    if label_file and os.path.exists(label_file):
-                        os.remove(label_file)
-                except Exception as e:
-                    error_msgs.append(f"删除文件 {os.path.basename(img_file)} 失败: {e}")
+            for deleted, error_msg in _delete_images_and_labels(selected_paths, self.labels_subdir):
+                if deleted:
+                    success_count += 1
+                if error_msg:
+                    error_msgs.append(error_msg)
         else:
             # 仅从列表中移除，不删除原文件
             success_count = len(selected_paths)
@@ -1288,18 +1554,11 @@ class MainWindow(QMainWindow):
         
         # 根据模式处理文件
         if self.is_review_mode:
-            for img_file in image_paths:
-                try:
-                    # 删除图像和标签文件
-                    if os.path.exists(img_file):
-                        os.remove(img_file)
-                        success_count += 1
-                    
-                    label_file = file_utils.get_corresponding_label_file(img_file, self.labels_subdir)
-                    if label_file and os.path.exists(label_file):
-                        os.remove(label_file)
-                except Exception as e:
-                    error_msgs.append(f"删除文件 {os.path.basename(img_file)} 失败: {e}")
+            for deleted, error_msg in _delete_images_and_labels(image_paths, self.labels_subdir):
+                if deleted:
+                    success_count += 1
+                if error_msg:
+                    error_msgs.append(error_msg)
         else:
             # 仅从列表中移除，不删除原文件
             success_count = len(image_paths)
@@ -1308,10 +1567,11 @@ class MainWindow(QMainWindow):
         if success_count > 0:
             self.annotation_speed_widget.record_annotation(success_count)
         
-        # 从图像列表中移除指定的图像
-        for img_path in image_paths:
-            if img_path in self.image_list_widget.image_files:
-                self.image_list_widget.image_files.remove(img_path)
+        # 从图像列表中移除指定的图像，用集合一次过滤，避免逐个线性查找和删除
+        discard_set = set(image_paths)
+        self.image_list_widget.image_files[:] = [
+            img_path for img_path in self.image_list_widget.image_files if img_path not in discard_set
+        ]
         
         # 清空当前显示
         self.clear_current_display()
@@ -1333,14 +1593,17 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage(f"已{action_text} {success_count} 个图像")
     
     def show_model_settings(self):
-        """显示模型设置对话框"""
-        dialog = ModelSettingsDialog(self)
-        
-        # 连接模型改变信号
-        dialog.model_changed.connect(self._on_model_changed)
+        """显示模型设置对话框，对话框只创建一次，之后复用并刷新模型列表"""
+        if self._model_settings_dialog is None:
+            self._model_settings_dialog = ModelSettingsDialog(self)
+            
+            # 连接模型改变信号
+            self._model_settings_dialog.model_changed.connect(self._on_model_changed)
+        else:
+            self._model_settings_dialog.reload()
         
         # 显示对话框
-        dialog.exec()
+        self._model_settings_dialog.exec()
     
     def _on_model_changed(self, model_name):
         """处理模型更改事件"""
@@ -1350,8 +1613,8 @@ class MainWindow(QMainWindow):
         # 显示状态栏消息
         self.status_bar.showMessage(f"已切换到模型: {model_name}")
     
-
-
+    
+    
     def run(self):
         """运行应用程序"""
         self.show() 
\ No newline at end of file
@@ -4,7 +4,7 @@
 """
 import os
 import shutil
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Set
 
 import config
 
@@ -32,10 +32,16 @@ def get_image_files(directory: str) -> List[str]:
     
     return sorted(image_files)
 
+# 只缓存找到的标签文件路径；"没有标签"不缓存，外部新写入的标签文件可以立即被发现
+_LABEL_FILE_CACHE_SIZE = 4096
+_label_file_cache = {}
+
 def get_corresponding_label_file(image_file: str, label_dir: str) -> Optional[str]:
     """
     获取与图像文件对应的标签文件
     
+    找到的路径会被缓存，删除文件或重新加载图像目录后需调用 get_corresponding_label_file.cache_clear()
+    
     Args:
         image_file: 图像文件的完整路径
         label_dir: 标签文件目录
@@ -43,6 +49,11 @@ def get_corresponding_label_file(image_file: str, label_dir: str) -> Optional[st
     Returns:
         标签文件的完整路径，如果找不到则返回None
     """
+    cache_key = (image_file, label_dir)
+    cached_path = _label_file_cache.get(cache_key)
+    if cached_path is not None:
+        return cached_path
+    
     if not os.path.exists(label_dir):
         return None
     
@@ -51,8 +62,15 @@ def get_corresponding_label_file(image_file: str, label_dir: str) -> Optional[st
     
     # 寻找对应的标签文件
     label_file_path = os.path.join(label_dir, f"{base_name}{config.LABEL_FILE_EXT}")
+    if not os.path.exists(label_file_path):
+        return None
     
-    return label_file_path if os.path.exists(label_file_path) else None
+    if len(_label_file_cache) >= _LABEL_FILE_CACHE_SIZE:
+        _label_file_cache.clear()
+    _label_file_cache[cache_key] = label_file_path
+    return label_file_path
+
+get_corresponding_label_file.cache_clear = _label_file_cache.clear
 
 def read_label_file(label_file: str) -> List[List[float]]:
     """
@@ -97,6 +115,32 @@ def read_label_file(label_file: str) -> List[List[float]]:
     
     return labels
 
+def peek_label_classes(label_file: str, limit: Optional[int] = 2) -> Set[int]:
+    """
+    只读取标签文件每行的类别ID，用于快速判断图像包含哪些类别
+    
+    Args:
+        label_file: 标签文件的完整路径
+        limit: 找到这么多个不同类别后停止读取，为None时读取整个文件
+        
+    Returns:
+        标签文件中出现的类别ID集合，只统计格式正确（5个字段）的行
+    """
+    class_ids = set()
+    try:
+        with open(label_file, 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 5:
+                    continue
+                class_ids.add(int(float(parts[0])))
+                if limit is not None and len(class_ids) >= limit:
+                    break
+    except (OSError, ValueError) as e:
+        print(f"【读取】读取标签文件时出错: {e}")
+    
+    return class_ids
+
 def write_label_file(label_file: str, labels: List[List[float]]) -> bool:
     """
     将标签数据写入到文件
@@ -202,8 +246,8 @@ def move_files_to_target(image_file: str, label_file: str, target_dir: str, ship
                         pass
                     return False, "写入目标标签文件失败"
             else:
-                # 对于非临时标签文件，直接复制
-                shutil.copy2(label_file, target_label_path)
+                # 对于非临时标签文件，直接复制内容，标签文件无需保留元数据
+                shutil.copyfile(label_file, target_label_path)
             
             # 验证标签文件复制/写入结果
             if not os.path.exists(target_label_path):
@@ -3,14 +3,21 @@
 包含图像加载、缩放和绘制标签框等功能
 """
 import os
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
+import numpy as np
 from PIL import Image, ImageDraw
 from PySide6.QtCore import Qt, QPointF, QRectF
 from PySide6.QtGui import QImage, QPixmap, QPainter, QPen, QColor, QFont, QBrush, QFontMetrics
 
 import config
 
+# 角点和边线命中检测的敏感度（原始图像像素）
+BBOX_CORNER_SENSITIVITY = 15
+BBOX_EDGE_SENSITIVITY = 10
+# 边界框命中检测网格的单元格大小（原始图像像素）
+BBOX_HIT_GRID_CELL = 64
+
 
 def load_image(image_path: str) -> Optional[Image.Image]:
     """
@@ -59,6 +66,35 @@ def resize_image(image: Image.Image, size: Tuple[int, int]) -> Image.Image:
     # 调整图像大小
     return image.resize((new_width, new_height), Image.LANCZOS)
 
+# PIL模式到Qt图像格式及每像素字节数的映射，可直接包装原始缓冲区
+_QIMAGE_FORMATS = {
+    "RGB": (QImage.Format.Format_RGB888, 3),
+    "RGBA": (QImage.Format.Format_RGBA8888, 4),
+    "L": (QImage.Format.Format_Grayscale8, 1),
+}
+
+def _wrap_pil_buffer(pil_image: Image.Image) -> Tuple[QImage, bytes]:
+    """
+    用QImage包装PIL图像的原始像素缓冲区（不复制）
+    
+    Args:
+        pil_image: PIL图像对象
+        
+    Returns:
+        (QImage, 像素数据)，QImage引用该缓冲区，使用期间需保持像素数据存活
+    """
+    # 不能直接映射的模式只转换一次：带透明通道的转为RGBA，其余转为RGB
+    if pil_image.mode not in _QIMAGE_FORMATS:
+        has_alpha = "A" in pil_image.getbands() or "transparency" in pil_image.info
+        pil_image = pil_image.convert("RGBA" if has_alpha else "RGB")
+    
+    # 获取图像尺寸和格式
+    width, height = pil_image.size
+    format, bytes_per_pixel = _QIMAGE_FORMATS[pil_image.mode]
+    
+    img_data = pil_image.tobytes("raw", pil_image.mode)
+    return QImage(img_data, width, height, bytes_per_pixel * width, format), img_data
+
 def pil_to_pixmap(pil_image: Image.Image) -> QPixmap:
     """
     将PIL图像转换为Qt QPixmap
@@ -72,23 +108,27 @@ def pil_to_pixmap(pil_image: Image.Image) -> QPixmap:
     if pil_image is None:
         return None
     
-    # 确保图像是RGB或RGBA模式
-    if pil_image.mode != "RGBA" and pil_image.mode != "RGB":
-        pil_image = pil_image.convert("RGBA")
-    
-    # 获取图像尺寸和格式
-    width, height = pil_image.size
-    format = QImage.Format.Format_RGBA8888 if pil_image.mode == "RGBA" else QImage.Format.Format_RGB888
+    # 原始像素数据需在生成QPixmap前保持存活
+    q_image, img_data = _wrap_pil_buffer(pil_image)
     
-    # 将PIL图像转换为bytes
-    bytes_per_line = 4 * width if pil_image.mode == "RGBA" else 3 * width
-    img_data = pil_image.tobytes("raw", pil_image.mode)
+    # 只在上传为QPixmap时复制一次
+    return QPixmap.fromImage(q_image)
+
+def pil_to_qimage(pil_image: Image.Image) -> QImage:
+    """
+    将PIL图像转换为独立持有像素数据的QImage，可在工作线程中调用
     
-    # 创建QImage
-    q_image = QImage(img_data, width, height, bytes_per_line, format)
+    Args:
+        pil_image: PIL图像对象
+        
+    Returns:
+        Qt QImage对象
+    """
+    if pil_image is None:
+        return None
     
-    # 返回QPixmap
-    return QPixmap.fromImage(q_image)
+    q_image, img_data = _wrap_pil_buffer(pil_image)
+    return q_image.copy()
 
 def create_thumbnail(image: Image.Image) -> QPixmap:
     """
@@ -187,9 +227,104 @@ def draw_boxes_qt(pixmap: QPixmap, labels: List[List[float]], ship_types: dict,
     painter = QPainter(result)
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
     
+    draw_boxes_qt_on(painter, labels, ship_types, original_size, (pixmap.width(), pixmap.height()))
+    
+    # 完成绘制
+    painter.end()
+    
+    return result
+
+def _box_label_position(scaled_x1: float, scaled_y1: float, scaled_y2: float,
+                        label_width: float, label_height: float, padding: float,
+                        pixmap_width: float) -> Tuple[float, float]:
+    """
+    计算标注框类别标签的位置：默认在边界框上方，超出图像时调整到下方或向内移动
+    
+    Returns:
+        (label_x, label_y) 标签左上角位置
+    """
+    label_x = scaled_x1
+    label_y = scaled_y1 - label_height - padding
+    
+    # 检查标签是否会超出图像顶部边界，如果是则放在边界框下方
+    if label_y < 0:
+        label_y = scaled_y2 + padding
+    
+    # 检查标签是否会超出图像右侧边界，如果是则向左调整
+    if label_x + label_width > pixmap_width:
+        label_x = pixmap_width - label_width
+    
+    # 确保标签不会超出左侧边界
+    if label_x < 0:
+        label_x = 0
+    
+    return label_x, label_y
+
+def box_paint_rect(label: List[float], ship_types: dict,
+                   original_size: Tuple[int, int], pixmap_size: Tuple[int, int]) -> QRectF:
+    """
+    计算draw_boxes_qt_on绘制单个标注框时会覆盖的区域（边界框、角点和类别标签），用于局部重绘
+    
+    Args:
+        label: 标签数据 [class_id, center_x, center_y, width, height]
+        ship_types: 船舶类型字典
+        original_size: 原始图像尺寸 (width, height)
+        pixmap_size: 目标图像尺寸 (width, height)
+        
+    Returns:
+        覆盖区域，标签格式不正确时返回空矩形
+    """
+    if len(label) != 5:
+        return QRectF()
+    
+    img_width, img_height = original_size
+    pixmap_width, pixmap_height = pixmap_size
+    scale_factor = max(0.5, min(pixmap_width / 800, pixmap_height / 600))
+    
+    class_id, center_x, center_y, width, height = label
+    class_id_int = int(class_id)
+    scale_x = pixmap_width / img_width
+    scale_y = pixmap_height / img_height
+    scaled_x1 = (center_x - width / 2) * img_width * scale_x
+    scaled_y1 = (center_y - height / 2) * img_height * scale_y
+    scaled_x2 = (center_x + width / 2) * img_width * scale_x
+    scaled_y2 = (center_y + height / 2) * img_height * scale_y
+    
+    # 角点和边框超出边界框的范围
+    corner_size = max(4, int(8 * scale_factor))
+    margin = corner_size / 2 + max(1, int(2 * scale_factor))
+    rect = QRectF(scaled_x1, scaled_y1, scaled_x2 - scaled_x1, scaled_y2 - scaled_y1).adjusted(
+        -margin, -margin, margin, margin
+    )
+    
+    # 类别标签
+    font = QFont()
+    font.setPointSizeF(max(9, int(10 * scale_factor)))
+    font.setBold(True)
+    font_metrics = QFontMetrics(font)
+    ship_type = ship_types.get(str(class_id_int), f"未知类型({class_id_int})")
+    padding = max(4, int(4 * scale_factor))
+    label_width = font_metrics.horizontalAdvance(ship_type) + padding * 2
+    label_height = font_metrics.height() + padding
+    label_x, label_y = _box_label_position(
+        scaled_x1, scaled_y1, scaled_y2, label_width, label_height, padding, pixmap_width
+    )
+    return rect.united(QRectF(label_x, label_y, label_width, label_height))
+
+def draw_boxes_qt_on(painter: QPainter, labels: List[List[float]], ship_types: dict,
+                     original_size: Tuple[int, int], pixmap_size: Tuple[int, int]) -> None:
+    """
+    使用已有的QPainter绘制检测框，不创建图像副本，便于和其他绘制共用同一个绘制会话
+    
+    Args:
+        painter: 已在目标图像上激活的QPainter
+        labels: 标签列表，每个元素为 [class_id, center_x, center_y, width, height]
+        ship_types: 船舶类型字典，键为class_id，值为类型名称
+        original_size: 原始图像尺寸 (width, height)
+        pixmap_size: 目标图像尺寸 (width, height)
+    """
     img_width, img_height = original_size
-    pixmap_width = pixmap.width()
-    pixmap_height = pixmap.height()
+    pixmap_width, pixmap_height = pixmap_size
     
     # 计算比例因子，用于调整标签文本和控制点大小
     # 使用最小尺寸维度作为基准以保持一致性
@@ -197,152 +332,87 @@ def draw_boxes_qt(pixmap: QPixmap, labels: List[List[float]], ship_types: dict,
     if scale_factor < 0.5:  # 设置最小缩放阈值
         scale_factor = 0.5
     
+    # 一次性把所有标签转换为pixmap上的坐标，循环中只读取结果
+    scale_x = pixmap_width / img_width
+    scale_y = pixmap_height / img_height
+    scaled_boxes = (labels_to_xyxy(labels, original_size) * (scale_x, scale_y, scale_x, scale_y)).tolist()
+    
+    # 所有边界框共用的画笔宽度、字体和边距
+    pen_width = max(1, int(2 * scale_factor))
+    font = QFont()
+    font.setPointSizeF(max(9, int(10 * scale_factor)))
+    font.setBold(True)  # 设置为粗体
+    font_metrics = QFontMetrics(font)
+    text_height = font_metrics.height()
+    padding = max(4, int(4 * scale_factor))
+    corner_radius = max(3, int(4 * scale_factor))
+    corner_size = max(4, int(8 * scale_factor))
+    half_corner = corner_size / 2
+    
+    corner_pen_width = max(1, int(1 * scale_factor))
+    corner_brush = QBrush(QColor("white"))
+    text_color = QColor("white")
+    painter.setFont(font)
+    
+    # 同一颜色的画笔和画刷只创建一次；绘制仍逐框进行，保证重叠时的上下层次不变
+    styles_by_color = {}
+    
     for i, label in enumerate(labels):
         if len(label) != 5:
             continue
         
-        class_id, center_x, center_y, width, height = label
-        class_id_int = int(class_id)
-        
-        # 将归一化坐标转换为像素坐标
-        x_center = center_x * img_width
-        y_center = center_y * img_height
-        box_width = width * img_width
-        box_height = height * img_height
-        
-        # 计算左上和右下坐标
-        x1 = x_center - (box_width / 2)
-        y1 = y_center - (box_height / 2)
-        x2 = x_center + (box_width / 2)
-        y2 = y_center + (box_height / 2)
-        
-        # 根据pixmap的当前大小进行适当缩放
-        scale_x = pixmap.width() / img_width
-        scale_y = pixmap.height() / img_height
-        
-        scaled_x1 = x1 * scale_x
-        scaled_y1 = y1 * scale_y
-        scaled_x2 = x2 * scale_x
-        scaled_y2 = y2 * scale_y
+        class_id_int = int(label[0])
+        scaled_x1, scaled_y1, scaled_x2, scaled_y2 = scaled_boxes[i]
         
         # 获取颜色
         color_idx = class_id_int % len(config.BOX_COLORS)
         box_color_str = config.BOX_COLORS[color_idx]
-        qt_color = QColor(box_color_str)
-        
-        # 重要：每次绘制新框前重置画刷，确保没有填充
+        styles = styles_by_color.get(box_color_str)
+        if styles is None:
+            box_color = QColor(box_color_str)
+            box_pen = QPen(box_color)
+            box_pen.setWidth(pen_width)
+            bg_color = QColor(box_color)
+            bg_color.setAlpha(220)  # 设置透明度 (0-255)
+            styles = (box_pen, QBrush(bg_color), QPen(box_color, corner_pen_width))
+            styles_by_color[box_color_str] = styles
+        box_pen, bg_brush, corner_pen = styles
+        
+        # 绘制边界框，确保没有填充
+        painter.setPen(box_pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        
-        # 设置画笔，根据图像大小调整边框宽度
-        pen_width = max(1, int(2 * scale_factor))
-        pen = QPen(qt_color)
-        pen.setWidth(pen_width)
-        painter.setPen(pen)
-        
-        # 绘制边界框
         painter.drawRect(QRectF(scaled_x1, scaled_y1, scaled_x2 - scaled_x1, scaled_y2 - scaled_y1))
         
         # 获取船舶类型名称
         ship_type = ship_types.get(str(class_id_int), f"未知类型({class_id_int})")
         
-        # ----- 开始优化标签文本渲染部分 -----
-        # 设置字体 - 使用适当的字体大小
-        font = QFont()
-        font.setPointSizeF(max(9, int(10 * scale_factor)))
-        font.setBold(True)  # 设置为粗体
-        painter.setFont(font)
-        
-        # 使用QFontMetrics精确计算文本尺寸
-        font_metrics = QFontMetrics(font)
-        text_width = font_metrics.horizontalAdvance(ship_type)
-        text_height = font_metrics.height()
-        
-        # 添加边距，使文本不会贴边显示
-        padding = max(4, int(4 * scale_factor))
-        label_width = text_width + padding * 2
+        # 使用QFontMetrics精确计算文本尺寸，添加边距，使文本不会贴边显示
+        label_width = font_metrics.horizontalAdvance(ship_type) + padding * 2
         label_height = text_height + padding
         
         # 计算标签位置 - 默认在边界框上方
-        label_x = scaled_x1
-        label_y = scaled_y1 - label_height - padding
-        
-        # 检查标签是否会超出图像顶部边界，如果是则放在边界框下方
-        if label_y < 0:
-            label_y = scaled_y2 + padding
-        
-        # 检查标签是否会超出图像右侧边界，如果是则向左调整
-        if label_x + label_width > pixmap_width:
-            label_x = pixmap_width - label_width
-        
-        # 确保标签不会超出左侧边界
-        if label_x < 0:
-            label_x = 0
-        
-        # 创建标签矩形
-        label_rect = QRectF(label_x, label_y, label_width, label_height)
-        
-        # 创建半透明背景色
-        bg_color = QColor(qt_color)
-        bg_color.setAlpha(220)  # 设置透明度 (0-255)
-        
-        # 绘制标签背景 - 使用圆角矩形
-        corner_radius = max(3, int(4 * scale_factor))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(bg_color))
-        painter.drawRoundedRect(label_rect, corner_radius, corner_radius)
-        
-        # 设置文字颜色
-        painter.setPen(QColor("white"))
-        
-        # 绘制文字 - 考虑padding使文本居中显示
-        text_rect = QRectF(
-            label_x + padding, 
-            label_y, 
-            label_width - padding * 2, 
-            label_height
+        label_x, label_y = _box_label_position(
+            scaled_x1, scaled_y1, scaled_y2, label_width, label_height, padding, pixmap_width
         )
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, ship_type)
-        # ----- 结束优化标签文本渲染部分 -----
-        
-        # 动态调整角点大小
-        corner_size = max(4, int(8 * scale_factor))
         
-        # 设置角点画笔和画刷
-        painter.setPen(Qt.PenStyle.NoPen)  # 无边框
-        painter.setBrush(QBrush(QColor("white")))  # 白色填充
-        
-        # 绘制四个角点（左上、右上、右下、左下）
-        # 左上角
-        painter.drawRect(QRectF(scaled_x1 - corner_size/2, scaled_y1 - corner_size/2, corner_size, corner_size))
-        
-        # 右上角
-        painter.drawRect(QRectF(scaled_x2 - corner_size/2, scaled_y1 - corner_size/2, corner_size, corner_size))
-        
-        # 右下角
-        painter.drawRect(QRectF(scaled_x2 - corner_size/2, scaled_y2 - corner_size/2, corner_size, corner_size))
-        
-        # 左下角
-        painter.drawRect(QRectF(scaled_x1 - corner_size/2, scaled_y2 - corner_size/2, corner_size, corner_size))
-        
-        # 在角点上添加边框，提高可见性
-        painter.setPen(QPen(qt_color, max(1, int(1 * scale_factor))))  # 动态调整边框宽度
-        
-        # 左上角
-        painter.drawRect(QRectF(scaled_x1 - corner_size/2, scaled_y1 - corner_size/2, corner_size, corner_size))
-        
-        # 右上角
-        painter.drawRect(QRectF(scaled_x2 - corner_size/2, scaled_y1 - corner_size/2, corner_size, corner_size))
+        # 绘制标签：半透明圆角背景和居中的白色文字
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(bg_brush)
+        painter.drawRoundedRect(QRectF(label_x, label_y, label_width, label_height),
+                                corner_radius, corner_radius)
         
-        # 右下角
-        painter.drawRect(QRectF(scaled_x2 - corner_size/2, scaled_y2 - corner_size/2, corner_size, corner_size))
+        painter.setPen(text_color)
+        text_rect = QRectF(label_x + padding, label_y, label_width - padding * 2, label_height)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, ship_type)
         
-        # 左下角
-        painter.drawRect(QRectF(scaled_x1 - corner_size/2, scaled_y2 - corner_size/2, corner_size, corner_size))
-    
-    # 完成绘制
-    painter.end()
-    
-    return result
+        # 绘制四个角点（左上、右上、右下、左下）：白色填充，边框颜色与边界框一致，提高可见性
+        painter.setPen(corner_pen)
+        painter.setBrush(corner_brush)
+        painter.drawRects([
+            QRectF(corner_x - half_corner, corner_y - half_corner, corner_size, corner_size)
+            for corner_x, corner_y in ((scaled_x1, scaled_y1), (scaled_x2, scaled_y1),
+                                       (scaled_x2, scaled_y2), (scaled_x1, scaled_y2))
+        ])
 
 def get_bbox_at_position(scene_pos: QPointF, labels: List[List[float]], 
                          image_size: Tuple[int, int], view_size: Tuple[int, int]) -> Optional[int]:
@@ -417,7 +487,7 @@ def get_bbox_corner_at_position(scene_pos: QPointF, labels: List[List[float]],
     pos_x, pos_y = scene_pos.x(), scene_pos.y()
     
     # 角点检测的敏感度半径（像素）- 增加敏感度
-    corner_sensitivity = 15
+    corner_sensitivity = BBOX_CORNER_SENSITIVITY
     
     # 检查每个边界框
     for i, label in enumerate(labels):
@@ -482,7 +552,7 @@ def get_bbox_edge_at_position(scene_pos: QPointF, labels: List[List[float]],
     pos_x, pos_y = scene_pos.x(), scene_pos.y()
     
     # 边线检测的敏感度（像素）
-    edge_sensitivity = 10
+    edge_sensitivity = BBOX_EDGE_SENSITIVITY
     
     # 检查每个边界框
     for i, label in enumerate(labels):
@@ -523,6 +593,153 @@ def get_bbox_edge_at_position(scene_pos: QPointF, labels: List[List[float]],
     
     return None, None 
 
+def labels_to_xyxy(labels: List[List[float]], image_size: Tuple[int, int]) -> np.ndarray:
+    """
+    把归一化标签批量转换为像素坐标的边界框数组，供命中检测复用
+    
+    Args:
+        labels: 标签列表
+        image_size: 原始图像尺寸 (width, height)
+        
+    Returns:
+        形状为(N, 4)的数组，每行为 (x1, y1, x2, y2)；格式不正确的标签对应行为NaN，保持索引与labels一致
+    """
+    img_width, img_height = image_size
+    boxes = np.full((len(labels), 4), np.nan)
+    valid = [i for i, label in enumerate(labels) if len(label) == 5]
+    if not valid:
+        return boxes
+    
+    values = np.array([labels[i] for i in valid], dtype=float)
+    x_center = values[:, 1] * img_width
+    y_center = values[:, 2] * img_height
+    half_width = values[:, 3] * img_width / 2
+    half_height = values[:, 4] * img_height / 2
+    boxes[valid] = np.column_stack((x_center - half_width, y_center - half_height,
+                                    x_center + half_width, y_center + half_height))
+    return boxes
+
+def _first_hit(hits: np.ndarray) -> Tuple[Optional[int], Optional[int]]:
+    """返回(N, 4)命中矩阵中按 (边界框, 角点/边线) 顺序的第一个命中"""
+    if not hits.any():
+        return None, None
+    bbox_idx, part_idx = divmod(int(hits.argmax()), 4)
+    return bbox_idx, part_idx
+
+def find_bbox_corner_hit(boxes: np.ndarray, pos_x: float, pos_y: float,
+                         sensitivity: float = BBOX_CORNER_SENSITIVITY) -> Tuple[Optional[int], Optional[int]]:
+    """
+    在预先转换好的边界框数组中查找位于指定位置的角点，结果与get_bbox_corner_at_position一致
+    
+    Args:
+        boxes: labels_to_xyxy返回的边界框数组
+        pos_x, pos_y: 原始图像坐标中的位置
+        sensitivity: 敏感度半径（像素）
+        
+    Returns:
+        (边界框索引, 角点索引)，如果未找到则返回(None, None)
+        角点索引: 0=左上, 1=右上, 2=右下, 3=左下
+    """
+    if len(boxes) == 0:
+        return None, None
+    
+    near_x1 = np.abs(pos_x - boxes[:, 0]) <= sensitivity
+    near_y1 = np.abs(pos_y - boxes[:, 1]) <= sensitivity
+    near_x2 = np.abs(pos_x - boxes[:, 2]) <= sensitivity
+    near_y2 = np.abs(pos_y - boxes[:, 3]) <= sensitivity
+    hits = np.column_stack((
+        near_x1 & near_y1,
+        near_x2 & near_y1,
+        near_x2 & near_y2,
+        near_x1 & near_y2
+    ))
+    return _first_hit(hits)
+
+def find_bbox_edge_hit(boxes: np.ndarray, pos_x: float, pos_y: float,
+                       sensitivity: float = BBOX_EDGE_SENSITIVITY) -> Tuple[Optional[int], Optional[int]]:
+    """
+    在预先转换好的边界框数组中查找位于指定位置的边线，结果与get_bbox_edge_at_position一致
+    
+    Args:
+        boxes: labels_to_xyxy返回的边界框数组
+        pos_x, pos_y: 原始图像坐标中的位置
+        sensitivity: 敏感度（像素）
+        
+    Returns:
+        (边界框索引, 边线索引)，如果未找到则返回(None, None)
+        边线索引: 0=上, 1=右, 2=下, 3=左
+    """
+    if len(boxes) == 0:
+        return None, None
+    
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    within_x = (x1 <= pos_x) & (pos_x <= x2)
+    within_y = (y1 <= pos_y) & (pos_y <= y2)
+    hits = np.column_stack((
+        (np.abs(pos_y - y1) <= sensitivity) & within_x,
+        (np.abs(pos_x - x2) <= sensitivity) & within_y,
+        (np.abs(pos_y - y2) <= sensitivity) & within_x,
+        (np.abs(pos_x - x1) <= sensitivity) & within_y
+    ))
+    return _first_hit(hits)
+
+def build_bbox_hit_grid(boxes: np.ndarray, cell_size: int = BBOX_HIT_GRID_CELL,
+                        margin: float = max(BBOX_CORNER_SENSITIVITY, BBOX_EDGE_SENSITIVITY)
+                        ) -> Dict[Tuple[int, int], List[int]]:
+    """
+    按网格单元格索引边界框，角点和边线只可能在边框附近命中，因此只登记四条边线外扩margin后覆盖的单元格
+    
+    Args:
+        boxes: labels_to_xyxy返回的边界框数组
+        cell_size: 单元格大小（像素）
+        margin: 边线外扩距离，不小于命中检测的敏感度
+        
+    Returns:
+        单元格坐标到边界框索引列表的映射，列表按索引升序排列
+    """
+    grid = {}
+    for i, (x1, y1, x2, y2) in enumerate(boxes.tolist()):
+        if np.isnan(x1):
+            continue
+        strips = (
+            (x1 - margin, y1 - margin, x2 + margin, y1 + margin),
+            (x2 - margin, y1 - margin, x2 + margin, y2 + margin),
+            (x1 - margin, y2 - margin, x2 + margin, y2 + margin),
+            (x1 - margin, y1 - margin, x1 + margin, y2 + margin)
+        )
+        for sx1, sy1, sx2, sy2 in strips:
+            for cell_x in range(int(sx1 // cell_size), int(sx2 // cell_size) + 1):
+                for cell_y in range(int(sy1 // cell_size), int(sy2 // cell_size) + 1):
+                    bucket = grid.setdefault((cell_x, cell_y), [])
+                    if not bucket or bucket[-1] != i:
+                        bucket.append(i)
+    return grid
+
+def find_bbox_hit_in_grid(find_hit, boxes: np.ndarray, grid: Dict[Tuple[int, int], List[int]],
+                          pos_x: float, pos_y: float,
+                          cell_size: int = BBOX_HIT_GRID_CELL) -> Tuple[Optional[int], Optional[int]]:
+    """
+    只对位置所在单元格内的边界框执行命中检测，结果与直接对全部边界框检测一致
+    
+    Args:
+        find_hit: find_bbox_corner_hit 或 find_bbox_edge_hit
+        boxes: labels_to_xyxy返回的边界框数组
+        grid: build_bbox_hit_grid返回的网格
+        pos_x, pos_y: 原始图像坐标中的位置
+        cell_size: 构建网格时使用的单元格大小
+        
+    Returns:
+        (边界框索引, 角点/边线索引)，如果未找到则返回(None, None)
+    """
+    candidates = grid.get((int(pos_x // cell_size), int(pos_y // cell_size)))
+    if not candidates:
+        return None, None
+    
+    local_idx, part_idx = find_hit(boxes[candidates], pos_x, pos_y)
+    if local_idx is None:
+        return None, None
+    return candidates[local_idx], part_idx
+
 def highlight_selected_box(pixmap: QPixmap, label: List[float], bbox_index: int, 
                       original_size: Tuple[int, int]) -> QPixmap:
     """
@@ -545,9 +762,30 @@ def highlight_selected_box(pixmap: QPixmap, label: List[float], bbox_index: int,
     painter = QPainter(result)
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
     
+    highlight_selected_box_on(painter, label, bbox_index, original_size, (pixmap.width(), pixmap.height()))
+    
+    # 结束绘制
+    painter.end()
+    
+    return result
+
+def highlight_selected_box_on(painter: QPainter, label: List[float], bbox_index: int,
+                              original_size: Tuple[int, int], pixmap_size: Tuple[int, int]) -> None:
+    """
+    使用已有的QPainter高亮显示选中的边界框，不创建图像副本
+    
+    Args:
+        painter: 已在目标图像上激活的QPainter
+        label: 选中的标签数据，格式为 [class_id, center_x, center_y, width, height]
+        bbox_index: 边界框索引
+        original_size: 原始图像尺寸 (width, height)
+        pixmap_size: 目标图像尺寸 (width, height)
+    """
+    if not label or len(label) != 5:
+        return
+    
     img_width, img_height = original_size
-    pixmap_width = pixmap.width()
-    pixmap_height = pixmap.height()
+    pixmap_width, pixmap_height = pixmap_size
     
     # 解析标签数据
     class_id, center_x, center_y, width, height = label
@@ -566,8 +804,8 @@ def highlight_selected_box(pixmap: QPixmap, label: List[float], bbox_index: int,
     y2 = y_center + (box_height / 2)
     
     # 根据pixmap的当前大小进行适当缩放
-    scale_x = pixmap.width() / img_width
-    scale_y = pixmap.height() / img_height
+    scale_x = pixmap_width / img_width
+    scale_y = pixmap_height / img_height
     
     scaled_x1 = x1 * scale_x
     scaled_y1 = y1 * scale_y
@@ -609,8 +847,58 @@ def highlight_selected_box(pixmap: QPixmap, label: List[float], bbox_index: int,
             point_size,
             point_size
         ))
+
+
+def filter_predictions(predictions: np.ndarray, conf_threshold: float,
+                       iou_threshold: float) -> np.ndarray:
+    """
+    按置信度过滤预测结果，并按类别执行非极大值抑制(NMS)
     
-    # 结束绘制
-    painter.end()
+    Args:
+        predictions: 预测结果数组，形状为(N, 6)，每行为 [class_id, center_x, center_y, width, height, confidence]
+        conf_threshold: 置信度阈值，低于该值的预测被丢弃
+        iou_threshold: 同类别预测框的IoU阈值，超过该值的低置信度框被抑制
+        
+    Returns:
+        过滤后的预测结果数组，按置信度从高到低排序
+    """
+    if predictions.size == 0:
+        return predictions.reshape(0, 6)
+    
+    # 置信度过滤
+    predictions = predictions[predictions[:, 5] >= conf_threshold]
+    if len(predictions) == 0:
+        return predictions
+    
+    # 按置信度降序排列
+    predictions = predictions[np.argsort(-predictions[:, 5], kind="stable")]
+    
+    # 转换为角点坐标
+    half_w = predictions[:, 3] / 2
+    half_h = predictions[:, 4] / 2
+    x1 = predictions[:, 1] - half_w
+    y1 = predictions[:, 2] - half_h
+    x2 = predictions[:, 1] + half_w
+    y2 = predictions[:, 2] + half_h
+    areas = predictions[:, 3] * predictions[:, 4]
+    classes = predictions[:, 0]
+    
+    keep = np.ones(len(predictions), dtype=bool)
+    for i in range(len(predictions)):
+        if not keep[i]:
+            continue
+        
+        # 只与排在后面、同类别且尚未被抑制的框比较
+        rest = np.nonzero(keep[i + 1:] & (classes[i + 1:] == classes[i]))[0] + i + 1
+        if len(rest) == 0:
+            continue
+        
+        inter_w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        
+        keep[rest[iou > iou_threshold]] = False
     
-    return result 
\ No newline at end of file
+    return predictions[keep]
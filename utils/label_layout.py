@@ -0,0 +1,338 @@
+"""
+标签布局工具模块
+为预测标签的自动布局提供空间索引和整帧标签位置计算，减少候选位置与已放置标签之间的重叠检测次数
+"""
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+Box = Tuple[float, float, float, float]  # (x1, y1, x2, y2)
+
+# 附近标签达到该数量时改用NumPy批量计算，数量较少时逐个比较开销更低
+_VECTORIZE_MIN_OCCUPIED = 16
+
+# 标准位置与已有标签的重叠面积占标签面积的比例不超过该值时视为可用
+LABEL_MAX_OVERLAP_RATIO = 0.3
+
+
+class LabelGridIndex:
+    """均匀网格空间索引
+    
+    将已放置的标签矩形登记到其覆盖的网格单元中，查询时只返回与候选矩形
+    落在相同单元内的标签（粗筛），再由调用方计算精确的重叠面积（细筛）。
+    """
+    
+    def __init__(self, cell_size: float):
+        """初始化网格索引
+        
+        Args:
+            cell_size: 网格单元边长（像素），宜与标签尺寸同一量级
+        """
+        self.cell_size = max(1.0, float(cell_size))
+        self._boxes: List[Box] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        
+        # 与_boxes内容相同的(N, 4) float32数组，容量不足时倍增，附近标签较多时直接切片供批量计算；
+        # 坐标以像素为单位，float32的舍入误差远小于重叠阈值，只在重叠面积恰好贴近阈值时可能影响选择
+        self._box_array = np.empty((64, 4), dtype=np.float32)
+    
+    def __len__(self):
+        return len(self._boxes)
+    
+    def _cell_range(self, x1: float, y1: float, x2: float, y2: float) -> Tuple[int, int, int, int]:
+        """计算矩形覆盖的网格单元范围
+        
+        Returns:
+            (起始列, 起始行, 结束列, 结束行)
+        """
+        cell_size = self.cell_size
+        return (
+            int(x1 // cell_size),
+            int(y1 // cell_size),
+            int(x2 // cell_size),
+            int(y2 // cell_size)
+        )
+    
+    def insert(self, x1: float, y1: float, x2: float, y2: float):
+        """登记一个已放置的标签矩形
+        
+        Args:
+            x1, y1, x2, y2: 标签矩形的左上角和右下角坐标
+        """
+        index = len(self._boxes)
+        self._boxes.append((x1, y1, x2, y2))
+        
+        if index == len(self._box_array):
+            grown = np.empty((index * 2, 4), dtype=np.float32)
+            grown[:index] = self._box_array
+            self._box_array = grown
+        self._box_array[index] = (x1, y1, x2, y2)
+        
+        col1, row1, col2, row2 = self._cell_range(x1, y1, x2, y2)
+        for col in range(col1, col2 + 1):
+            for row in range(row1, row2 + 1):
+                self._cells.setdefault((col, row), []).append(index)
+    
+    def query_boxes(self, x1: float, y1: float, x2: float, y2: float) -> Union[List[Box], np.ndarray]:
+        """查找可能与指定区域重叠的已放置标签
+        
+        Args:
+            x1, y1, x2, y2: 查询区域（可取多个候选位置的外接矩形，一次查询供全部候选使用）
+        
+        Returns:
+            按放置顺序排列的标签矩形 (x1, y1, x2, y2)；数量较少时为元组列表，
+            较多时为(M, 4)数组，可直接用于批量计算
+        """
+        if not self._boxes:
+            return []
+        
+        found = set()
+        col1, row1, col2, row2 = self._cell_range(x1, y1, x2, y2)
+        for col in range(col1, col2 + 1):
+            for row in range(row1, row2 + 1):
+                found.update(self._cells.get((col, row), ()))
+        
+        indices = sorted(found)
+        if len(indices) >= _VECTORIZE_MIN_OCCUPIED:
+            return self._box_array[indices]
+        boxes = self._boxes
+        return [boxes[index] for index in indices]
+
+
+def _intersection_areas(candidates: List[Box], occupied: Union[List[Box], np.ndarray]) -> np.ndarray:
+    """批量计算候选位置与已占用区域两两之间的交集面积
+    
+    Returns:
+        形状为(C, M)的交集面积数组，不相交时为0
+    """
+    cand = np.asarray(candidates, dtype=float)
+    occ = np.asarray(occupied, dtype=float)
+    inter_w = np.clip(
+        np.minimum(cand[:, None, 2], occ[None, :, 2]) -
+        np.maximum(cand[:, None, 0], occ[None, :, 0]), 0, None)
+    inter_h = np.clip(
+        np.minimum(cand[:, None, 3], occ[None, :, 3]) -
+        np.maximum(cand[:, None, 1], occ[None, :, 1]), 0, None)
+    return inter_w * inter_h
+
+
+def first_free_candidate(candidates: List[Box], occupied: Union[List[Box], np.ndarray],
+                         label_area: float, max_overlap_ratio: float) -> int:
+    """返回第一个与任一已占用区域的重叠都不超过阈值的候选
+    
+    Args:
+        candidates: 按优先级排列的候选标签矩形 (x1, y1, x2, y2)
+        occupied: 附近已占用的标签矩形
+        label_area: 标签面积
+        max_overlap_ratio: 重叠面积占标签面积的比例不超过该值时视为可用
+    
+    Returns:
+        第一个可用候选的索引，没有可用候选时返回-1
+    """
+    if not candidates:
+        return -1
+    if len(occupied) == 0:
+        return 0
+    
+    # 直接与面积阈值比较，省去逐个除以标签面积
+    threshold_area = max_overlap_ratio * label_area
+    
+    if len(occupied) >= _VECTORIZE_MIN_OCCUPIED:
+        worst = _intersection_areas(candidates, occupied).max(axis=1)
+        free = np.nonzero(worst <= threshold_area)[0]
+        return int(free[0]) if len(free) else -1
+    
+    # 任一方向不相交即跳过，遇到超过阈值的重叠立即放弃该候选
+    for index, (cx1, cy1, cx2, cy2) in enumerate(candidates):
+        for ox1, oy1, ox2, oy2 in occupied:
+            overlap_w = min(cx2, ox2) - max(cx1, ox1)
+            if overlap_w <= 0:
+                continue
+            overlap_h = min(cy2, oy2) - max(cy1, oy1)
+            if overlap_h <= 0:
+                continue
+            if overlap_w * overlap_h > threshold_area:
+                break
+        else:
+            return index
+    return -1
+
+
+def minimum_overlap_candidate(candidates: List[Box], occupied: Union[List[Box], np.ndarray]) -> int:
+    """在所有候选位置中选出与已占用区域总重叠面积最小的一个
+    
+    Args:
+        candidates: 按优先级排列的候选标签矩形 (x1, y1, x2, y2)
+        occupied: 附近已占用的标签矩形
+    
+    Returns:
+        总重叠面积最小的候选索引，面积相同时取优先级高（靠前）的候选
+    """
+    if len(occupied) == 0:
+        return 0
+    
+    if len(occupied) >= _VECTORIZE_MIN_OCCUPIED:
+        # argmin返回第一个最小值，天然保留候选的优先级顺序
+        return int(_intersection_areas(candidates, occupied).sum(axis=1).argmin())
+    
+    best_index = 0
+    best_total = None
+    for index, (cx1, cy1, cx2, cy2) in enumerate(candidates):
+        total = 0.0
+        for ox1, oy1, ox2, oy2 in occupied:
+            overlap_w = min(cx2, ox2) - max(cx1, ox1)
+            if overlap_w <= 0:
+                continue
+            overlap_h = min(cy2, oy2) - max(cy1, oy1)
+            if overlap_h <= 0:
+                continue
+            total += overlap_w * overlap_h
+        if best_total is None or total < best_total:
+            best_index, best_total = index, total
+            if total == 0:
+                break
+    return best_index
+
+
+def _anchor_positions(bbox: Box, label_width: float, label_height: float,
+                      padding: float) -> List[Tuple[float, float]]:
+    """生成边界框周围的8个标准标签位置
+    
+    Returns:
+        按优先级排列的位置列表：上方中央、下方中央、左上、右上、左下、右下、左侧中央、右侧中央
+    """
+    x1, y1, x2, y2 = bbox
+    center_x = x1 + (x2 - x1 - label_width) / 2
+    center_y = y1 + (y2 - y1 - label_height) / 2
+    above_y = y1 - label_height - padding
+    below_y = y2 + padding
+    return [
+        (center_x, above_y),
+        (center_x, below_y),
+        (x1, above_y),
+        (x2 - label_width, above_y),
+        (x1, below_y),
+        (x2 - label_width, below_y),
+        (x1 - label_width - padding, center_y),
+        (x2 + padding, center_y),
+    ]
+
+
+def _offset_positions(base_x: float, base_y: float, label_width: float, label_height: float,
+                      padding: float) -> List[Tuple[float, float]]:
+    """生成默认位置周围的偏移位置，供标准位置都重叠时选择
+    
+    Returns:
+        上下偏移一到两行（每行取左、中、右）以及同一行左右偏移一到两个标签宽度的位置列表
+    """
+    step_x = label_width + padding
+    step_y = label_height + padding
+    positions = [
+        (base_x + dx * step_x, base_y + dy * step_y)
+        for dy in (-1, 1, -2, 2)
+        for dx in (0, -1, 1)
+    ]
+    positions.extend((base_x + dx * step_x, base_y) for dx in (-1, 1, -2, 2))
+    return positions
+
+
+def _clip_candidates(positions: List[Tuple[float, float]], label_width: float, label_height: float,
+                     max_x: float, max_y: float) -> List[Box]:
+    """把候选位置限制在图像范围内并去除重复位置
+    
+    靠近图像边缘时多个候选会被限制到同一位置，按首次出现的顺序去重，避免重复检测。
+    
+    Args:
+        positions: 按优先级排列的候选位置
+        label_width, label_height: 标签尺寸
+        max_x, max_y: 标签左上角允许的最大坐标（图像尺寸减去标签尺寸）
+    
+    Returns:
+        候选标签矩形 (x1, y1, x2, y2) 列表
+    """
+    clipped_positions = {}
+    for label_x, label_y in positions:
+        label_x = max(min(label_x, max_x), 0)
+        label_y = max(min(label_y, max_y), 0)
+        clipped_positions.setdefault((round(label_x, 2), round(label_y, 2)), (label_x, label_y))
+    
+    return [
+        (label_x, label_y, label_x + label_width, label_y + label_height)
+        for label_x, label_y in clipped_positions.values()
+    ]
+
+
+def _query_candidates(occupied_regions: LabelGridIndex, candidates: List[Box]) -> List[Box]:
+    """用所有候选的外接矩形查询一次网格索引"""
+    return occupied_regions.query_boxes(
+        min(box[0] for box in candidates), min(box[1] for box in candidates),
+        max(box[2] for box in candidates), max(box[3] for box in candidates)
+    )
+
+
+def place_label(bbox: Box, label_width: float, label_height: float, padding: float,
+                pixmap_width: float, pixmap_height: float,
+                occupied_regions: LabelGridIndex) -> Tuple[float, float]:
+    """为单个边界框选择标签位置，并把结果登记到网格索引
+    
+    先按优先级检测8个标准位置；都明显重叠时，在标准位置和周围的偏移位置中
+    选择与已有标签总重叠面积最小的位置。
+    
+    Args:
+        bbox: 边界框 (x1, y1, x2, y2)
+        label_width, label_height: 标签尺寸
+        padding: 标签与边界框之间的间距
+        pixmap_width, pixmap_height: 图像尺寸
+        occupied_regions: 已占用标签区域的网格索引
+    
+    Returns:
+        (label_x, label_y) 标签左上角位置
+    """
+    # 同一标签的所有候选共用的量只计算一次
+    label_area = label_width * label_height
+    max_x = pixmap_width - label_width
+    max_y = pixmap_height - label_height
+    
+    anchors = _anchor_positions(bbox, label_width, label_height, padding)
+    candidates = _clip_candidates(anchors, label_width, label_height, max_x, max_y)
+    occupied = _query_candidates(occupied_regions, candidates)
+    
+    index = first_free_candidate(candidates, occupied, label_area, LABEL_MAX_OVERLAP_RATIO)
+    if index < 0:
+        base_x, base_y = anchors[0]
+        candidates = _clip_candidates(
+            anchors + _offset_positions(base_x, base_y, label_width, label_height, padding),
+            label_width, label_height, max_x, max_y
+        )
+        occupied = _query_candidates(occupied_regions, candidates)
+        index = minimum_overlap_candidate(candidates, occupied)
+    
+    label_box = candidates[index]
+    occupied_regions.insert(*label_box)
+    return label_box[0], label_box[1]
+
+
+def place_all(bboxes: List[Box], label_sizes: List[Tuple[float, float]],
+              pixmap_size: Tuple[float, float], padding: float,
+              cell_size: float) -> List[Tuple[float, float]]:
+    """一次性计算一帧内所有预测标签的位置
+    
+    标签按传入顺序依次放置，后放置的标签避让先放置的标签。
+    
+    Args:
+        bboxes: 边界框列表 [(x1, y1, x2, y2), ...]（图像坐标）
+        label_sizes: 与bboxes一一对应的标签尺寸 [(width, height), ...]
+        pixmap_size: 图像尺寸 (width, height)
+        padding: 标签与边界框之间的间距
+        cell_size: 网格索引的单元边长
+    
+    Returns:
+        与bboxes一一对应的标签左上角位置 [(label_x, label_y), ...]
+    """
+    pixmap_width, pixmap_height = pixmap_size
+    occupied_regions = LabelGridIndex(cell_size)
+    return [
+        place_label(bbox, label_width, label_height, padding,
+                    pixmap_width, pixmap_height, occupied_regions)
+        for bbox, (label_width, label_height) in zip(bboxes, label_sizes)
+    ]
@@ -4,8 +4,19 @@ YOLO模型管理器
 """
 import os
 import json
+import threading
+
+import numpy as np
+
 import config
 
+# 预热模型时使用的空白输入尺寸 (高, 宽, 通道)
+WARMUP_INPUT_SHAPE = (640, 640, 3)
+
+# 已在后台加载并预热、尚未被取用的模型，进程内共享；只保留最近一次预热的模型以控制内存
+_preloaded_models = {}
+_preload_lock = threading.Lock()
+
 
 class YoloModelManager:
     """YOLO模型管理器类"""
@@ -15,16 +26,29 @@ class YoloModelManager:
         self.settings_file = config.SETTINGS_FILE
         self.models_dir = config.YOLO_MODELS_DIR
         self.default_model = config.DEFAULT_YOLO_MODEL
+        self._model_info_cache = {}  # 模型名称 -> 模型信息，在扫描模型目录时一并填充
     
     def get_available_models(self):
-        """获取可用的YOLO模型列表"""
+        """获取可用的YOLO模型列表
+        
+        扫描模型目录时同时记录每个模型的文件信息，之后查询模型信息无需再访问磁盘
+        """
+        self.invalidate_cache()
         models = []
         if os.path.exists(self.models_dir):
-            for file in os.listdir(self.models_dir):
-                if file.endswith('.pt'):
-                    models.append(file)
+            with os.scandir(self.models_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.pt'):
+                        models.append(entry.name)
+                        self._model_info_cache[entry.name] = self._build_model_info(
+                            entry.name, entry.path, entry.stat().st_size
+                        )
         return sorted(models)
     
+    def invalidate_cache(self):
+        """清空模型信息缓存，重新扫描模型目录前调用"""
+        self._model_info_cache.clear()
+    
     def load_user_settings(self):
         """加载用户设置"""
         settings = {
@@ -90,19 +114,78 @@ class YoloModelManager:
         return os.path.exists(model_path)
     
     def get_model_info(self, model_name):
-        """获取模型信息"""
+        """获取模型信息，优先使用扫描模型目录时缓存的结果"""
+        model_info = self._model_info_cache.get(model_name)
+        if model_info is not None:
+            return model_info
+        
         model_path = self.get_model_path(model_name)
         
         if not os.path.exists(model_path):
             return None
         
         # 获取文件大小
-        file_size = os.path.getsize(model_path)
-        size_mb = file_size / (1024 * 1024)
-        
+        model_info = self._build_model_info(model_name, model_path, os.path.getsize(model_path))
+        self._model_info_cache[model_name] = model_info
+        return model_info
+    
+    @staticmethod
+    def _build_model_info(model_name, model_path, file_size):
+        """根据文件大小构建模型信息字典"""
         return {
             'name': model_name,
             'path': model_path,
-            'size_mb': size_mb,
+            'size_mb': file_size / (1024 * 1024),
             'exists': True
-        } 
\ No newline at end of file
+        }
+    
+    def preload_model(self, model_name, warmup_runs=2):
+        """在后台线程中加载模型并用空白图像预热，供之后切换模型时直接取用
+        
+        Args:
+            model_name: 模型文件名
+            warmup_runs: 预热推理次数
+            
+        Returns:
+            bool: 预热是否成功
+        """
+        if self.is_model_preloaded(model_name):
+            return True
+        if not self.model_exists(model_name):
+            return False
+        
+        try:
+            # 首次预热时才导入 ultralytics，避免程序启动时加载 torch
+            from ultralytics import YOLO
+            
+            model = YOLO(self.get_model_path(model_name))
+            dummy_image = np.zeros(WARMUP_INPUT_SHAPE, dtype=np.uint8)
+            for _ in range(warmup_runs):
+                model(dummy_image, verbose=False)
+        except Exception as e:
+            print(f"预热模型失败: {model_name}, 错误: {e}")
+            return False
+        
+        with _preload_lock:
+            _preloaded_models.clear()
+            _preloaded_models[model_name] = model
+        return True
+    
+    def is_model_preloaded(self, model_name):
+        """检查模型是否已预热完成且尚未被取用"""
+        with _preload_lock:
+            return model_name in _preloaded_models
+    
+    def take_preloaded_model(self, model_name):
+        """取出已预热的模型
+        
+        Returns:
+            预热好的YOLO模型，没有时返回None
+        """
+        with _preload_lock:
+            return _preloaded_models.pop(model_name, None)
+    
+    def discard_preloaded_model(self, model_name):
+        """丢弃已预热但不再需要的模型，释放其占用的内存"""
+        with _preload_lock:
+            _preloaded_models.pop(model_name, None)